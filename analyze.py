@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ANALISIS TELEMETRI - BISIKAN DARI KABUT
+
+Membaca log JSONL dari telemetry.py (termasuk file rotasi .1, .2, ...) dan
+menghitung:
+
+    funnel      jumlah sesi yang mencapai setiap adegan, dari prolog sampai
+                setiap ending_*
+    ending      berapa ending berbeda yang dicapai setiap sesi
+    heatmap     seberapa sering setiap pilihan diambil di setiap adegan
+                (misalnya urutan simbol salah yang dipilih di jalan_batu),
+                berdasarkan id pilihan sehingga semua bahasa digabung
+    titik henti cara sesi berakhir (mati atau terputus) dan adegan terakhirnya
+
+Ending bukan akhir sesi: adegan ending kembali ke desa_senja dan sesi baru
+selesai saat pemain mati. Ending dihitung tercapai dari event ending
+(telemetry.record_ending) atau dari event mana pun yang membawa kolom
+"ending" yang tidak null.
+
+File dibagi menjadi potongan byte (batas baris) yang dibaca paralel oleh
+process pool. Setiap potongan menghasilkan rekap kecil yang digabung secara
+berurutan; sesi yang tidak punya event selama SESSION_TIMEOUT detik (atau
+yang terlama saat jumlah sesi terbuka melewati batas) dianggap selesai dan
+dibuang dari memori. Memori hanya bergantung pada ukuran potongan dan
+jumlah sesi yang aktif bersamaan, bukan pada ukuran log.
+
+Contoh:
+    python analyze.py telemetri/pilihan.jsonl
+    python analyze.py --json laporan.json log1.jsonl log2.jsonl
+"""
+
+import argparse
+import json
+import os
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from game import SCENES
+from katalog import DEFAULT_LANGUAGE, catalog
+from telemetry import TELEMETRY_FILE
+
+CHUNK_SIZE = 32 * 1024 * 1024  # byte per potongan yang dibaca satu worker
+SESSION_TIMEOUT = 30 * 60      # detik tanpa event sebelum sesi dianggap selesai
+MAX_OPEN_SESSIONS = 100000     # sesi terbuka maksimum di memori proses utama
+
+# Urutan funnel = urutan adegan di SCENES (prolog ... ending_*)
+STAGES = list(SCENES)
+STAGE_BIT = {scene: 1 << index for index, scene in enumerate(STAGES)}
+
+# ============================================================================
+# REKAP
+# ============================================================================
+
+class SessionPart:
+    """Ringkasan event satu sesi (di satu potongan, atau gabungan beberapa)"""
+    __slots__ = ("last_t", "last_scene", "last_hp", "reached", "outcome")
+
+    def __init__(self, t: float):
+        self.last_t = t
+        self.last_scene: Optional[str] = None  # adegan pilihan terakhir
+        self.last_hp = 0
+        self.reached = 0                    # bit STAGE_BIT adegan dan ending yang pernah dicapai
+        self.outcome: Optional[str] = None  # mati atau selesai jika sudah ada event akhir
+
+    def merge(self, other: "SessionPart"):
+        """Menambahkan event yang lebih baru (atau lebih lama) dari sesi yang sama"""
+        if other.last_t >= self.last_t:
+            self.last_t = other.last_t
+            if other.last_scene is not None:
+                self.last_scene = other.last_scene
+                self.last_hp = other.last_hp
+        elif self.last_scene is None:
+            self.last_scene = other.last_scene
+            self.last_hp = other.last_hp
+        self.reached |= other.reached
+        self.outcome = other.outcome or self.outcome
+
+    def choose(self, t: float, scene: str, hp: int, ending: Optional[str]):
+        """Event pilihan di `scene`; `ending` = ending terakhir yang sudah dicapai"""
+        if t >= self.last_t or self.last_scene is None:
+            self.last_scene = scene
+            self.last_hp = hp
+        self.last_t = max(self.last_t, t)
+        self.reached |= STAGE_BIT.get(scene, 0)
+        if ending:
+            self.reached |= STAGE_BIT.get(ending, 0)
+
+class TelemetryStats:
+    """Rekap yang bisa digabung; sesi yang sudah selesai hanya tersisa angkanya"""
+    def __init__(self):
+        self.events = 0
+        self.bad_lines = 0
+        self.sessions = 0
+        self.funnel: Counter = Counter()     # adegan atau ending -> sesi yang mencapainya
+        self.endings: Counter = Counter()    # jumlah ending berbeda yang dicapai -> sesi
+        self.heatmap: Dict[str, Counter] = {}  # adegan -> id pilihan -> jumlah
+        self.stops: Counter = Counter()      # (cara berakhir, adegan terakhir) -> sesi
+        self.outcomes: Counter = Counter()   # cara sesi berakhir: mati, selesai, terputus
+
+    def merge(self, other: "TelemetryStats"):
+        """Menambahkan angka (tanpa sesi terbuka) dari rekap lain"""
+        self.events += other.events
+        self.bad_lines += other.bad_lines
+        self.sessions += other.sessions
+        self.funnel.update(other.funnel)
+        self.endings.update(other.endings)
+        for scene, choices in other.heatmap.items():
+            self.heatmap.setdefault(scene, Counter()).update(choices)
+        self.stops.update(other.stops)
+        self.outcomes.update(other.outcomes)
+
+    def finish(self, part: SessionPart):
+        """Menghitung satu sesi yang sudah selesai ke funnel dan titik henti"""
+        self.sessions += 1
+        self.funnel["prolog"] += 1  # prolog tanpa pilihan; setiap sesi melewatinya
+        endings = 0
+        for scene in STAGES[1:]:
+            if part.reached & STAGE_BIT[scene]:
+                self.funnel[scene] += 1
+                if scene.startswith("ending_"):
+                    endings += 1
+        self.endings[endings] += 1
+        outcome = part.outcome or "terputus"
+        self.outcomes[outcome] += 1
+        self.stops[(outcome, part.last_scene or "prolog")] += 1
+
+    def report(self) -> str:
+        """Laporan teks yang mudah dibaca"""
+        lines = [f"Event dibaca   : {self.events} ({self.bad_lines} baris rusak)"]
+        lines.append(f"Sesi           : {self.sessions}")
+
+        lines.append("\nFunnel (sesi yang mencapai adegan):")
+        for scene in STAGES:
+            count = self.funnel[scene]
+            lines.append(f"  {scene:<20} {count:>10}  ({count / max(self.sessions, 1):.2%})")
+
+        lines.append("\nEnding berbeda yang dicapai per sesi:")
+        for endings, count in sorted(self.endings.items()):
+            lines.append(f"  {endings:<20} {count:>10}  ({count / max(self.sessions, 1):.2%})")
+
+        lines.append("\nCara sesi berakhir:")
+        for outcome, count in self.outcomes.most_common():
+            lines.append(f"  {outcome:<20} {count:>10}  ({count / max(self.sessions, 1):.2%})")
+
+        lines.append("\nTitik henti:")
+        for (reason, scene), count in self.stops.most_common(20):
+            lines.append(f"  {reason:<9} {scene:<20} {count:>10}")
+
+        lines.append("\nHeatmap pilihan per adegan:")
+        for scene in sorted(self.heatmap, key=lambda name: STAGE_BIT.get(name, 1 << 64)):
+            choices = self.heatmap[scene]
+            total = sum(choices.values())
+            lines.append(f"  {scene} ({total} pilihan)")
+            for option, count in choices.most_common():
+                bar = "█" * round(count / total * 30)
+                lines.append(f"    {count / total:>7.2%} {bar:<30} {option_label(option)}")
+        return "\n".join(lines)
+
+    def to_dict(self) -> Dict:
+        """Semua angka sebagai dict yang bisa di-JSON-kan"""
+        return {
+            "events": self.events,
+            "bad_lines": self.bad_lines,
+            "sessions": self.sessions,
+            "funnel": {scene: self.funnel[scene] for scene in STAGES},
+            "endings": {str(endings): count for endings, count in sorted(self.endings.items())},
+            "outcomes": dict(self.outcomes),
+            "stops": [{"reason": reason, "scene": scene, "sessions": count}
+                      for (reason, scene), count in self.stops.most_common()],
+            "heatmap": {scene: dict(choices) for scene, choices in self.heatmap.items()},
+        }
+
+def option_label(option: str) -> str:
+    """Id pilihan ("adegan.pilihan_N") beserta labelnya dalam DEFAULT_LANGUAGE"""
+    scene, _, key = option.partition(".")
+    try:
+        return f"{key} ({catalog(DEFAULT_LANGUAGE).messages(scene)[key]})"
+    except KeyError:
+        return option
+
+class ChunkResult:
+    """Hasil satu potongan: angka event dan ringkasan sesi yang muncul di dalamnya"""
+    def __init__(self):
+        self.stats = TelemetryStats()
+        self.sessions: Dict[str, SessionPart] = {}
+        self.max_t = 0.0
+
+# ============================================================================
+# PEMBACAAN PARALEL
+# ============================================================================
+
+def telemetry_files(path: str) -> List[str]:
+    """File log beserta rotasinya, dari yang tertua (pilihan.jsonl.N ... pilihan.jsonl)"""
+    rotated = []
+    index = 1
+    while os.path.exists(f"{path}.{index}"):
+        rotated.append(f"{path}.{index}")
+        index += 1
+    return rotated[::-1] + ([path] if os.path.exists(path) else [])
+
+def chunk_ranges(paths: Iterable[str], size: int = CHUNK_SIZE) -> List[Tuple[str, int, int]]:
+    """Potongan (file, awal, akhir) berurutan; batas baris dicari oleh worker"""
+    ranges = []
+    for path in paths:
+        length = os.path.getsize(path)
+        for start in range(0, length, size):
+            ranges.append((path, start, min(start + size, length)))
+    return ranges
+
+def analyze_chunk(path: str, start: int, end: int) -> ChunkResult:
+    """Membaca baris yang dimulai di [start, end) dari satu file"""
+    result = ChunkResult()
+    stats = result.stats
+    sessions = result.sessions
+    heatmap = stats.heatmap
+    with open(path, "rb") as file:
+        position = start
+        if start:
+            # Baris yang terpotong milik potongan sebelumnya
+            file.seek(start - 1)
+            position += len(file.readline()) - 1
+        for line in file:
+            if position >= end:
+                break
+            position += len(line)
+            try:
+                event = json.loads(line)
+                session_id = event["sesi"]
+                t = event["t"]
+                scene = event["scene"]
+                choice = event["choice"]
+            except (ValueError, KeyError, TypeError):
+                stats.bad_lines += 1
+                continue
+            stats.events += 1
+
+            part = sessions.get(session_id)
+            if part is None:
+                part = sessions[session_id] = SessionPart(t)
+            if t > result.max_t:
+                result.max_t = t
+
+            ending = event.get("ending")
+            if choice is None:
+                # Event ending (telemetry.record_ending) atau akhir game
+                # (telemetry.record_end); adegan terakhir tetap adegan
+                # pilihan terakhir
+                part.last_t = max(part.last_t, t)
+                if ending:
+                    part.reached |= STAGE_BIT.get(ending, 0)
+                if event.get("event") != "ending":
+                    part.outcome = "mati" if event.get("hp", 1) <= 0 else "selesai"
+                continue
+            part.choose(t, scene, event.get("hp", 0), ending)
+            option = event.get("option") or f"{scene}.#{choice}"
+            choices = heatmap.get(scene)
+            if choices is None:
+                choices = heatmap[scene] = Counter()
+            choices[option] += 1
+    return result
+
+class SessionTracker:
+    """Sesi yang mungkin masih punya event di potongan berikutnya"""
+    def __init__(self, stats: TelemetryStats, timeout: float = SESSION_TIMEOUT,
+                 max_open: int = MAX_OPEN_SESSIONS):
+        self.stats = stats
+        self.timeout = timeout
+        self.max_open = max_open
+        self.open: "OrderedDict[str, SessionPart]" = OrderedDict()  # urut event terakhir
+        self.watermark = 0.0
+
+    def add(self, result: ChunkResult):
+        """Menggabungkan satu potongan (harus berurutan sesuai waktu log)"""
+        self.stats.merge(result.stats)
+        for session_id, part in sorted(result.sessions.items(), key=lambda item: item[1].last_t):
+            current = self.open.get(session_id)
+            if current is None:
+                self.open[session_id] = part
+            else:
+                current.merge(part)
+                self.open.move_to_end(session_id)
+        self.watermark = max(self.watermark, result.max_t)
+        self.expire()
+
+    def expire(self):
+        """Menutup sesi yang sudah lama diam atau yang terlama jika terlalu banyak"""
+        limit = self.watermark - self.timeout
+        while self.open:
+            session_id, part = next(iter(self.open.items()))
+            if part.last_t >= limit and len(self.open) <= self.max_open:
+                break
+            del self.open[session_id]
+            self.stats.finish(part)
+
+    def close(self):
+        """Menutup semua sesi yang tersisa di akhir log"""
+        while self.open:
+            self.stats.finish(self.open.popitem(last=False)[1])
+
+def analyze(paths: List[str], workers: int = 0, chunk_size: int = CHUNK_SIZE,
+            timeout: float = SESSION_TIMEOUT,
+            max_open: int = MAX_OPEN_SESSIONS) -> TelemetryStats:
+    """Membaca semua log secara paralel lalu menggabungkan hasilnya berurutan"""
+    workers = workers or os.cpu_count() or 1
+    stats = TelemetryStats()
+    tracker = SessionTracker(stats, timeout, max_open)
+    ranges = chunk_ranges(paths, chunk_size)
+
+    if workers == 1:
+        for path, start, end in ranges:
+            tracker.add(analyze_chunk(path, start, end))
+        tracker.close()
+        return stats
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Hanya beberapa potongan yang berjalan sekaligus, supaya hasil yang
+        # belum digabung tidak menumpuk di memori
+        pending = []
+        for path, start, end in ranges:
+            pending.append(pool.submit(analyze_chunk, path, start, end))
+            if len(pending) >= workers * 2:
+                tracker.add(pending.pop(0).result())
+        for future in pending:
+            tracker.add(future.result())
+    tracker.close()
+    return stats
+
+def main():
+    """Entry point analisis telemetri"""
+    parser = argparse.ArgumentParser(description="Analisis telemetri BISIKAN DARI KABUT")
+    parser.add_argument("files", nargs="*", default=[TELEMETRY_FILE],
+                        help="file JSONL (file rotasi .1, .2, ... ikut dibaca)")
+    parser.add_argument("--workers", type=int, default=0, help="jumlah proses (0 = semua core)")
+    parser.add_argument("--chunk-mb", type=int, default=CHUNK_SIZE // (1024 * 1024),
+                        help="ukuran potongan per worker (MiB)")
+    parser.add_argument("--timeout", type=float, default=SESSION_TIMEOUT,
+                        help="detik tanpa event sebelum sesi dianggap selesai")
+    parser.add_argument("--max-open", type=int, default=MAX_OPEN_SESSIONS,
+                        help="sesi terbuka maksimum di memori")
+    parser.add_argument("--json", metavar="FILE", help="tulis hasil juga sebagai JSON")
+    args = parser.parse_args()
+
+    paths = [path for name in args.files for path in telemetry_files(name)]
+    if not paths:
+        raise SystemExit("Tidak ada file telemetri yang ditemukan")
+    total = sum(os.path.getsize(path) for path in paths)
+
+    start = time.perf_counter()
+    stats = analyze(paths, args.workers, args.chunk_mb * 1024 * 1024, args.timeout, args.max_open)
+    elapsed = time.perf_counter() - start
+
+    print(stats.report())
+    print(f"\n{total / elapsed / 1e6:,.1f} MB/detik, {stats.events / elapsed:,.0f} event/detik "
+          f"({elapsed:.2f} detik)")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(stats.to_dict(), file, indent=2, ensure_ascii=False)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+"""
+PAKET ASET - BISIKAN DARI KABUT
+
+Satu file berisi banyak entri bernama (misalnya isi setiap adegan dari
+adegan/*.json) yang masing-masing dikompresi terpisah dengan zlib atau
+lzma. Indeks offset ada di kepala file, jadi membuka paket hanya membaca
+indeks; file dibaca lewat mmap dan hanya entri yang diminta yang
+didekompresi. Entri yang baru didekompresi disimpan di LRU kecil. Memori
+yang terpakai sebanding dengan adegan yang sedang dimainkan, bukan dengan
+seluruh isi cerita, dan proses server yang di-fork berbagi page cache
+file yang sama.
+
+Format (little-endian):
+    magic "BDKP" | versi (u8) | codec (u8: 0 zlib, 1 lzma) | jumlah entri (u32)
+    indeks per entri: offset (u64) | ukuran terkompresi (u32) | ukuran asli (u32)
+                      | nama (panjang u8 + UTF-8)
+    data terkompresi setiap entri
+
+Paket adegan dibuat dari direktori adegan/ (urutan entri = index.json):
+    python assetpack.py build adegan adegan.pak
+
+Paket adalah hasil build, bukan sumber. Jika ada file sumber yang lebih baru
+dari paketnya (open_pack), paket dianggap basi: pemakainya memberi
+peringatan dan membaca file sumber, jadi perubahan di adegan/*.json tidak
+pernah tertutup paket lama.
+"""
+
+import argparse
+import glob
+import json
+import lzma
+import mmap
+import os
+import struct
+import tempfile
+import warnings
+import zlib
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+MAGIC = b"BDKP"
+VERSION = 1
+CODEC_ZLIB = 0
+CODEC_LZMA = 1
+PACK_CACHE = 8  # entri terdekompresi yang disimpan
+
+_HEADER = struct.Struct("<4sBBI")
+_ENTRY = struct.Struct("<QII")
+_LENGTH = struct.Struct("<B")
+
+_COMPRESS = {
+    CODEC_ZLIB: lambda data: zlib.compress(data, 9),
+    CODEC_LZMA: lambda data: lzma.compress(data, preset=9 | lzma.PRESET_EXTREME),
+}
+_DECOMPRESS = {
+    CODEC_ZLIB: zlib.decompress,
+    CODEC_LZMA: lzma.decompress,
+}
+
+def dumps(entries: Iterable[Tuple[str, bytes]], codec: int = CODEC_ZLIB) -> bytes:
+    """(nama, data) -> bytes paket; urutan entri dipertahankan"""
+    compress = _COMPRESS[codec]
+    names: List[bytes] = []
+    blobs: List[Tuple[bytes, int]] = []
+    for name, data in entries:
+        encoded = name.encode("utf-8")
+        if len(encoded) > 255:
+            raise ValueError(f"Nama entri terlalu panjang: {name}")
+        names.append(encoded)
+        blobs.append((compress(data), len(data)))
+
+    offset = _HEADER.size + sum(_ENTRY.size + _LENGTH.size + len(name) for name in names)
+    index: List[bytes] = [_HEADER.pack(MAGIC, VERSION, codec, len(names))]
+    for name, (blob, size) in zip(names, blobs):
+        index.append(_ENTRY.pack(offset, len(blob), size) + _LENGTH.pack(len(name)) + name)
+        offset += len(blob)
+    return b"".join(index) + b"".join(blob for blob, _ in blobs)
+
+def save(entries: Iterable[Tuple[str, bytes]], path: str, codec: int = CODEC_ZLIB):
+    """Menulis paket ke file secara atomik (tulis-lalu-rename)"""
+    data = dumps(entries, codec)
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix=".paket-", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+class AssetPack:
+    """Paket aset yang dibuka lewat mmap; entri didekompresi saat diminta"""
+    def __init__(self, path: str, cache: int = PACK_CACHE):
+        self.path = path
+        with open(path, "rb") as file:
+            self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self.names, self.index, self.codec = self._read_index()
+        except (struct.error, UnicodeDecodeError) as error:
+            self.map.close()
+            raise ValueError(f"Paket aset rusak: {path}") from error
+        except ValueError:
+            self.map.close()
+            raise
+        self.cache_size = cache
+        self.cache: "OrderedDict[str, bytes]" = OrderedDict()
+        self.reads = 0  # jumlah dekompresi (cache miss)
+
+    def _read_index(self) -> Tuple[List[str], Dict[str, Tuple[int, int, int]], int]:
+        """Membaca kepala file: (nama urut, nama -> (offset, ukuran, ukuran asli), codec)"""
+        magic, version, codec, count = _HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Bukan paket aset BISIKAN DARI KABUT: {self.path}")
+        if version != VERSION:
+            raise ValueError(f"Versi paket aset tidak didukung: {version}")
+        if codec not in _DECOMPRESS:
+            raise ValueError(f"Codec paket aset tidak dikenal: {codec}")
+        names: List[str] = []
+        index: Dict[str, Tuple[int, int, int]] = {}
+        position = _HEADER.size
+        for _ in range(count):
+            offset, size, raw_size = _ENTRY.unpack_from(self.map, position)
+            position += _ENTRY.size
+            (length,) = _LENGTH.unpack_from(self.map, position)
+            position += _LENGTH.size
+            name = self.map[position:position + length].decode("utf-8")
+            position += length
+            if offset + size > len(self.map):
+                raise ValueError(f"Entri {name} melewati akhir paket: {self.path}")
+            names.append(name)
+            index[name] = (offset, size, raw_size)
+        return names, index, codec
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.index
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def read(self, name: str) -> bytes:
+        """Isi entri `name` (KeyError jika tidak ada)"""
+        data = self.cache.get(name)
+        if data is not None:
+            self.cache.move_to_end(name)
+            return data
+        offset, size, raw_size = self.index[name]
+        with memoryview(self.map)[offset:offset + size] as blob:
+            data = _DECOMPRESS[self.codec](blob)
+        if len(data) != raw_size:
+            raise ValueError(f"Entri {name} rusak: {len(data)} byte, seharusnya {raw_size}")
+        self.reads += 1
+        self.cache[name] = data
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return data
+
+    def close(self):
+        """Menutup mmap"""
+        self.cache.clear()
+        self.map.close()
+
+def newer_sources(path: str, directory: str) -> List[str]:
+    """File *.json di `directory` yang lebih baru dari paket `path`"""
+    built = os.path.getmtime(path)
+    return [source for source in sorted(glob.glob(os.path.join(directory, "*.json")))
+            if os.path.getmtime(source) > built]
+
+def open_pack(path: Optional[str], directory: str, build: str) -> Optional["AssetPack"]:
+    """Paket `path` jika ada dan tidak lebih lama dari sumbernya di `directory`.
+
+    None jika paket tidak ada atau basi; untuk paket basi diberikan
+    peringatan berisi perintah `build` untuk membuatnya ulang.
+    """
+    if path is None or not os.path.exists(path):
+        return None
+    stale = newer_sources(path, directory)
+    if stale:
+        warnings.warn(f"{path} lebih lama dari {len(stale)} file di {directory} "
+                      f"(misalnya {os.path.basename(stale[0])}); file sumber yang dibaca. "
+                      f"Buat ulang paket: {build}", stacklevel=3)
+        return None
+    return AssetPack(path)
+
+def scene_entries(directory: str) -> List[Tuple[str, bytes]]:
+    """Isi adegan dari direktori adegan/ sesuai urutan index.json, JSON diringkas"""
+    with open(os.path.join(directory, "index.json"), encoding="utf-8") as file:
+        names = json.load(file)["scenes"]
+    entries = []
+    for name in names:
+        with open(os.path.join(directory, f"{name}.json"), encoding="utf-8") as file:
+            data = json.load(file)
+        entries.append((name, json.dumps(data, ensure_ascii=False,
+                                         separators=(",", ":")).encode("utf-8")))
+    return entries
+
+def main():
+    """Entry point pembuat & pemeriksa paket aset"""
+    parser = argparse.ArgumentParser(description="Paket aset BISIKAN DARI KABUT")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build_parser = commands.add_parser("build", help="buat paket dari direktori adegan")
+    build_parser.add_argument("directory", nargs="?", default="adegan")
+    build_parser.add_argument("output", nargs="?", default="adegan.pak")
+    build_parser.add_argument("--lzma", action="store_true", help="kompresi lzma (default zlib)")
+    list_parser = commands.add_parser("list", help="tampilkan isi paket")
+    list_parser.add_argument("path", nargs="?", default="adegan.pak")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        entries = scene_entries(args.directory)
+        save(entries, args.output, CODEC_LZMA if args.lzma else CODEC_ZLIB)
+        raw = sum(len(data) for _, data in entries)
+        packed = os.path.getsize(args.output)
+        print(f"✅ {args.output}: {len(entries)} entri, {raw:,} -> {packed:,} byte "
+              f"({packed / max(raw, 1):.0%})")
+        return
+
+    pack = AssetPack(args.path)
+    try:
+        codec = "lzma" if pack.codec == CODEC_LZMA else "zlib"
+        print(f"{args.path}: {len(pack)} entri ({codec})")
+        for name in pack.names:
+            _, size, raw_size = pack.index[name]
+            print(f"  {name:<24} {raw_size:>8,} -> {size:>7,} byte")
+    finally:
+        pack.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+BENCHMARK - BISIKAN DARI KABUT
+
+Mengukur bagian game yang paling sering jalan, dengan seed dan jumlah
+iterasi tetap supaya hasil antar run bisa dibandingkan:
+
+    import_game     waktu impor dingin game.py di proses baru (detik, kecil = baik)
+    typewriter      karakter/detik typewriter_effect dengan delay 0 ke sink kosong
+    transitions     langkah step() per detik dengan pilihan acak
+    fights          pertarungan_shadow per detik (serang dengan pisau sampai selesai)
+    playthroughs    game headless per detik dari prolog sampai ending atau mati
+
+Setiap angka adalah hasil terbaik dari beberapa pengulangan. Hasil ditulis
+ke file JSON dan dibandingkan dengan baseline (dibuat sekali per mesin
+dengan --save-baseline); perubahan lebih buruk dari toleransi membuat
+program keluar dengan kode 1.
+
+Contoh:
+    python bench.py --save-baseline
+    python bench.py --tolerance 0.10
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List
+
+import game
+from game import INVENTORY_BITS, SHADOW_HP, GameState, SessionRng, step
+from simulate import SimulationStats, play_one, random_policy
+
+RESULT_FILE = "bench-hasil.json"
+BASELINE_FILE = "bench-baseline.json"
+
+# Metrik yang lebih baik jika lebih kecil; sisanya lebih baik jika lebih besar
+LOWER_IS_BETTER = {"import_game"}
+
+# ============================================================================
+# PENGUKURAN
+# ============================================================================
+
+def best_of(repeats: int, measure: Callable[[], float], lower: bool = False) -> float:
+    """Hasil terbaik beberapa pengukuran (seperti timeit), paling tahan gangguan"""
+    values = [measure() for _ in range(repeats)]
+    return min(values) if lower else max(values)
+
+def bench_import() -> float:
+    """Waktu impor game.py di interpreter baru (tanpa waktu start Python)"""
+    code = "import time; t = time.perf_counter(); import game; print(time.perf_counter() - t)"
+    here = os.path.dirname(os.path.abspath(__file__))
+    output = subprocess.run([sys.executable, "-c", code], cwd=here, check=True,
+                            capture_output=True, text=True).stdout
+    return float(output)
+
+class NullSink(io.TextIOBase):
+    """stdout palsu yang membuang semua tulisan"""
+    def write(self, text: str) -> int:
+        return len(text)
+
+def bench_typewriter(texts: List[str], rounds: int = 20) -> float:
+    """Karakter per detik typewriter_effect(delay=0) ke NullSink"""
+    chars = sum(len(text) for text in texts) * rounds
+    stdout, sys.stdout = sys.stdout, NullSink()
+    try:
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for text in texts:
+                game.typewriter_effect(text, 0)
+        elapsed = time.perf_counter() - start
+    finally:
+        sys.stdout = stdout
+    return chars / elapsed
+
+def bench_transitions(steps: int = 20000, seed: int = 0) -> float:
+    """Langkah step() per detik; sesi baru setiap kali game selesai"""
+    policy = random.Random(seed)
+    rng = SessionRng(seed)
+    text, options, game_state = step(GameState(), None, rng)
+    start = time.perf_counter()
+    for _ in range(steps):
+        if not options:
+            text, options, game_state = step(GameState(), None, rng)
+        text, options, game_state = step(game_state, policy.randint(1, len(options)), rng)
+    return steps / (time.perf_counter() - start)
+
+def bench_fights(fights: int = 5000, seed: int = 0) -> float:
+    """Pertarungan per detik lewat mesin game"""
+    rng = SessionRng(seed)
+    start_state = GameState()
+    start_state.inventory_bits = INVENTORY_BITS["pisau_tua"]
+    start_state.scene = "pertarungan_shadow"
+    start_state.enemy_hp = SHADOW_HP
+    start = time.perf_counter()
+    for _ in range(fights):
+        game_state = start_state
+        while game_state.scene == "pertarungan_shadow":
+            text, options, game_state = step(game_state, 1, rng)
+    return fights / (time.perf_counter() - start)
+
+def bench_playthroughs(games: int = 500, seed: int = 0) -> float:
+    """Game headless per detik (seperti simulate.py, satu proses)"""
+    policy = random.Random(seed)
+    rng = SessionRng(seed)
+    stats = SimulationStats()
+    start = time.perf_counter()
+    for _ in range(games):
+        play_one(random_policy, policy, stats, 500, rng)
+    return games / (time.perf_counter() - start)
+
+def scene_texts() -> List[str]:
+    """Narasi yang ditampilkan di awal game, sebagai bahan typewriter"""
+    text, options, game_state = step(GameState(), None, SessionRng(0))
+    text += step(game_state, 1, SessionRng(0))[0]
+    return [part for kind, part, _ in text if kind == game.SEG_NARRATION]
+
+def run_all(repeats: int = 5) -> Dict[str, float]:
+    """Semua metrik (terbaik dari `repeats` pengulangan)"""
+    texts = scene_texts()
+    return {
+        "import_game": best_of(repeats, bench_import, lower=True),
+        "typewriter": best_of(repeats, lambda: bench_typewriter(texts)),
+        "transitions": best_of(repeats, bench_transitions),
+        "fights": best_of(repeats, bench_fights),
+        "playthroughs": best_of(repeats, bench_playthroughs),
+    }
+
+# ============================================================================
+# PERBANDINGAN
+# ============================================================================
+
+def compare(results: Dict[str, float], baseline: Dict[str, float],
+            tolerance: float) -> List[str]:
+    """Metrik yang lebih buruk dari baseline melebihi toleransi"""
+    regressions = []
+    for name, value in results.items():
+        if name not in baseline:
+            continue
+        if name in LOWER_IS_BETTER:
+            change = value / baseline[name] - 1
+        else:
+            change = baseline[name] / value - 1
+        if change > tolerance:
+            regressions.append(name)
+    return regressions
+
+def main():
+    """Entry point benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark BISIKAN DARI KABUT")
+    parser.add_argument("--repeats", type=int, default=5, help="pengulangan per metrik")
+    parser.add_argument("--output", default=RESULT_FILE)
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="simpan hasil ini sebagai baseline")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="penurunan yang masih diterima (0.10 = 10%%)")
+    args = parser.parse_args()
+
+    results = run_all(args.repeats)
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+
+    baseline: Dict[str, float] = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+    regressions = compare(results, baseline, args.tolerance)
+
+    print(f"{'metrik':<14} {'hasil':>14} {'baseline':>14} {'perubahan':>10}")
+    for name, value in results.items():
+        if name in baseline:
+            change = value / baseline[name] - 1
+            mark = "  ❌" if name in regressions else ""
+            print(f"{name:<14} {value:>14.6g} {baseline[name]:>14.6g} {change:>+10.1%}{mark}")
+        else:
+            print(f"{name:<14} {value:>14.6g} {'-':>14} {'-':>10}")
+    raise SystemExit(1 if regressions else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CLUSTER MULTI-PROSES - BISIKAN DARI KABUT
+
+Satu proses asyncio dibatasi GIL. Supervisor ini mem-fork N worker, masing-
+masing menjalankan server.GameServer di port lokalnya sendiri. Front di
+proses supervisor menerima pemain, menanyakan bahasa dan nama, lalu
+meneruskan koneksi ke worker berdasarkan hash id sesi, jadi sesi yang sama
+selalu berada di worker yang sama. Worker hanya memuat katalog bahasa
+(katalog.py) yang benar-benar dipakai pemainnya.
+
+Sesi bisa dipindah antar worker (rebalancing): GameState dikeluarkan dari
+store worker asal dalam format savegame, dikirim lewat pipe kontrol, lalu
+dimasukkan ke store worker tujuan. Pemain yang masuk saat sesinya sedang
+dipindah menunggu sampai rute baru tercatat. Semua worker menumpahkan sesi ke
+direktori yang sama, jadi setelah restart setiap worker bisa memuat sesi
+mana pun.
+
+Contoh:
+    python cluster.py --workers 4 --port 4000
+    python cluster.py --workers 4 --bench-moves 100000
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import shutil
+import signal
+import tempfile
+import time
+import zlib
+from multiprocessing.connection import Connection
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+import savegame
+from game import GameState
+from katalog import DEFAULT_LANGUAGE, LANGUAGES, catalog
+from server import HOST, PORT, READ_LIMIT, GameServer, handoff, read_language, read_name
+from sessions import SESSION_CAPACITY, SESSION_DIR, SessionStore
+
+CONTROL_BATCH = 1024  # perintah kontrol maksimum per pesan pipe
+
+def shard_for(session_id: str, workers: int) -> int:
+    """Worker tetap untuk sebuah id sesi (stabil antar proses dan restart)"""
+    return zlib.crc32(session_id.encode("utf-8")) % workers
+
+# ============================================================================
+# WORKER
+# ============================================================================
+
+def handle_command(server: GameServer, command: Tuple) -> object:
+    """Menjalankan satu perintah kontrol dari supervisor di dalam worker"""
+    op, *args = command
+    if op == "export":
+        (session_id,) = args
+        if session_id in server.playing:
+            return None  # sesi sedang dimainkan; tidak dipindah
+        game_state = server.store.take(session_id)
+        return savegame.dumps(game_state) if game_state is not None else None
+    if op == "import":
+        session_id, data = args
+        server.store.put(session_id, savegame.loads(data))
+        return True
+    if op == "count":
+        return len(server.store)
+    raise ValueError(f"Perintah tidak dikenal: {op}")
+
+def worker_main(port: int, control: Connection, delay: float, directory: str,
+                capacity: int, seed: Optional[int], languages: Sequence[str]):
+    """Isi proses worker: GameServer ditambah pipe kontrol dari supervisor"""
+    server = GameServer(delay, seed, SessionStore(directory, capacity), prompt=False,
+                        languages=languages)
+
+    async def run():
+        loop = asyncio.get_running_loop()
+
+        def on_command():
+            # Satu pesan berisi satu batch perintah; jawabannya juga satu pesan
+            while control.poll():
+                replies = []
+                for request_id, command in control.recv():
+                    try:
+                        result = handle_command(server, command)
+                    except ValueError as error:
+                        result = error
+                    replies.append((request_id, result))
+                control.send(replies)
+
+        loop.add_reader(control.fileno(), on_command)
+        # SIGTERM dari supervisor membatalkan server, jadi store sempat di-flush
+        loop.add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+        await server.serve("127.0.0.1", port)
+
+    try:
+        asyncio.run(run())
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+
+class Worker:
+    """Pegangan supervisor untuk satu proses worker"""
+    def __init__(self, index: int, port: int, process: multiprocessing.Process,
+                 control: Connection):
+        self.index = index
+        self.port = port
+        self.process = process
+        self.control = control
+        self.waiting: Dict[int, asyncio.Future] = {}
+        self.outbox: List[Tuple[int, Tuple]] = []
+        self.in_flight = False
+        self.next_id = 0
+
+    def request(self, *command) -> asyncio.Future:
+        """Mengirim perintah ke worker; future berisi jawabannya"""
+        self.next_id += 1
+        future = asyncio.get_running_loop().create_future()
+        self.waiting[self.next_id] = future
+        self.outbox.append((self.next_id, command))
+        if len(self.outbox) == 1 and not self.in_flight:
+            asyncio.get_running_loop().call_soon(self.send_batch)
+        return future
+
+    def send_batch(self):
+        """Mengirim perintah yang terkumpul sebagai satu pesan.
+
+        Hanya satu batch yang boleh belum dijawab, jadi supervisor dan worker
+        tidak pernah saling menunggu dengan buffer pipe yang penuh.
+        """
+        if self.in_flight or not self.outbox:
+            return
+        batch = self.outbox[:CONTROL_BATCH]
+        del self.outbox[:CONTROL_BATCH]
+        self.in_flight = True
+        self.control.send(batch)
+
+    def on_reply(self):
+        """Dipanggil loop asyncio saat pipe kontrol bisa dibaca"""
+        while self.control.poll():
+            for request_id, result in self.control.recv():
+                future = self.waiting.pop(request_id)
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+            self.in_flight = False
+        self.send_batch()
+
+# ============================================================================
+# SUPERVISOR & FRONT
+# ============================================================================
+
+class Supervisor:
+    """Mem-fork worker dan meneruskan setiap pemain ke worker miliknya"""
+    def __init__(self, workers: int, port: int = PORT, delay: float = 0.02,
+                 directory: str = SESSION_DIR, capacity: int = SESSION_CAPACITY,
+                 seed: Optional[int] = None, languages: Sequence[str] = (DEFAULT_LANGUAGE,)):
+        self.count = workers
+        self.base_port = port + 1
+        self.delay = delay
+        self.directory = directory
+        self.capacity = capacity
+        self.seed = seed
+        self.languages = tuple(languages)
+        self.workers: List[Worker] = []
+        self.routes: Dict[str, int] = {}  # sesi yang sudah dipindah dari worker hash-nya
+        self.playing: Set[str] = set()
+        self.moving: Dict[str, asyncio.Event] = {}  # sesi yang sedang dipindah
+
+    def start(self):
+        """Mem-fork semua worker"""
+        context = multiprocessing.get_context("fork")
+        for index in range(self.count):
+            parent, child = context.Pipe()
+            port = self.base_port + index
+            seed = None if self.seed is None else self.seed + index
+            process = context.Process(
+                target=worker_main, daemon=True,
+                args=(port, child, self.delay, self.directory, self.capacity, seed,
+                      self.languages),
+            )
+            process.start()
+            child.close()
+            self.workers.append(Worker(index, port, process, parent))
+
+    def stop(self):
+        """Menghentikan semua worker"""
+        for worker in self.workers:
+            worker.process.terminate()
+        for worker in self.workers:
+            worker.process.join()
+
+    def worker_for(self, session_id: str) -> Worker:
+        """Worker yang memegang sesi ini"""
+        index = self.routes.get(session_id)
+        if index is None:
+            index = shard_for(session_id, self.count)
+        return self.workers[index]
+
+    async def move(self, session_id: str, target: int) -> bool:
+        """Memindahkan GameState sesi ke worker `target`; False jika tidak bisa"""
+        source = self.worker_for(session_id)
+        if source.index == target or session_id in self.playing or session_id in self.moving:
+            return source.index == target
+        # Pemain yang masuk di tengah perpindahan menunggu rute baru (lihat handle)
+        done = self.moving[session_id] = asyncio.Event()
+        try:
+            data = await source.request("export", session_id)
+            if data is None:
+                return False
+            await self.workers[target].request("import", session_id, data)
+            if target == shard_for(session_id, self.count):
+                self.routes.pop(session_id, None)
+            else:
+                self.routes[session_id] = target
+            return True
+        finally:
+            del self.moving[session_id]
+            done.set()
+
+    async def rebalance(self, moves: List[Tuple[str, int]]) -> int:
+        """Menjalankan banyak perpindahan sekaligus; jumlah yang berhasil"""
+        results = await asyncio.gather(*(self.move(session_id, target)
+                                         for session_id, target in moves))
+        return sum(results)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Front: menanyakan bahasa dan nama lalu meneruskan koneksi ke worker"""
+        session_id = None
+        try:
+            lang = await read_language(reader, writer, self.languages)
+            if lang is None:
+                return
+            login = await read_name(reader, writer, self.playing, messages=catalog(lang))
+            if login is None:
+                return
+            session_id, guest = login
+            self.playing.add(session_id)
+            moving = self.moving.get(session_id)
+            if moving is not None:
+                # State sesi sudah dikeluarkan dari worker asal; worker yang
+                # benar baru diketahui setelah rutenya tercatat
+                await moving.wait()
+            worker = self.worker_for(session_id)
+            upstream_reader, upstream_writer = await asyncio.open_connection("127.0.0.1", worker.port)
+            # Worker memakai bahasa dan nama yang sama; tamu dibuatkan id oleh worker
+            upstream_writer.write(handoff(lang, session_id, guest))
+            await asyncio.gather(pipe(reader, upstream_writer), pipe(upstream_reader, writer))
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            self.playing.discard(session_id)
+            writer.close()
+
+    async def serve(self, host: str = HOST, port: int = PORT):
+        """Menjalankan front sampai dihentikan"""
+        loop = asyncio.get_running_loop()
+        for worker in self.workers:
+            loop.add_reader(worker.control.fileno(), worker.on_reply)
+        server = await asyncio.start_server(self.handle, host, port, limit=READ_LIMIT)
+        async with server:
+            await server.serve_forever()
+
+async def pipe(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """Menyalin data satu arah sampai salah satu sisi ditutup"""
+    try:
+        while True:
+            data = await reader.read(65536)
+            if not data:
+                break
+            writer.write(data)
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+async def bench_moves(supervisor: Supervisor, moves: int) -> float:
+    """Mengisi sesi lalu memindahkan semuanya ke worker berikutnya; perpindahan/detik"""
+    loop = asyncio.get_running_loop()
+    for worker in supervisor.workers:
+        loop.add_reader(worker.control.fileno(), worker.on_reply)
+    data = savegame.dumps(GameState())
+    ids = [f"bench-{i}" for i in range(moves)]
+    await asyncio.gather(*(supervisor.worker_for(session_id).request("import", session_id, data)
+                           for session_id in ids))
+
+    start = time.perf_counter()
+    moved = await supervisor.rebalance([
+        (session_id, (supervisor.worker_for(session_id).index + 1) % supervisor.count)
+        for session_id in ids
+    ])
+    elapsed = time.perf_counter() - start
+    print(f"{moved}/{moves} sesi dipindah dalam {elapsed:.2f} detik")
+    return moved / elapsed
+
+def main():
+    """Entry point cluster"""
+    parser = argparse.ArgumentParser(description="Cluster multi-proses BISIKAN DARI KABUT")
+    parser.add_argument("--workers", type=int, default=0, help="jumlah worker (0 = semua core)")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT, help="port front; worker di port+1..")
+    parser.add_argument("--delay", type=float, default=0.02, help="detik per karakter typewriter")
+    parser.add_argument("--seed", type=int, help="seed RngProvider worker pertama")
+    parser.add_argument("--sessions", default=SESSION_DIR, help="direktori sesi bersama")
+    parser.add_argument("--capacity", type=int, default=SESSION_CAPACITY,
+                        help="jumlah GameState maksimum di memori per worker")
+    parser.add_argument("--bench-moves", type=int, default=0,
+                        help="ukur perpindahan sesi per detik (di direktori sementara) lalu keluar")
+    parser.add_argument("--lang", nargs="+", choices=LANGUAGES, default=[DEFAULT_LANGUAGE],
+                        help="bahasa yang ditawarkan ke pemain (yang pertama = default)")
+    args = parser.parse_args()
+
+    # Sesi benchmark (bench-*) ditumpahkan ke direktori sementara, bukan ke
+    # direktori sesi pemain
+    directory = tempfile.mkdtemp(prefix="bench-sesi-") if args.bench_moves else args.sessions
+    supervisor = Supervisor(args.workers or os.cpu_count() or 1, args.port, args.delay,
+                            directory, args.capacity, args.seed, args.lang)
+    supervisor.start()
+    try:
+        if args.bench_moves:
+            rate = asyncio.run(bench_moves(supervisor, args.bench_moves))
+            print(f"{rate:,.0f} perpindahan/detik dengan {supervisor.count} worker")
+        else:
+            print(f"BISIKAN DARI KABUT berjalan di {args.host}:{args.port} "
+                  f"dengan {supervisor.count} worker")
+            asyncio.run(supervisor.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        supervisor.stop()
+        if args.bench_moves:
+            shutil.rmtree(directory, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
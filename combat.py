@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ANALISIS PERTARUNGAN - BISIKAN DARI KABUT
+
+Menghitung peluang pasti hasil pertarungan_shadow (menang, lari, kalah)
+dengan dynamic programming atas grid (HP pemain, HP musuh), bukan dengan
+sampling. Damage diambil dari rentang yang sama dengan game.py, jadi hasil
+selalu sesuai dengan aturan pertarungan di game.
+
+batch_fights menyelesaikan jutaan pertarungan sekaligus dengan array NumPy
+untuk menyetel HP musuh dan rentang damage (NumPy opsional, hanya untuk
+fungsi itu).
+
+Contoh:
+    python combat.py --knife --charm
+    python combat.py --knife --batch 1000000
+"""
+
+import argparse
+import time
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # numpy hanya dibutuhkan untuk batch_fights
+    np = None
+
+from game import (DEFEND_DAMAGE, FIST_DAMAGE, KNIFE_DAMAGE, NO_CHARM_DAMAGE,
+                  SHADOW_DAMAGE, SHADOW_HP, GameState, check_inventory_item)
+
+# Aksi sesuai urutan pilihan di pertarungan_shadow
+ATTACK, CHARM, FLEE, DEFEND = 1, 2, 3, 4
+ACTIONS = (ATTACK, CHARM, FLEE, DEFEND)
+ACTION_NAMES = {ATTACK: "serang", CHARM: "jimat", FLEE: "lari", DEFEND: "bertahan"}
+
+# Peluang (menang, lari, kalah)
+Outcome = Tuple[float, float, float]
+WIN: Outcome = (1.0, 0.0, 0.0)
+FLED: Outcome = (0.0, 1.0, 0.0)
+LOSS: Outcome = (0.0, 0.0, 1.0)
+
+# Kode hasil per jalur batch_fights
+RESULT_WIN, RESULT_FLED, RESULT_LOSS = 0, 1, 2
+
+def _average(outcomes: Sequence[Outcome]) -> Outcome:
+    """Rata-rata beberapa hasil yang sama peluangnya"""
+    n = len(outcomes)
+    return (
+        sum(o[0] for o in outcomes) / n,
+        sum(o[1] for o in outcomes) / n,
+        sum(o[2] for o in outcomes) / n,
+    )
+
+def _damages(bounds: Tuple[int, int]) -> range:
+    """Semua nilai damage dalam rentang inklusif"""
+    return range(bounds[0], bounds[1] + 1)
+
+# ============================================================================
+# TABEL HASIL
+# ============================================================================
+
+class CombatTable:
+    """Peluang hasil dan aksi terbaik untuk setiap pasangan (HP pemain, HP musuh)"""
+    def __init__(self, outcomes: List[List[Outcome]], actions: List[List[int]]):
+        self.outcomes = outcomes
+        self.actions = actions
+
+    def outcome(self, player_hp: int, enemy_hp: int = SHADOW_HP) -> Outcome:
+        """Peluang (menang, lari, kalah) dari posisi ini sampai pertarungan selesai"""
+        if player_hp <= 0:
+            return WIN  # pertarungan_shadow tidak pernah dimulai jika HP <= 0
+        return self.outcomes[player_hp][enemy_hp]
+
+    def best_action(self, player_hp: int, enemy_hp: int = SHADOW_HP) -> int:
+        """Aksi yang dipakai tabel ini pada posisi tersebut"""
+        return self.actions[player_hp][enemy_hp]
+
+@lru_cache(maxsize=None)
+def solve_combat(has_knife: bool = False, has_charm: bool = False,
+                 policy: Optional[int] = None, rewards: Outcome = (1.0, 0.0, 0.0),
+                 max_hp: int = 100, enemy_hp: int = SHADOW_HP) -> CombatTable:
+    """Menghitung tabel hasil pertarungan.
+
+    Dengan `policy` None, setiap posisi memakai aksi yang memaksimalkan nilai
+    harapan `rewards` (bobot menang, lari, kalah). Dengan `policy` berisi
+    sebuah aksi, aksi itu selalu dipakai. Hasil disimpan di cache.
+    """
+    attack_damage = _damages(KNIFE_DAMAGE if has_knife else FIST_DAMAGE)
+    shadow_damage = _damages(SHADOW_DAMAGE)
+    no_charm_damage = _damages(NO_CHARM_DAMAGE)
+    defend_damage = _damages(DEFEND_DAMAGE)
+
+    def value(outcome: Outcome) -> float:
+        return outcome[0] * rewards[0] + outcome[1] * rewards[1] + outcome[2] * rewards[2]
+
+    # outcomes[p][e]: hasil dari awal ronde; after_attack[p][e]: hasil setelah
+    # pemain beraksi, sebelum serangan balik musuh. Baris p = 0 berarti kalah.
+    outcomes = [[LOSS] * (enemy_hp + 1) for _ in range(max_hp + 1)]
+    after_attack = [[LOSS] * (enemy_hp + 1) for _ in range(max_hp + 1)]
+    actions = [[FLEE] * (enemy_hp + 1) for _ in range(max_hp + 1)]
+
+    # Setiap aksi selain lari menurunkan HP pemain atau musuh, jadi cukup
+    # menghitung dari HP kecil ke besar
+    for p in range(1, max_hp + 1):
+        for e in range(1, enemy_hp + 1):
+            after_attack[p][e] = _average([
+                outcomes[p - k][e] if p - k > 0 else LOSS for k in shadow_damage
+            ])
+
+            choices = {
+                ATTACK: _average([
+                    after_attack[p][e - d] if e - d > 0 else WIN for d in attack_damage
+                ]),
+                CHARM: after_attack[p][e] if has_charm else _average([
+                    after_attack[max(p - s, 0)][e] for s in no_charm_damage
+                ]),
+                FLEE: FLED,
+                DEFEND: _average([after_attack[max(p - s, 0)][e] for s in defend_damage]),
+            }
+            if policy is None:
+                best = max(ACTIONS, key=lambda action: value(choices[action]))
+            else:
+                best = policy
+            outcomes[p][e] = choices[best]
+            actions[p][e] = best
+
+    return CombatTable(outcomes, actions)
+
+def solve_for(game_state: GameState, policy: Optional[int] = None) -> CombatTable:
+    """Tabel hasil untuk inventori pemain saat ini"""
+    return solve_combat(
+        check_inventory_item(game_state, "pisau_tua"),
+        check_inventory_item(game_state, "jimat_pelindung"),
+        policy,
+    )
+
+# ============================================================================
+# SIMULASI BATCH (NUMPY)
+# ============================================================================
+
+def batch_fights(n: int, player_hp: Union[int, "np.ndarray"] = 100,
+                 actions: Union[int, "np.ndarray"] = ATTACK,
+                 has_knife: bool = False, has_charm: bool = False,
+                 enemy_hp: int = SHADOW_HP, seed: Optional[int] = None):
+    """Menyelesaikan `n` pertarungan sekaligus dengan aturan pertarungan_shadow.
+
+    Setiap jalur memakai satu aksi tetap (`actions` skalar atau array per
+    jalur). Setiap ronde, damage untuk semua jalur yang masih bertarung
+    diambil sekaligus sebagai array, lalu jalur yang selesai dikeluarkan.
+    Mengembalikan (kode hasil RESULT_*, HP akhir pemain, jumlah ronde).
+    """
+    if np is None:
+        raise ImportError("batch_fights membutuhkan numpy (pip install numpy)")
+    rng = np.random.default_rng(seed)
+
+    player = np.broadcast_to(np.asarray(player_hp, dtype=np.int32), (n,)).copy()
+    action = np.broadcast_to(np.asarray(actions, dtype=np.int8), (n,)).copy()
+    result = np.full(n, RESULT_WIN, dtype=np.int8)
+    rounds = np.zeros(n, dtype=np.int32)
+    attack = KNIFE_DAMAGE if has_knife else FIST_DAMAGE
+
+    # Jalur dengan HP <= 0 menang tanpa bertarung, seperti di game
+    lane = np.flatnonzero(player > 0)
+    enemy = np.full(lane.size, enemy_hp, dtype=np.int32)
+    player_lane = player[lane]
+    action_lane = action[lane]
+
+    fled = action_lane == FLEE
+    result[lane[fled]] = RESULT_FLED
+    rounds[lane[fled]] = 1
+    keep = ~fled
+    lane, enemy, player_lane, action_lane = lane[keep], enemy[keep], player_lane[keep], action_lane[keep]
+
+    while lane.size:
+        size = lane.size
+        # Matriks damage ronde ini: satu baris per sumber damage
+        drawn = np.empty((4, size), dtype=np.int32)
+        drawn[0] = rng.integers(attack[0], attack[1] + 1, size)
+        drawn[1] = 0 if has_charm else rng.integers(NO_CHARM_DAMAGE[0], NO_CHARM_DAMAGE[1] + 1, size)
+        drawn[2] = rng.integers(DEFEND_DAMAGE[0], DEFEND_DAMAGE[1] + 1, size)
+        drawn[3] = rng.integers(SHADOW_DAMAGE[0], SHADOW_DAMAGE[1] + 1, size)
+
+        enemy -= np.where(action_lane == ATTACK, drawn[0], 0)
+        player_lane -= np.where(action_lane == CHARM, drawn[1],
+                                np.where(action_lane == DEFEND, drawn[2], 0))
+        player_lane -= np.where(enemy > 0, drawn[3], 0)
+        rounds[lane] += 1
+
+        lost = player_lane <= 0
+        won = ~lost & (enemy <= 0)
+        result[lane[lost]] = RESULT_LOSS
+        result[lane[won]] = RESULT_WIN
+        player[lane] = player_lane
+
+        keep = ~(lost | won)
+        lane, enemy, player_lane, action_lane = lane[keep], enemy[keep], player_lane[keep], action_lane[keep]
+
+    return result, player, rounds
+
+def main():
+    """Menampilkan peluang hasil pertarungan untuk beberapa HP awal"""
+    parser = argparse.ArgumentParser(description="Peluang pasti hasil pertarungan_shadow")
+    parser.add_argument("--knife", action="store_true", help="pemain punya pisau_tua")
+    parser.add_argument("--charm", action="store_true", help="pemain punya jimat_pelindung")
+    parser.add_argument("--policy", type=int, choices=ACTIONS, help="selalu memakai aksi ini")
+    parser.add_argument("--enemy-hp", type=int, default=SHADOW_HP)
+    parser.add_argument("--batch", type=int, default=0,
+                        help="juga jalankan sejumlah pertarungan dengan batch_fights")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    table = solve_combat(args.knife, args.charm, args.policy, enemy_hp=args.enemy_hp)
+    elapsed = time.perf_counter() - start
+
+    print(f"Musuh HP {args.enemy_hp}, pisau: {args.knife}, jimat: {args.charm} "
+          f"({elapsed * 1000:.1f} ms)")
+    print(f"{'HP':>4} {'menang':>8} {'lari':>8} {'kalah':>8}  aksi")
+    for hp in (100, 90, 75, 50, 35, 25, 10):
+        win, fled, lost = table.outcome(hp, args.enemy_hp)
+        action = ACTION_NAMES[table.best_action(hp, args.enemy_hp)]
+        print(f"{hp:>4} {win:>8.2%} {fled:>8.2%} {lost:>8.2%}  {action}")
+
+    if args.batch:
+        action = args.policy or ATTACK
+        exact = solve_combat(args.knife, args.charm, action, enemy_hp=args.enemy_hp)
+        print(f"\nbatch_fights: {args.batch} pertarungan per HP, aksi {ACTION_NAMES[action]}")
+        print(f"{'HP':>4} {'menang':>8} {'pasti':>8} {'selisih/sigma':>14}  pertarungan/detik")
+        for hp in (100, 75, 50, 35, 25):
+            start = time.perf_counter()
+            result = batch_fights(args.batch, hp, action, args.knife, args.charm, args.enemy_hp)[0]
+            elapsed = time.perf_counter() - start
+            win = float((result == RESULT_WIN).mean())
+            expected = exact.outcome(hp, args.enemy_hp)[0]
+            sigma = max((expected * (1 - expected) / args.batch) ** 0.5, 1e-12)
+            print(f"{hp:>4} {win:>8.2%} {expected:>8.2%} {(win - expected) / sigma:>14.2f}  "
+                  f"{args.batch / elapsed:,.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PENJELAJAH RUANG STATE - BISIKAN DARI KABUT
+
+Menelusuri setiap pasangan (adegan, GameState) yang bisa dicapai dengan BFS
+lewat mesin headless (game.step). State yang sudah dikunjungi disimpan dalam
+set berdasarkan kunci kanonik (inventori, lokasi, puzzle, flag cerita, HP
+yang dikelompokkan), sehingga graf adegan yang bercabang tidak meledak.
+
+Angka acak pertarungan ditelusuri sebagai cabang: setiap lemparan dadu
+dicoba pada beberapa titik rentangnya (default: minimum dan maksimum).
+Setiap jalur yang ditemukan adalah jalur nyata, jadi ending yang ditemukan
+terbukti bisa dicapai.
+
+Contoh:
+    python explore.py --hp-bucket 10 --rolls 2
+"""
+
+import argparse
+import time
+from collections import deque
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from game import GameState, Text, step
+
+ENDINGS = ("ending_baik", "ending_buruk", "ending_misteri", "ending_rahasia")
+
+StateKey = Tuple
+# kunci -> (kunci induk, pilihan, lemparan dadu); None untuk state awal
+Parents = Dict[StateKey, Optional[Tuple[StateKey, int, Tuple[int, ...]]]]
+
+# ============================================================================
+# KUNCI KANONIK
+# ============================================================================
+
+def hp_bucket(hp: int, size: int) -> int:
+    """Kelompok HP; semua HP <= 0 masuk kelompok 0 (mati)"""
+    return (hp + size - 1) // size if hp > 0 else 0
+
+def canonical_key(game_state: GameState, size: int = 10) -> StateKey:
+    """Kunci hash kanonik sebuah state untuk set kunjungan"""
+    return (
+        game_state.scene,
+        game_state.inventory_bits,
+        game_state.location_bits,
+        game_state.puzzle_bits,
+        game_state.story_bits,
+        hp_bucket(game_state.hp, size),
+        hp_bucket(game_state.enemy_hp, size),
+        game_state.ending,
+    )
+
+# ============================================================================
+# CABANG ANGKA ACAK
+# ============================================================================
+
+class ScriptedRng:
+    """RNG yang mengikuti naskah lemparan; lemparan ke-i memakai titik picks[i]"""
+    def __init__(self, points: Sequence[float], picks: Tuple[int, ...]):
+        self.points = points
+        self.picks = picks
+        self.draws = 0
+
+    def randint(self, a: int, b: int) -> int:
+        pick = self.picks[self.draws] if self.draws < len(self.picks) else 0
+        self.draws += 1
+        return a + round((b - a) * self.points[pick])
+
+def branches(game_state: GameState, choice: int, points: Sequence[float],
+             picks: Tuple[int, ...] = ()) -> Iterator[Tuple[Tuple[int, ...], Text, List[str], GameState]]:
+    """Semua hasil sebuah pilihan, satu per kombinasi lemparan dadu"""
+    rng = ScriptedRng(points, picks)
+    result = step(game_state, choice, rng)
+    if rng.draws <= len(picks):
+        yield (picks,) + result
+        return
+    for pick in range(len(points)):
+        yield from branches(game_state, choice, points, picks + (pick,))
+
+# ============================================================================
+# PENELUSURAN
+# ============================================================================
+
+class Exploration:
+    """Hasil penelusuran: state yang dikunjungi dan ending yang ditemukan"""
+    def __init__(self, parents: Parents, endings: Dict[str, StateKey],
+                 start: GameState, points: Sequence[float]):
+        self.parents = parents
+        self.endings = endings
+        self.start = start
+        self.points = points
+
+    def path(self, ending: str) -> List[Tuple[int, Tuple[int, ...]]]:
+        """Urutan (pilihan, lemparan dadu) terpendek menuju sebuah ending"""
+        moves = []
+        link = self.parents[self.endings[ending]]
+        while link is not None:
+            parent, choice, picks = link
+            moves.append((choice, picks))
+            link = self.parents[parent]
+        return moves[::-1]
+
+    def describe(self, ending: str) -> List[str]:
+        """Jalur menuju ending dalam bentuk teks: adegan dan pilihan yang diambil"""
+        lines = []
+        text, options, game_state = step(self.start)
+        for choice, picks in self.path(ending):
+            lines.append(f"[{game_state.scene}] {choice}. {options[choice - 1]}")
+            text, options, game_state = step(game_state, choice, ScriptedRng(self.points, picks))
+        return lines
+
+def explore(size: int = 10, points: Sequence[float] = (0.0, 1.0),
+            max_states: int = 0) -> Exploration:
+    """BFS atas semua state yang bisa dicapai dari awal game"""
+    text, options, start = step(GameState())
+    start_key = canonical_key(start, size)
+    parents: Parents = {start_key: None}
+    endings: Dict[str, StateKey] = {}
+    queue = deque([(start_key, start, options)])
+
+    while queue and not (max_states and len(parents) >= max_states):
+        key, game_state, options = queue.popleft()
+        for choice in range(1, len(options) + 1):
+            for picks, text, next_options, next_state in branches(game_state, choice, points):
+                next_key = canonical_key(next_state, size)
+                if next_key in parents:
+                    continue
+                parents[next_key] = (key, choice, picks)
+                if next_state.ending is not None:
+                    # BFS: ending pertama yang ditemukan adalah yang terpendek
+                    endings.setdefault(next_state.ending, next_key)
+                elif next_options:
+                    queue.append((next_key, next_state, next_options))
+
+    return Exploration(parents, endings, start, points)
+
+def main():
+    """Entry point penjelajah ruang state"""
+    parser = argparse.ArgumentParser(description="Penjelajah ruang state BISIKAN DARI KABUT")
+    parser.add_argument("--hp-bucket", type=int, default=10, help="lebar kelompok HP")
+    parser.add_argument("--rolls", type=int, default=2,
+                        help="jumlah titik yang dicoba per lemparan dadu (>= 2)")
+    parser.add_argument("--max-states", type=int, default=0, help="batas state (0 = tanpa batas)")
+    args = parser.parse_args()
+
+    rolls = max(args.rolls, 2)
+    points = [i / (rolls - 1) for i in range(rolls)]
+
+    start = time.perf_counter()
+    result = explore(args.hp_bucket, points, args.max_states)
+    elapsed = time.perf_counter() - start
+
+    print(f"State dikunjungi: {len(result.parents)} ({elapsed:.2f} detik)")
+    for ending in ENDINGS:
+        if ending in result.endings:
+            print(f"✅ {ending}: bisa dicapai dalam {len(result.path(ending))} pilihan")
+        else:
+            print(f"❌ {ending}: tidak ditemukan")
+
+    if "ending_rahasia" in result.endings:
+        print("\nJalur terpendek ke ending_rahasia:")
+        for line in result.describe("ending_rahasia"):
+            print(f"  {line}")
+
+if __name__ == "__main__":
+    main()
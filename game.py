@@ -12,56 +12,270 @@ Cerita: Pemain terbangun di desa terlupakan dengan kabut tebal.
 Author: AI Programmer
 """
 
+import argparse
+import json
+import os
 import random
+import sys
 import time
-from typing import Dict, List, Optional
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from assetpack import AssetPack, open_pack
+from katalog import DEFAULT_LANGUAGE, LANGUAGES, catalog
+from pacing import ReadingPace
 
 # ============================================================================
 # KONFIGURASI GAME
 # ============================================================================
 
+FRAME_INTERVAL = 1 / 30  # detik per frame typewriter (~33 ms)
+SAVE_FILE = "bisikan_dari_kabut.sav"  # simpanan otomatis mode CLI (lihat savegame.py)
+TRANSCRIPT_DIR = "transkrip"          # transkrip setiap sesi CLI (lihat replay.py)
+PROFILER = None   # instrument.Profiler jika instrumentasi aktif (--profile)
+TELEMETRY = None  # telemetry.TelemetryWriter jika telemetri aktif (--telemetry)
+KEYBOARD = None   # keyinput.RawKeyboard jika input per tombol aktif (terminal POSIX)
+LANGUAGE = DEFAULT_LANGUAGE  # bahasa mode CLI (--lang, lihat katalog.py)
+RNG_POOL_SIZE = 64  # angka yang diambil sekaligus setiap kali pool SessionRng kosong
+
+# Jenis potongan teks keluaran mesin game
+SEG_NARRATION = 0  # ditampilkan dengan typewriter_effect
+SEG_INFO = 1       # ditampilkan langsung (status, item, damage)
+SEG_PAUSE = 2      # jeda halaman, pengganti pause()
+
+# Pertarungan melawan makhluk bayangan (rentang damage inklusif)
+SHADOW_HP = 50
+KNIFE_DAMAGE = (15, 30)      # serangan dengan pisau_tua
+FIST_DAMAGE = (5, 15)        # serangan dengan tangan kosong
+NO_CHARM_DAMAGE = (10, 20)   # memakai jimat tanpa punya jimat_pelindung
+DEFEND_DAMAGE = (5, 15)      # bertahan
+SHADOW_DAMAGE = (10, 25)     # serangan balik musuh
+DEFEAT_HP = 50               # HP setelah kalah
+
+# Nama flag untuk setiap bitfield GameState; urutan = posisi bit
+INVENTORY_ITEMS = (
+    "kunci_karat",
+    "catatan_lusuh",
+    "obor",
+    "jimat_pelindung",
+    "pisau_tua",
+    "artefak_hutan",
+    "artefak_runtuhan",
+    "jurnal_ritual",
+    "artefak_inti",
+)
+LOCATIONS = (
+    "desa",
+    "rumah_tua",
+    "sumur",
+    "lonceng",
+    "hutan",
+    "reruntuhan",
+    "gua",
+    "inti_misteri",
+)
+PUZZLES = (
+    "simbol_batu",
+    "ritual_simbol",
+    "tulisan_kuno",
+)
+STORY_FLAGS = (
+    "ingatan_dimulai",
+    "tahu_tentang_ritual",
+    "tahu_nama_di_dinding",
+    "bertemu_entitas",
+    "ritual_diperkuat",
+    "ritual_dihancurkan",
+    "desa_pertama_kali",
+    "hutan_pertama_kali",
+    "reruntuhan_pertama_kali",
+    "gua_pertama_kali",
+)
+
+def _bit_table(names: Tuple[str, ...]) -> Dict[str, int]:
+    """Nama flag -> bit mask"""
+    return {name: 1 << i for i, name in enumerate(names)}
+
+INVENTORY_BITS = _bit_table(INVENTORY_ITEMS)
+LOCATION_BITS = _bit_table(LOCATIONS)
+PUZZLE_BITS = _bit_table(PUZZLES)
+STORY_BITS = _bit_table(STORY_FLAGS)
+
+class FlagView(MutableMapping):
+    """Tampilan dict nama -> bool di atas satu bitfield GameState"""
+    __slots__ = ("_state", "_field", "_bits")
+
+    def __init__(self, state: "GameState", field: str, bits: Dict[str, int]):
+        self._state = state
+        self._field = field
+        self._bits = bits
+
+    def __getitem__(self, name: str) -> bool:
+        return bool(getattr(self._state, self._field) & self._bits[name])
+
+    def __setitem__(self, name: str, value: bool):
+        bit = self._bits[name]
+        flags = getattr(self._state, self._field)
+        setattr(self._state, self._field, flags | bit if value else flags & ~bit)
+
+    def __delitem__(self, name: str):
+        raise TypeError("Flag GameState tidak bisa dihapus")
+
+    def __iter__(self):
+        return iter(self._bits)
+
+    def __len__(self) -> int:
+        return len(self._bits)
+
 class GameState:
-    """Menyimpan status pemain dan game"""
+    """Menyimpan status pemain dan game.
+
+    Inventori, lokasi, puzzle, dan flag cerita disimpan sebagai bitfield
+    bilangan bulat, sehingga menyalin dan membandingkan state hanya
+    beberapa word. inventory, visited_locations, completed_puzzles, dan
+    story_flags tetap bisa dipakai seperti dict.
+    """
+    __slots__ = ("scene", "hp", "enemy_hp", "fight_result", "ending",
+                 "inventory_bits", "location_bits", "puzzle_bits", "story_bits")
+
     def __init__(self):
+        self.scene = "prolog"
         self.hp = 100
-        self.inventory: Dict[str, bool] = {
-            "kunci_karat": False,
-            "catatan_lusuh": False,
-            "obor": False,
-            "jimat_pelindung": False,
-            "pisau_tua": False,
-            "artefak_hutan": False,
-            "artefak_runtuhan": False,
-            "jurnal_ritual": False,
-            "artefak_inti": False,
-        }
-        self.visited_locations: Dict[str, bool] = {
-            "desa": False,
-            "rumah_tua": False,
-            "sumur": False,
-            "lonceng": False,
-            "hutan": False,
-            "reruntuhan": False,
-            "gua": False,
-            "inti_misteri": False,
-        }
-        self.completed_puzzles: Dict[str, bool] = {
-            "simbol_batu": False,
-            "ritual_simbol": False,
-            "tulisan_kuno": False,
-        }
-        self.story_flags: Dict[str, bool] = {
-            "ingatan_dimulai": False,
-            "tahu_tentang_ritual": False,
-            "tahu_nama_di_dinding": False,
-            "bertemu_entitas": False,
-            "ritual_diperkuat": False,
-            "ritual_dihancurkan": False,
-            "desa_pertama_kali": False,
-            "hutan_pertama_kali": False,
-            "reruntuhan_pertama_kali": False,
-            "gua_pertama_kali": False,
-        }
+        self.enemy_hp = 0
+        self.fight_result: Optional[str] = None  # "menang", "kalah", "lari"
+        self.ending: Optional[str] = None
+        self.inventory_bits = 0
+        self.location_bits = 0
+        self.puzzle_bits = 0
+        self.story_bits = 0
+
+    @property
+    def inventory(self) -> FlagView:
+        return FlagView(self, "inventory_bits", INVENTORY_BITS)
+
+    @property
+    def visited_locations(self) -> FlagView:
+        return FlagView(self, "location_bits", LOCATION_BITS)
+
+    @property
+    def completed_puzzles(self) -> FlagView:
+        return FlagView(self, "puzzle_bits", PUZZLE_BITS)
+
+    @property
+    def story_flags(self) -> FlagView:
+        return FlagView(self, "story_bits", STORY_BITS)
+
+    def key(self) -> tuple:
+        """Seluruh isi state sebagai tuple (untuk hash dan perbandingan)"""
+        return tuple(getattr(self, name) for name in GameState.__slots__)
+
+    def copy(self) -> "GameState":
+        """Salinan state yang bisa diubah tanpa menyentuh aslinya"""
+        clone = GameState.__new__(GameState)
+        clone.scene = self.scene
+        clone.hp = self.hp
+        clone.enemy_hp = self.enemy_hp
+        clone.fight_result = self.fight_result
+        clone.ending = self.ending
+        clone.inventory_bits = self.inventory_bits
+        clone.location_bits = self.location_bits
+        clone.puzzle_bits = self.puzzle_bits
+        clone.story_bits = self.story_bits
+        return clone
+
+_BYTE_TABLES: Dict[Tuple[int, int], Tuple[bytes, bytes]] = {}
+
+def _byte_table(a: int, b: int) -> Tuple[bytes, bytes]:
+    """Tabel bytes.translate byte -> a..b dan byte yang harus dibuang"""
+    if (a, b) not in _BYTE_TABLES:
+        span = b - a + 1
+        limit = 256 - 256 % span
+        table = bytes(a + i % span if i < limit else 0 for i in range(256))
+        _BYTE_TABLES[(a, b)] = (table, bytes(range(limit, 256)))
+    return _BYTE_TABLES[(a, b)]
+
+class SessionRng:
+    """Aliran angka acak ber-seed untuk satu sesi.
+
+    randint(a, b) diambil dari pool per rentang; pool kosong diisi ulang
+    sekaligus sebanyak `pool_size` angka, jadi kebanyakan lemparan hanya
+    list.pop(). Urutan lemparan sepenuhnya ditentukan oleh seed.
+    """
+    __slots__ = ("seed", "pool_size", "_random", "_pools")
+
+    def __init__(self, seed: Optional[int] = None, pool_size: int = RNG_POOL_SIZE):
+        if seed is None:
+            seed = random.getrandbits(64)
+        self.seed = seed
+        self.pool_size = pool_size
+        self._random = random.Random(seed)
+        self._pools: Dict[Tuple[int, int], List[int]] = {}
+
+    def randint(self, a: int, b: int) -> int:
+        """Bilangan bulat acak a <= n <= b"""
+        pool = self._pools.get((a, b))
+        if not pool:
+            pool = self._refill(a, b)
+        return pool.pop()
+
+    def _refill(self, a: int, b: int) -> List[int]:
+        """Mengisi pool rentang (a, b) sekaligus"""
+        if 0 <= a <= b < 256:
+            # Byte acak dipetakan ke rentang dengan bytes.translate (di C);
+            # byte di atas kelipatan lebar rentang dibuang supaya tetap seragam
+            table, rejects = _byte_table(a, b)
+            pool: List[int] = []
+            while not pool:
+                pool = list(self._random.randbytes(self.pool_size).translate(table, rejects))
+        else:
+            pool = self._random.choices(range(a, b + 1), k=self.pool_size)
+        self._pools[(a, b)] = pool
+        return pool
+
+class RngProvider:
+    """Membagikan SessionRng dengan seed sendiri untuk setiap sesi"""
+    def __init__(self, seed: Optional[int] = None, pool_size: int = RNG_POOL_SIZE):
+        self._seeds = random.Random(seed)
+        self.pool_size = pool_size
+
+    def session(self, seed: Optional[int] = None) -> SessionRng:
+        """RNG untuk sesi baru; tanpa `seed`, seed diambil dari provider"""
+        if seed is None:
+            seed = self._seeds.getrandbits(64)
+        return SessionRng(seed, self.pool_size)
+
+# Teks keluaran satu langkah: daftar (jenis, teks, adegan asal)
+Text = List[Tuple[int, str, str]]
+
+class StepContext:
+    """Menampung teks keluaran satu langkah mesin game, tanpa I/O"""
+    def __init__(self, rng=random, lang: str = DEFAULT_LANGUAGE):
+        self.text: Text = []
+        self.rng = rng  # sumber angka acak dengan randint(a, b)
+        self.lang = lang
+        self.catalog = catalog(lang)
+        self.scene = ""  # adegan yang sedang dijalankan; asal setiap potongan teks
+
+    def message(self, key: str, **fields) -> str:
+        """Pesan umum dalam bahasa langkah ini (lihat katalog.py)"""
+        return self.catalog.get(key, **fields)
+
+    def write(self, text: str):
+        """Narasi, pengganti typewriter_effect"""
+        self.text.append((SEG_NARRATION, text, self.scene))
+
+    def info(self, text: str):
+        """Teks yang langsung ditampilkan, pengganti print"""
+        self.text.append((SEG_INFO, text, self.scene))
+
+    def pause(self):
+        """Jeda halaman, pengganti pause()"""
+        self.text.append((SEG_PAUSE, "", self.scene))
+
+    def status(self, game_state: GameState):
+        """Status pemain, pengganti show_status"""
+        self.info(format_status(game_state, self.lang))
 
 # ============================================================================
 # FUNGSI UTILITAS
@@ -71,1585 +285,736 @@ def clear_screen():
     """Membersihkan layar terminal"""
     print("\n" * 3)
 
+def read_input(prompt: str) -> str:
+    """input() yang dicatat sebagai waktu menunggu jika instrumentasi aktif"""
+    if PROFILER is None:
+        return input(prompt)
+    start = time.perf_counter()
+    try:
+        return input(prompt)
+    finally:
+        PROFILER.input_wait(time.perf_counter() - start)
+
+def read_key() -> str:
+    """Satu tombol dari KEYBOARD, dicatat sebagai waktu menunggu"""
+    if PROFILER is None:
+        return KEYBOARD.read_key()
+    start = time.perf_counter()
+    try:
+        return KEYBOARD.read_key()
+    finally:
+        PROFILER.input_wait(time.perf_counter() - start)
+
 def pause():
     """Memberi jeda sebelum melanjutkan"""
-    input("\n[Tekan ENTER untuk melanjutkan...]")
+    if KEYBOARD is None:
+        read_input(catalog(LANGUAGE).get("jeda_enter"))
+    else:
+        print(catalog(LANGUAGE).get("jeda_tombol"), flush=True)
+        # Pilihan yang sudah diketik lebih dulu sekaligus melewati jeda
+        if not KEYBOARD.choice_queued():
+            read_key()
     clear_screen()
 
 def typewriter_effect(text: str, delay: float = 0.02):
-    """Efek teks berjalan (typewriter effect)"""
-    for char in text:
-        print(char, end="", flush=True)
-        time.sleep(delay)
-    print()
+    """Efek teks berjalan (typewriter effect), ditulis per frame"""
+    if PROFILER is None:
+        _typewriter(text, delay)
+        return
+    start = time.perf_counter()
+    writes = _typewriter(text, delay)
+    PROFILER.render(time.perf_counter() - start, len(text.encode("utf-8")) + 1, writes)
+
+def _typewriter(text: str, delay: float) -> int:
+    """Isi typewriter_effect; mengembalikan jumlah panggilan write"""
+    if delay <= 0:
+        sys.stdout.write(text + "\n")
+        sys.stdout.flush()
+        return 1
+    
+    # Setiap frame menulis sekaligus semua karakter yang sudah jatuh tempo,
+    # jadi kecepatan tampil tetap 1 karakter per `delay` detik
+    start = time.perf_counter()
+    shown = 0
+    writes = 1
+    while shown < len(text):
+        elapsed = time.perf_counter() - start
+        due = min(len(text), int(elapsed / delay) + 1)
+        if due > shown:
+            sys.stdout.write(text[shown:due])
+            sys.stdout.flush()
+            shown = due
+            writes += 1
+        if shown < len(text):
+            next_frame = (int(elapsed / FRAME_INTERVAL) + 1) * FRAME_INTERVAL
+            wait = max(0.0, next_frame - (time.perf_counter() - start))
+            if KEYBOARD is None:
+                time.sleep(wait)
+            elif KEYBOARD.interrupted(wait):
+                # Tombol ditekan: sisa teks langsung ditampilkan
+                sys.stdout.write(text[shown:])
+                shown = len(text)
+                writes += 1
+    sys.stdout.write("\n")
+    sys.stdout.flush()
+    return writes
+
+def format_status(game_state: GameState, lang: str = DEFAULT_LANGUAGE) -> str:
+    """Teks status pemain"""
+    messages = catalog(lang)
+    items = [messages.get(f"item_{item}") for item in INVENTORY_ITEMS
+             if game_state.inventory_bits & INVENTORY_BITS[item]]
+    return "\n".join([
+        "=" * 60,
+        messages.get("status_hp", hp=game_state.hp),
+        messages.get("status_inventori",
+                     items=", ".join(items) if items else messages.get("inventori_kosong")),
+        "=" * 60,
+    ])
 
 def show_status(game_state: GameState):
     """Menampilkan status pemain"""
-    print("=" * 60)
-    print(f"❤️  HP: {game_state.hp}/100")
-    
-    items = [item for item, has in game_state.inventory.items() if has]
-    if items:
-        print(f"🎒 Inventori: {', '.join(items)}")
-    else:
-        print(f"🎒 Inventori: (kosong)")
-    print("=" * 60)
+    print(format_status(game_state, LANGUAGE))
+
+def show_text(text: Text, pace: Optional[ReadingPace] = None):
+    """Menampilkan teks keluaran mesin game di terminal.
+
+    Dengan `pace`, delay typewriter mengikuti kecepatan baca sesi (dan
+    pengali adegan asal setiap narasi), dan jeda halaman menjadi contoh
+    kecepatan baca.
+    Jika instrumentasi aktif, setiap potongan dicatat di adegan asalnya.
+    """
+    for kind, part, source in text:
+        if PROFILER is not None and source != PROFILER.current:
+            PROFILER.switch(source)
+        if kind == SEG_NARRATION:
+            if pace is None:
+                typewriter_effect(part)
+                continue
+            delay = pace.delay_for(source, part)
+            start = time.perf_counter()
+            typewriter_effect(part, delay)
+            if delay > 0:
+                pace.revealed(len(part), time.perf_counter() - start, source)
+        elif kind == SEG_INFO:
+            print(part)
+            if PROFILER is not None:
+                PROFILER.render(0.0, len(part.encode("utf-8")) + 1, 1)
+        else:
+            if pace is not None:
+                pace.shown()
+            pause()
+            if pace is not None:
+                pace.answered()
 
 def get_choice(options: List[str]) -> int:
     """Mendapatkan pilihan dari pemain"""
+    if KEYBOARD is not None:
+        return get_key_choice(options)
+    messages = catalog(LANGUAGE)
     while True:
         try:
             for i, option in enumerate(options, 1):
                 print(f"{i}. {option}")
-            choice = int(input("\nPilihan Anda: "))
+            choice = int(read_input(messages.get("pilihan_anda")))
             if 1 <= choice <= len(options):
                 return choice
             else:
-                print("❌ Pilihan tidak valid!")
+                print(messages.get("pilihan_tidak_valid"))
         except ValueError:
-            print("❌ Masukkan angka yang valid!")
+            print(messages.get("angka_tidak_valid"))
+
+def get_key_choice(options: List[str]) -> int:
+    """Pilihan dengan satu tombol angka (atau angka yang sudah diketik lebih dulu)"""
+    messages = catalog(LANGUAGE)
+    for i, option in enumerate(options, 1):
+        print(f"{i}. {option}")
+    print(messages.get("pilihan_anda"), end="", flush=True)
+    while True:
+        key = read_key()
+        if not key.isdigit():
+            continue
+        if 1 <= int(key) <= len(options):
+            print(key)
+            return int(key)
+        KEYBOARD.discard()
+        print("\n" + messages.get("pilihan_tidak_valid") + messages.get("pilihan_anda"),
+              end="", flush=True)
 
 def check_inventory_item(game_state: GameState, item: str) -> bool:
     """Mengecek apakah pemain memiliki item tertentu"""
-    return game_state.inventory.get(item, False)
+    return bool(game_state.inventory_bits & INVENTORY_BITS.get(item, 0))
 
-def add_item(game_state: GameState, item: str):
+def add_item(game_state: GameState, item: str, ctx: Optional[StepContext] = None):
     """Menambah item ke inventori"""
-    if item in game_state.inventory:
-        game_state.inventory[item] = True
-        print(f"✅ Anda mendapatkan: {item}")
+    if item in INVENTORY_BITS:
+        game_state.inventory_bits |= INVENTORY_BITS[item]
+        if ctx is None:
+            messages = catalog(LANGUAGE)
+            print(messages.get("dapat_item", item=messages.get(f"item_{item}")))
+        else:
+            ctx.info(ctx.message("dapat_item", item=ctx.message(f"item_{item}")))
 
 def remove_item(game_state: GameState, item: str):
     """Menghapus item dari inventori"""
-    if item in game_state.inventory:
-        game_state.inventory[item] = False
+    if item in INVENTORY_BITS:
+        game_state.inventory_bits &= ~INVENTORY_BITS[item]
 
-def take_damage(game_state: GameState, damage: int):
+def take_damage(game_state: GameState, damage: int, ctx: Optional[StepContext] = None):
     """Memberikan damage ke pemain"""
     game_state.hp -= damage
-    print(f"💥 Anda menerima {damage} damage! HP saat ini: {game_state.hp}")
-
-# ============================================================================
-# CERITA & DIALOG - PROLOG
-# ============================================================================
-
-def prolog(game_state: GameState):
-    """Prolog game - pengenalan awal"""
-    clear_screen()
-    typewriter_effect("=" * 70)
-    typewriter_effect("                    BISIKAN DARI KABUT")
-    typewriter_effect("=" * 70)
-    pause()
-    
-    clear_screen()
-    typewriter_effect("""
-Mata Anda terbuka dalam kegelapan.
-
-Kepala panas, ingatan kabur. Anda tidak tahu siapa Anda atau bagaimana 
-Anda sampai di sini. Hanya ada kabut—kabut tebal yang menutupi segalanya.
-
-Gradual, penglihatan Anda membaik. Anda melihat rumah-rumah tua, jalan 
-yang tersepi. Desa yang hampir ditinggalkan. Langit abu-abu, tidak ada 
-matahari, tidak ada burung. Hanya keheningan yang menekan.
-
-Suara bel yang pelan—bel dari menara di kejauhan. Bunyi itu terasa... aneh.
-Seolah-olah bel itu memangil Anda.
-
-Seseorang berjalan mendekat dalam kabut. Sosok tua, wajahnya tersembunyi 
-dalam bayangan.
-
-TETUA DESA: "Oh... Anda sudah bangun. Kami menunggu Anda..."
-""")
-    pause()
-
-    clear_screen()
-    typewriter_effect("""
-TETUA DESA: "Nama Anda... adalah Raven. Anda sudah lama tidur."
-
-Anda mencoba mengingat. Tetapi pikiran Anda kosong. Nama itu terasa asing, 
-namun... terasa benar.
-
-ANDA: "Siapa Anda? Di mana saya?"
-
-Tetua tersenyum aneh. Tersenyum tanpa kegembiraan.
-
-TETUA DESA: "Anda ada di rumah, Raven. Di Desa Senja. Tempat di mana 
-segala hal berakhir. Tempat di mana kami semua sudah lama menunggu."
-
-Kabut menebal. Udara terasa dingin. Ada sesuatu yang sangat salah 
-di tempat ini.
-""")
-    pause()
+    if ctx is None:
+        print(catalog(LANGUAGE).get("terkena_damage", damage=damage, hp=game_state.hp))
+    else:
+        ctx.info(ctx.message("terkena_damage", damage=damage, hp=game_state.hp))
 
 # ============================================================================
-# BAB 1 - DESA TERLUPAKAN
+# PERTARUNGAN
 # ============================================================================
 
-def desa_terlupakan(game_state: GameState) -> Optional[str]:
-    """Lokasi utama: Desa Terlupakan - tempat pertama Raven terbangun"""
-    game_state.visited_locations["desa"] = True
-    
-    clear_screen()
-    show_status(game_state)
-    
-    if not game_state.story_flags["desa_pertama_kali"]:
-        typewriter_effect("""
-Anda memutuskan untuk menjelajahi desa lebih dalam. Rumah-rumah tua 
-dengan jendela gelap mengelilingi Anda.
-
-Tetua desa menghampiri Anda dengan senyum aneh yang membuat Anda 
-merasa tidak nyaman.
-
-TETUA DESA: "Ah, Raven... Anda ingin belajar lebih banyak tentang 
-desa kita yang kecil ini? Baiklah. Ada yang harus Anda ketahui."
-""")
-        game_state.story_flags["desa_pertama_kali"] = True
-        pause()
-    
-    clear_screen()
-    show_status(game_state)
-    
-    typewriter_effect("""
-Anda melihat empat lokasi penting di desa:
-
-• BALAI DESA - tempat penduduk berkumpul
-• RUMAH TUA TERKUNCI - mansion gelap di tepi desa
-• SUMUR KERING - sumur tua yang terlihat sangat dalam
-• MENARA LONCENG - menara yang berbunyi sendiri setiap malam
-""")
-    
-    options = [
-        "Pergi ke Balai Desa",
-        "Coba membuka Rumah Tua",
-        "Lihat ke dalam Sumur Kering",
-        "Naik ke Menara Lonceng",
-        "Kembali ke Menu Utama"
-    ]
-    
-    choice = get_choice(options)
-    
-    if choice == 1:
-        return balai_desa(game_state)
-    elif choice == 2:
-        return rumah_tua(game_state)
-    elif choice == 3:
-        return sumur_kering(game_state)
-    elif choice == 4:
-        return menara_lonceng(game_state)
-    elif choice == 5:
-        return None
-
-def balai_desa(game_state: GameState) -> Optional[str]:
-    """Balai Desa - bertemu penduduk"""
-    clear_screen()
-    show_status(game_state)
-    
-    typewriter_effect("""
-Balai Desa adalah bangunan besar dengan arsitektur tua. Pintu masuk 
-terbuka. Di dalamnya, beberapa penduduk desa duduk diam.
-
-Mereka semua memandang Anda saat Anda memasuki ruangan. Senyum tipis 
-di wajah mereka. Mata mereka... kosong.
-
-TETUA DESA: "Raven... Anda sudah sampai ke sini. Bagus."
-
-PENDUDUK 1: "Ya... dia sudah kembali. Ritual akan segera dimulai."
-
-PENDUDUK 2: "Jangan pergi jauh-jauh, Raven. Kabut itu... dia akan 
-membawa Anda kembali ke sini."
-
-Anda merasa ada sesuatu yang sangat salah dengan orang-orang ini. 
-Kata-kata mereka penuh makna tersembunyi.
-
-TETUA DESA: "Ada yang ingin Anda ketahui? Atau... ada yang ingin 
-Anda lakukan?"
-""")
-    
-    options = [
-        "Tanyakan tentang desa dan ritual",
-        "Tanyakan siapa diri Anda sebenarnya",
-        "Ambil CATATAN LUSUH yang ada di meja",
-        "Keluar dari Balai Desa"
-    ]
-    
-    choice = get_choice(options)
-    
-    if choice == 1:
-        clear_screen()
-        typewriter_effect("""
-ANDA: "Apa yang kalian maksud dengan ritual?"
-
-Tetua tertawa pelan—suara yang membuat bulu kuduk berdiri.
-
-TETUA DESA: "Ritual adalah... cara kami menjaga keseimbangan, Raven. 
-Ada sesuatu di bawah desa ini. Sesuatu yang tua. Sesuatu yang lapar. 
-Kami telah memberikan apa yang dia inginkan selama berabad-abad."
-
-PENDUDUK 1: "Anda adalah pemberian kami untuk tahun ini, Raven. 
-Atau sebenarnya... Anda adalah pemberian dari tahun lalu. Anda 
-belum siap saat itu. Tapi sekarang... sekarang saatnya."
-
-Anda merasa nyali Anda hilang. Kedengarannya seperti Anda adalah 
-bagian dari rencana mereka.
-""")
-        game_state.story_flags["tahu_tentang_ritual"] = True
-        pause()
-        return desa_terlupakan(game_state)
+def mulai_pertarungan_shadow(game_state: GameState, ctx: StepContext) -> str:
+    """Memulai pertarungan melawan makhluk bayangan"""
+    game_state.enemy_hp = SHADOW_HP
+    game_state.fight_result = None
     
-    elif choice == 2:
-        clear_screen()
-        typewriter_effect("""
-ANDA: "Siapa saya sebenarnya? Saya tidak bisa mengingat apa pun!"
-
-Tetua terdiam untuk waktu yang lama. Mata mereka melihat melampaui Anda.
-
-TETUA DESA: "Anda adalah... yang terpilih. Nama Anda adalah Raven. 
-Anda datang ke desa ini lima tahun lalu. Anda melihat sesuatu yang 
-tidak seharusnya Anda lihat. Sesuatu yang gelap. Jadi kami..."
-
-Dia berhenti. Seolah-olah dia mengatakan terlalu banyak.
-
-TETUA DESA: "...kami membuat Anda lupa. Untuk kebaikan Anda. Untuk 
-kebaikan semua orang."
-
-Anda mencoba mengingat, tetapi hanya ada kegelapan.
-""")
-        game_state.story_flags["ingatan_dimulai"] = True
-        pause()
-        return desa_terlupakan(game_state)
+    ctx.write(ctx.message("pertarungan_mulai", enemy_hp=game_state.enemy_hp, hp=game_state.hp))
     
-    elif choice == 3:
-        clear_screen()
-        typewriter_effect("""
-Anda melihat meja kayu tua di sudut ruangan. Di atasnya tergeletak 
-catatan yang rusak, tinta sudah pudar. Anda mengambilnya dengan hati-hati.
-
-TETUA DESA: "Ah... catatan itu. Ambil saja jika Anda mau. Itu hanya 
-cerita lama. Cerita tentang orang-orang yang datang sebelum Anda."
-
-Anda baca beberapa baris:
-
-"27 Agustus - Ada yang aneh dengan lonceng itu. Berbunyi lebih keras. 
-Semakin banyak kabut."
-
-"2 September - Mereka mengatakan seseorang akan datang. Seseorang untuk 
-'menyelamatkan' kita. Saya tidak mengerti."
-
-"15 September - RAHASIA ITU HARUS TETAP TERSEMBUNYI. UNTUK KESELAMATAN 
-SEMUA ORANG."
-
-Catatan berikutnya robek dan tidak terbaca.
-""")
-        add_item(game_state, "catatan_lusuh")
-        pause()
-        return desa_terlupakan(game_state)
-    
-    elif choice == 4:
-        return desa_terlupakan(game_state)
-
-def rumah_tua(game_state: GameState) -> Optional[str]:
-    """Rumah Tua Terkunci - dengan puzzle"""
-    clear_screen()
-    show_status(game_state)
-    
-    typewriter_effect("""
-Rumah tua di tepi desa ini terlihat lebih tua dari yang lain. 
-Pintunya terkunci dengan rantai berkarat. Jendela-jendelanya dipenuhi 
-debu tebal.
-
-Anda mendengar suara bisikan di dalam. Suara yang sangat tipis. 
-Seolah-olah ruangan itu sendiri yang berbicara.
+    if game_state.hp <= 0:
+        return shadow_menang(game_state, ctx)
+    return "pertarungan_shadow"
 
-Jika Anda mendekatkan telinga ke pintu, Anda mendengar:
-
-"...jangan biarkan dia masuk... jangan biarkan dia ingat... 
-kabut harus tetap tebal..."
-
-Di depan pintu, ada tiga simbol yang terukir di kayu:
-
-⚫ Bulan (Kegelapan)
-⚪ Matahari (Cahaya)
-🔺 Segitiga (Keseimbangan)
-
-Ada sebuah slot di samping. Tampaknya ini adalah sebuah teka-teki.
-""")
-    
-    if check_inventory_item(game_state, "kunci_karat"):
-        typewriter_effect("\nAnda memiliki KUNCI KARAT. Mungkin bisa digunakan di sini.")
-    
-    options = [
-        "Gunakan KUNCI KARAT (jika punya)",
-        "Pilih simbol: Bulan ⚫",
-        "Pilih simbol: Matahari ⚪",
-        "Pilih simbol: Keseimbangan 🔺",
-        "Kembali ke Desa"
-    ]
-    
-    choice = get_choice(options)
-    
+def pertarungan_shadow_pilih(game_state: GameState, ctx: StepContext, choice: int) -> Optional[str]:
+    """Satu ronde pertarungan: aksi pemain lalu serangan balik musuh"""
     if choice == 1:
-        if check_inventory_item(game_state, "kunci_karat"):
-            clear_screen()
-            typewriter_effect("""
-Anda memasukkan kunci karat ke dalam slot. Dengan gemeretak, 
-pintu terbuka perlahan.
-
-Di dalam, sebuah ruangan gelap dengan rak-rak penuh buku. 
-Di tengah ruangan, sebuah meja dengan PETA TERLIPAT yang cukup tua.
-
-Anda mengambil peta. Di dalamnya tergambar wilayah di sekitar desa:
-- Hutan Berkabut (barat)
-- Reruntuhan Kuno (selatan)
-- Gua Terlarang (bawah tanah)
-
-Peta ini akan membantu perjalanan Anda.
-""")
-            add_item(game_state, "catatan_lusuh")  # Sudah diambil atau tidak
-            pause()
-            return desa_terlupakan(game_state)
+        if check_inventory_item(game_state, "pisau_tua"):
+            damage = ctx.rng.randint(*KNIFE_DAMAGE)
+            game_state.enemy_hp -= damage
+            ctx.write(ctx.message("serang_pisau", damage=damage))
         else:
-            clear_screen()
-            typewriter_effect("""
-Anda tidak memiliki kunci yang tepat. Anda mencoba menutup slot,
-tetapi sesuatu yang keras di dalamnya menggigit jari Anda!
-
-Aaah! Anda menarik tangan Anda dengan cepat. Jari Anda berdarah.
-
-Anda menerima 10 damage!
-""")
-            take_damage(game_state, 10)
-            pause()
-            return rumah_tua(game_state)
+            damage = ctx.rng.randint(*FIST_DAMAGE)
+            game_state.enemy_hp -= damage
+            ctx.write(ctx.message("serang_tangan", damage=damage))
     
     elif choice == 2:
-        clear_screen()
-        typewriter_effect("""
-Anda menekan simbol Bulan. Seketika, terdengar suara yang mengerikan—
-seperti ribuan suara meraung sekaligus. Pintu terguncang kuat!
-
-Kabut gelap menyembur keluar dari celah pintu. Anda terpukul mundur!
-
-Anda menerima 15 damage!
-
-Mungkin itu bukan jawaban yang benar...
-""")
-        take_damage(game_state, 15)
-        pause()
-        return rumah_tua(game_state)
-    
-    elif choice == 3:
-        clear_screen()
-        typewriter_effect("""
-Anda menekan simbol Matahari. Hal yang sama terjadi—suara mengerikan 
-dan kabut gelap menyembur keluar.
-
-Anda menerima 15 damage!
-""")
-        take_damage(game_state, 15)
-        pause()
-        return rumah_tua(game_state)
-    
-    elif choice == 4:
-        clear_screen()
-        typewriter_effect("""
-Anda menekan simbol Keseimbangan. Hal yang terjadi adalah... 
-kedamaian.
-
-Bisikan di dalam rumah berhenti. Pintu terbuka perlahan dengan suara 
-yang menenangkan.
-
-Di dalam, sebuah ruangan gelap dengan rak-rak penuh buku berdebu. 
-Di tengah ruangan, ada PETA TERLIPAT yang cukup tua, dan sebuah 
-KUNCI KARAT kecil di atas meja.
-
-Anda mengambil keduanya.
-
-Peta menunjukkan:
-- Hutan Berkabut (barat)
-- Reruntuhan Kuno (selatan)
-- Gua Terlarang (bawah tanah)
-""")
-        add_item(game_state, "kunci_karat")
-        game_state.completed_puzzles["ritual_simbol"] = True
-        pause()
-        return desa_terlupakan(game_state)
-    
-    elif choice == 5:
-        return desa_terlupakan(game_state)
-
-def sumur_kering(game_state: GameState) -> Optional[str]:
-    """Sumur Kering - dengan item"""
-    clear_screen()
-    show_status(game_state)
-    
-    typewriter_effect("""
-Sumur ini sangat tua, dindingnya retak. Di dalamnya, gelap sekali. 
-Anda membuang batu kecil ke dalamnya. 
-
-Tidak ada suara. Seolah-olah batu itu tidak pernah jatuh. 
-Seolah-olah sumur ini tidak memiliki dasar.
-
-Tapi tunggu... di kedalaman yang sangat jauh, ada cahaya aneh. 
-Cahaya yang berkilau dengan warna tidak alami.
-
-Anda melihat tali tua yang digulung di tepi sumur. Jika Anda turun...
-
-Atau, di samping sumur, ada sebuah OBOR TUA yang terletak di rumput. 
-Obor itu masih bisa digunakan.
-""")
-    
-    options = [
-        "Ambil OBOR TUA",
-        "Turun ke dalam sumur (beresiko)",
-        "Kembali ke Desa"
-    ]
-    
-    choice = get_choice(options)
-    
-    if choice == 1:
-        clear_screen()
-        typewriter_effect("""
-Anda mengambil obor. Meski terlihat tua, api di ujungnya masih 
-menyala dengan cahaya orange yang hangat.
-
-Cahaya ini akan membantu Anda melihat di tempat-tempat gelap.
-""")
-        add_item(game_state, "obor")
-        pause()
-        return desa_terlupakan(game_state)
-    
-    elif choice == 2:
-        clear_screen()
-        typewriter_effect("""
-Anda mengambil tali dan mulai turun ke dalam sumur. Gelap. 
-Semakin gelap.
-
-Saat Anda semakin dalam, suara-suara aneh mulai terdengar. 
-Bisikan yang berbisik nama Anda. Berkali-kali. Berkali-kali.
-
-RAVEN... RAVEN... RAVEN...
-
-Anda panik dan mulai memanjat ke atas. Dengan tergesa-gesa, 
-Anda keluar dari sumur. Jantung Anda berdetak sangat cepat.
-
-Anda menerima 20 damage karena ketakutan dan kelelahan!
-""")
-        take_damage(game_state, 20)
-        pause()
-        return desa_terlupakan(game_state)
-    
-    elif choice == 3:
-        return desa_terlupakan(game_state)
-
-def menara_lonceng(game_state: GameState) -> Optional[str]:
-    """Menara Lonceng - tempat penting"""
-    clear_screen()
-    show_status(game_state)
-    
-    typewriter_effect("""
-Menara lonceng tinggi menjulang di atas desa. Setiap langkah Anda ke 
-atas, suara lonceng semakin keras. 
-
-Bukan bunyi normal. Bunyi lonceng ini terasa seperti... menangis. 
-Seperti peringatan. Seperti doa.
-
-Saat Anda mencapai puncak, Anda melihat lonceng besar yang tergantung. 
-Tapi lonceng itu... bergerak sendiri. Tanpa ada angin. Tanpa ada 
-yang menyentuhnya.
-
-Setiap kali lonceng berbunyi, Anda merasa ada sesuatu yang 
-merespons dari bawah. Dari dalam tanah.
-
-Di bawah lonceng, tergambar simbol ritual yang kompleks. 
-Ada banyak tanggal yang terukir di papan kayu tua:
-
-1823, 1856, 1892, 1934, 1973, 2018, 2023
-
-Setiap tanggal dipisahkan dengan tanda silang.
-""")
-    
-    options = [
-        "Pelajari simbol ritual (butuh pengetahuan)",
-        "Coba hentikan lonceng",
-        "Turun dan tinggalkan menara"
-    ]
-    
-    choice = get_choice(options)
-    
-    if choice == 1:
-        clear_screen()
-        if game_state.story_flags["tahu_tentang_ritual"]:
-            typewriter_effect("""
-Anda memahami—tanggal-tanggal ini adalah siklus ritual. Setiap 
-50-60 tahun, mereka mengulang ritual. Setiap kali, ada yang 
-'dipilih'. 
-
-Dan Anda... Anda adalah yang dipilih kali ini.
-
-Simbol ritual di dasar lonceng adalah lambang 'Penjaga Gerbang'—
-makhluk yang dijaga oleh desa ini selama berabad-abad.
-
-Anda merasa ngeri, tetapi juga penasaran. Anda harus tahu lebih 
-banyak.
-""")
+        if check_inventory_item(game_state, "jimat_pelindung"):
+            ctx.write(ctx.message("jimat_melindungi"))
         else:
-            typewriter_effect("""
-Simbol-simbol ini terlalu kompleks untuk Anda pahami saat ini. 
-Anda memerlukan lebih banyak informasi.
-""")
-        pause()
-        return menara_lonceng(game_state)
-    
-    elif choice == 2:
-        clear_screen()
-        typewriter_effect("""
-Anda mencoba menghentikan lonceng dengan tangan Anda. 
-
-Saat tangan Anda menyentuh lonceng, sejengkal api biru melompat 
-dari permukaannya. Anda terlempar mundur!
-
-Anda menerima 25 damage!
-
-Lonceng tidak bisa dihentikan. Ritual ini lebih kuat dari Anda.
-""")
-        take_damage(game_state, 25)
-        pause()
-        return menara_lonceng(game_state)
-    
-    elif choice == 3:
-        return desa_terlupakan(game_state)
-
-# ============================================================================
-# BAB 2 - HUTAN BERKABUT
-# ============================================================================
-
-def hutan_berkabut(game_state: GameState) -> Optional[str]:
-    """Lokasi: Hutan Berkabut - penuh misteri"""
-    game_state.visited_locations["hutan"] = True
-    clear_screen()
-    show_status(game_state)
-    
-    if not game_state.story_flags["hutan_pertama_kali"]:
-        typewriter_effect("""
-Anda memutuskan meninggalkan desa dan melangkah ke hutan barat. 
-Kabut semakin tebal saat Anda menjauh dari desa.
-
-Pohon-pohon tinggi terlihat seperti tulang raksasa yang membusuk. 
-Tidak ada bunyi binatang. Tidak ada angin. Hanya keheningan yang 
-menakutkan.
-
-Saat Anda berjalan lebih dalam, Anda mendengar suara—suara yang 
-memanggil nama Anda. Tetapi itu bukan suara manusia. Itu seperti 
-bisikan ribuan bayangan.
-
-BISIKAN: "Raven... kembali... kembali ke sini..."
-
-Peta yang Anda temukan (jika ada) menunjukkan tiga jalur berbeda.
-""")
-        game_state.story_flags["hutan_pertama_kali"] = True
-        pause()
-    
-    clear_screen()
-    show_status(game_state)
-    
-    typewriter_effect("""
-Anda ada di Hutan Berkabut. Jalan bercabang menjadi tiga arah:
-
-1. JALAN BATU TUA - ada simbol-simbol batu di tanah, tapi kabut 
-   terlalu tebal untuk dilihat jelas.
-
-2. JALUR RAWA - terdengar suara air, tapi juga suara sesuatu yang 
-   bergerak di dalamnya.
-
-3. JALAN RAHASIA - jika Anda memiliki PETA, Anda bisa melihat 
-   jalan tersembunyi di sini.
-""")
-    
-    options = []
-    options.append("Ikuti Jalan Batu Tua")
-    options.append("Masuki Jalur Rawa")
-    
-    if check_inventory_item(game_state, "catatan_lusuh"):
-        options.append("Ikuti Jalan Rahasia (punya peta)")
-    
-    options.append("Kembali ke Desa")
-    
-    choice = get_choice(options)
-    
-    if choice == 1:
-        return jalan_batu(game_state)
-    elif choice == 2:
-        return jalur_rawa(game_state)
-    elif choice == 3 and check_inventory_item(game_state, "catatan_lusuh"):
-        return jalan_rahasia(game_state)
-    elif choice == len(options):
-        return None
-
-def jalan_batu(game_state: GameState) -> Optional[str]:
-    """Jalan Batu Tua - dengan puzzle simbol"""
-    clear_screen()
-    show_status(game_state)
-    
-    typewriter_effect("""
-Anda mengikuti jalan batu. Batu-batu ini membentuk pola. Ada simbol 
-di setiap batu:
-
-🟠 LINGKARAN - "Awal"
-⬛ KOTAK - "Struktur"
-🔺 SEGITIGA - "Keseimbangan"
-❌ SILANG - "Akhir"
-
-Urutan batu adalah: LINGKARAN - SILANG - KOTAK - SEGITIGA
-
-Tiba-tiba, kabut di sekitar Anda mulai bergerak dengan aneh. 
-Bayangan-bayangan mulai terbentuk dari kabut itu. Mereka mengelilingi 
-Anda.
-
-BISIKAN: "Selesaikan puzzle... atau kami ambil Anda..."
-
-Anda harus mengurutkan simbol dengan benar. Jika salah, bayangan 
-akan menyerang!
-""")
-    
-    options = [
-        "Urutan: Lingkaran - Kotak - Segitiga - Silang",
-        "Urutan: Lingkaran - Segitiga - Kotak - Silang",
-        "Urutan: Silang - Lingkaran - Kotak - Segitiga",
-        "Urutan: Lingkaran - Kotak - Silang - Segitiga"
-    ]
-    
-    choice = get_choice(options)
-    
-    if choice == 2:  # Benar: Awal - Keseimbangan - Struktur - Akhir
-        clear_screen()
-        typewriter_effect("""
-Anda mengurutkan batu dengan benar. Bayangan-bayangan berhenti. 
-Mereka meledak menjadi kabut lagi.
-
-Dari depan, cahaya aneh bersinar. Sebuah jalan terbuka, membawa Anda 
-ke hutan yang lebih dalam.
-
-Di tanah, ada sebuah JIMAT PELINDUNG yang terlihat kuno. Mungkin 
-milik orang yang tersesat di sini sebelumnya.
-
-Anda mengambilnya. Jimat itu terasa hangat di tangan Anda.
-""")
-        add_item(game_state, "jimat_pelindung")
-        game_state.completed_puzzles["simbol_batu"] = True
-        pause()
-        return hutan_berkabut(game_state)
-    
-    else:
-        clear_screen()
-        typewriter_effect("""
-Anda salah! Bayangan-bayangan itu bergerak cepat ke arah Anda!
-
-Mereka menyerang! Tapi untung, Anda masih cukup cepat untuk berlari!
-
-Anda menerima 20 damage!
-""")
-        take_damage(game_state, 20)
-        pause()
-        return hutan_berkabut(game_state)
-
-def jalur_rawa(game_state: GameState) -> Optional[str]:
-    """Jalur Rawa - berbahaya"""
-    clear_screen()
-    show_status(game_state)
-    
-    typewriter_effect("""
-Jalur rawa ini licin dan berbau busuk. Air hitam mencakup hampir 
-seluruh tempat. Anda harus berhati-hati agar tidak jatuh.
-
-Saat Anda berjalan, ada sesuatu yang bergerak di dalam air. 
-Sesuatu yang besar. Bayangan panjang di bawah permukaan.
-
-Tiba-tiba, PISAU TUMA yang berkarat muncul dari rawa! 
-
-Anda menangkapnya dengan refleks. Pisau ini... masih bisa digunakan.
-
-Tetapi ada sesuatu yang aneh. Di rawa ini ada juga apa yang tampak 
-seperti ARTEFAK HUTAN—benda berkilau aneh yang memancarkan cahaya 
-hijau kebiruan.
-""")
-    
-    options = [
-        "Ambil PISAU TUA",
-        "Ambil ARTEFAK HUTAN (beresiko)",
-        "Ambil keduanya",
-        "Kembali ke Hutan"
-    ]
-    
-    choice = get_choice(options)
-    
-    if choice == 1:
-        clear_screen()
-        typewriter_effect("""
-Anda mengambil pisau. Pisau tua ini terasa stabil di tangan Anda.
-Mungkin berguna untuk pertempuran nanti.
-""")
-        add_item(game_state, "pisau_tua")
-        pause()
-        return hutan_berkabut(game_state)
-    
-    elif choice == 2:
-        clear_screen()
-        typewriter_effect("""
-Saat Anda mencapai artefak, air rawa mulai menggalak. 
-Sesuatu yang besar menarik Anda!
-
-Anda menerima 25 damage saat ditarik sesuatu di air!
-
-Namun Anda berhasil keluar dan mengambil ARTEFAK HUTAN.
-""")
-        take_damage(game_state, 25)
-        add_item(game_state, "artefak_hutan")
-        pause()
-        return hutan_berkabut(game_state)
+            damage = ctx.rng.randint(*NO_CHARM_DAMAGE)
+            game_state.hp -= damage
+            ctx.write(ctx.message("tanpa_jimat", damage=damage))
     
     elif choice == 3:
-        clear_screen()
-        typewriter_effect("""
-Anda mencoba mengambil keduanya. Saat Anda menggapai artefak, 
-sesuatu yang besar menarik Anda dengan sangat kuat!
-
-ARGHHHH! Air membanjiri Anda!
-
-Anda menerima 35 damage!
-""")
-        take_damage(game_state, 35)
-        add_item(game_state, "pisau_tua")
-        add_item(game_state, "artefak_hutan")
-        pause()
-        return hutan_berkabut(game_state)
+        ctx.write(ctx.message("berlari"))
+        game_state.enemy_hp = 0
+        game_state.fight_result = "lari"
+        ctx.pause()
+        return "reruntuhan_kuno"
     
     elif choice == 4:
-        return hutan_berkabut(game_state)
-
-def jalan_rahasia(game_state: GameState) -> Optional[str]:
-    """Jalan Rahasia - dengan peta"""
-    clear_screen()
-    show_status(game_state)
-    
-    typewriter_effect("""
-Menggunakan peta, Anda menemukan jalan tersembunyi di antara pohon-pohon.
-
-Jalan ini lebih terang dari yang lain. Kabut di sini tidak seekor tebal. 
-Seolah-olah jalan ini dilindungi.
-
-Anda berjalan melewati pohon-pohon besar, dan tiba-tiba, kabut 
-membuka celah. Anda menemukan reruntuhan kuno.
-
-Bangunan-bangunan tua, simbol-simbol di dinding. Ini tempat yang 
-berbeda dari desa. Ini adalah sisa dari peradaban yang hilang.
-
-Pada kesempatan ini, Anda menemukan CATATAN PANJANG terukir 
-di dinding batu utama:
-
-"Kami, orang-orang kuno, telah menutup Gerbang. 
-Telah menyegelnya dengan darah dan ritual.
-Agar Penghuni tidak keluar.
-Setiap generasi, kami memilih satu untuk menjadi JANGKAR.
-Jangkar harus ingat kesediaan mereka.
-Tetapi untuk melindungi dunia, ingatan harus dihapus.
-Desa Senja adalah pengawal kuno kami.
-Ritual berlanjut. Tak terbatas. Selamanya."
-
-Anda memahami sekarang—ingatan Anda dihapus karena alasan ini.
-""")
-    
-    game_state.story_flags["tahu_tentang_ritual"] = True
-    game_state.story_flags["tahu_nama_di_dinding"] = True
-    add_item(game_state, "jurnal_ritual")
-    
-    options = [
-        "Lanjut ke Reruntuhan Kuno",
-        "Kembali ke Hutan"
-    ]
-    
-    choice = get_choice(options)
-    
-    if choice == 1:
-        return reruntuhan_kuno(game_state)
-    elif choice == 2:
-        return hutan_berkabut(game_state)
-
-# ============================================================================
-# BAB 3 - RERUNTUHAN KUNO
-# ============================================================================
-
-def reruntuhan_kuno(game_state: GameState) -> Optional[str]:
-    """Lokasi: Reruntuhan Kuno"""
-    game_state.visited_locations["reruntuhan"] = True
-    clear_screen()
-    show_status(game_state)
-    
-    if not game_state.story_flags["reruntuhan_pertama_kali"]:
-        typewriter_effect("""
-Anda memutuskan untuk menuju ke arah selatan desa. Melalui jalur 
-yang tersembunyi di antara pohon-pohon, Anda menemukan reruntuhan 
-kuno.
-
-Bangunan-bangunan tua berdiri megah meski sudah dalam keadaan 
-rusak. Simbol-simbol aneh terukir di setiap sudut. Cahaya moon 
-yang aneh bersinar ke bawah, menembus kabut.
-
-Anda merasa seolah-olah Anda telah ke sini sebelumnya, 
-tetapi tidak bisa mengingat kapan.
-""")
-        game_state.story_flags["reruntuhan_pertama_kali"] = True
-        pause()
+        damage_taken = ctx.rng.randint(*DEFEND_DAMAGE)
+        game_state.hp -= damage_taken
+        ctx.write(ctx.message("bertahan", damage=damage_taken))
     
-    clear_screen()
-    show_status(game_state)
-    
-    typewriter_effect("""
-Reruntuhan kuno ini besar sekali. Anda membaca tulisan-tulisan di dinding:
-
-"Gerbang Penghuni"
-"Jangan Buka Sebelum Waktunya"
-"Mereka yang Mengorbankan Akan Dipilih"
-
-Ada beberapa area yang bisa Anda jelajahi:
-
-1. RUANGAN UTAMA - tempat altar dengan ARTEFAK RUNTUHAN
-2. RUANGAN PERPUSTAKAAN - penuh dengan tulisan kuno
-3. AREA DASAR - lebih dalam ke bawah reruntuhan
-""")
-    
-    options = [
-        "Ambil ARTEFAK RUNTUHAN dari altar",
-        "Pelajari tulisan di perpustakaan",
-        "Jelajahi area dasar reruntuhan",
-        "Kembali ke Desa"
-    ]
-    
-    choice = get_choice(options)
-    
-    if choice == 1:
-        clear_screen()
-        typewriter_effect("""
-Anda mencoba mengambil artefak. Tapi saat Anda menyentuhnya, 
-simbol ritual bersinar merah!
-
-Sesuatu mencengkeram Anda dari bawah tanah! Makhluk shadow 
-muncul dari bawah!
-
-SHADOW: "TIDAK! ARTEFAK INI BUKAN MILIKMU!"
-
-Anda bertempur dengan makhluk bayangan!
-""")
-        pause()
-        result = pertarungan_shadow(game_state)
-        if result == "menang":
-            clear_screen()
-            typewriter_effect("""
-Anda berhasil mengalahkan makhluk bayangan! 
-
-Anda mengambil ARTEFAK RUNTUHAN dengan tangan bergetar.
-""")
-            add_item(game_state, "artefak_runtuhan")
-        pause()
-        return reruntuhan_kuno(game_state)
-    
-    elif choice == 2:
-        clear_screen()
-        typewriter_effect("""
-Anda mempelajari simbol ritual di perpustakaan. Simbol-simbol ini 
-menggambarkan prosesi pengorbanan:
-
-1. PEMILIHAN - Satu orang dipilih
-2. PENGASINGAN - Mereka diisolasi dan ingatan dihapus
-3. KEMBALI - Mereka dibawa kembali ke desa
-4. TRANSISI - Pada saat ritual puncak, mereka menjadi "jangkar" 
-   antara dunia nyata dan gerbang yang tersegel
-
-Di dinding lain, Anda membaca:
-
-"NAMA NAMA YANG TERPILIH SEPANJANG SEJARAH:
-
-1823 - Elara Nightwhisper
-1856 - Marcus Stone
-1892 - Vera Blackwood
-1934 - Samuel Cross
-1973 - Catherine Veil
-2018 - Raven... (nama Anda!)
-2023 - AKAN DATANG"
-
-Anda melihat tulisan "Raven" di daftar itu. Anda benar-benar 
-adalah bagian dari ritual ini. Sesuatu yang dingin menyelimuti 
-jantung Anda.
-""")
-        game_state.story_flags["tahu_tentang_ritual"] = True
-        game_state.story_flags["tahu_nama_di_dinding"] = True
-        pause()
-        return reruntuhan_kuno(game_state)
-    
-    elif choice == 3:
-        clear_screen()
-        typewriter_effect("""
-Anda turun lebih dalam ke bawah reruntuhan. Jalan menjadi semakin 
-sempit. Cahaya mulai menghilang.
-
-Saat Anda memasuki goa di bawah reruntuhan, Anda melihat cahaya 
-aneh yang memancar dari dalam. Cahaya yang berkilau dengan warna 
-tidak alami.
-
-Anda menemukan JURNAL RITUAL - buku tua yang dipenuhi catatan 
-tentang ritual dan pengorbanan.
-
-Bacaan dari jurnal ini menceritakan kebenaran tentang Desa Senja 
-dan makhluk yang dijaga oleh orang-orang kuno. Anda baru memahami 
-betapa serius situasi ini.
-""")
-        add_item(game_state, "jurnal_ritual")
-        game_state.story_flags["tahu_tentang_ritual"] = True
-        pause()
-        return reruntuhan_kuno(game_state)
-    
-    elif choice == 4:
+    else:
         return None
-
-def pertarungan_shadow(game_state: GameState) -> str:
-    """Sistem pertarungan sederhana berbasis teks"""
-    clear_screen()
-    
-    enemy_hp = 50
-    enemy_name = "Makhluk Bayangan"
-    
-    typewriter_effect(f"""
-Pertempuran dimulai!
-
-{enemy_name} HP: {enemy_hp}
-Anda HP: {game_state.hp}
-""")
-    
-    while game_state.hp > 0 and enemy_hp > 0:
-        options = [
-            "Serang dengan pisau (jika punya)",
-            "Gunakan jimat untuk perlindungan",
-            "Coba berlari",
-            "Pertahankan diri"
-        ]
-        
-        choice = get_choice(options)
-        
-        if choice == 1:
-            if check_inventory_item(game_state, "pisau_tua"):
-                damage = random.randint(15, 30)
-                enemy_hp -= damage
-                typewriter_effect(f"\n⚔️  Anda menyerang dengan pisau! Damage: {damage}")
-            else:
-                damage = random.randint(5, 15)
-                enemy_hp -= damage
-                typewriter_effect(f"\n👊 Anda pukulan dengan tangan! Damage: {damage}")
-        
-        elif choice == 2:
-            if check_inventory_item(game_state, "jimat_pelindung"):
-                typewriter_effect(f"\n🛡️  Jimat melindungi Anda! Anda menghindari serangan!")
-            else:
-                damage = random.randint(10, 20)
-                game_state.hp -= damage
-                typewriter_effect(f"\n💥 Anda tidak punya jimat! Menerima {damage} damage!")
-        
-        elif choice == 3:
-            typewriter_effect(f"\n🏃 Anda berlari!")
-            return "lari"
-        
-        elif choice == 4:
-            damage_taken = random.randint(5, 15)
-            game_state.hp -= damage_taken
-            typewriter_effect(f"\n🛡️  Anda bertahan, menerima {damage_taken} damage")
-        
-        if enemy_hp > 0:
-            damage_to_player = random.randint(10, 25)
-            game_state.hp -= damage_to_player
-            typewriter_effect(f"\n{enemy_name} menyerang! Damage: {damage_to_player}")
-        
-        print(f"\n{enemy_name} HP: {enemy_hp} | Anda HP: {game_state.hp}")
-        
-        if game_state.hp <= 0:
-            clear_screen()
-            typewriter_effect("""
-Anda terjatuh. Kesadaran Anda memudar.
-
-Tetapi... Anda tidak mati. Malah, Anda terbangun kembali di desa.
-Di rumah yang sama. Saat yang sama.
-
-Ini bagian dari ritual? Apakah Anda bisa mati di dunia ini?
-""")
-            game_state.hp = 50  # HP reset
-            return "kalah"
-        
-        pause()
     
-    return "menang"
+    if game_state.enemy_hp > 0:
+        damage_to_player = ctx.rng.randint(*SHADOW_DAMAGE)
+        game_state.hp -= damage_to_player
+        ctx.write(ctx.message("musuh_menyerang", damage=damage_to_player))
+    
+    ctx.info(ctx.message("status_pertarungan", enemy_hp=game_state.enemy_hp, hp=game_state.hp))
+    
+    if game_state.hp <= 0:
+        ctx.write(ctx.message("kalah"))
+        game_state.hp = DEFEAT_HP  # HP reset
+        game_state.enemy_hp = 0
+        game_state.fight_result = "kalah"
+        ctx.pause()
+        return "reruntuhan_kuno"
+    
+    ctx.pause()
+    
+    if game_state.enemy_hp > 0:
+        return "pertarungan_shadow"
+    return shadow_menang(game_state, ctx)
+
+def shadow_menang(game_state: GameState, ctx: StepContext) -> str:
+    """Hadiah setelah makhluk bayangan dikalahkan"""
+    game_state.enemy_hp = 0
+    game_state.fight_result = "menang"
+    ctx.write(ctx.message("menang"))
+    add_item(game_state, "artefak_runtuhan", ctx)
+    ctx.pause()
+    return "reruntuhan_kuno"
+
+# Kode Python yang bisa dipanggil dari file adegan. {"call": nama} menjalankan
+# HOOKS[nama](game_state, ctx) lalu berpindah ke adegan yang dikembalikannya;
+# "choose": nama menyerahkan pilihan adegan ke CHOICE_HOOKS[nama]
+HOOKS: Dict[str, Callable[[GameState, StepContext], str]] = {
+    "mulai_pertarungan_shadow": mulai_pertarungan_shadow,
+    "shadow_menang": shadow_menang,
+}
+CHOICE_HOOKS: Dict[str, Callable[[GameState, StepContext, int], Optional[str]]] = {
+    "pertarungan_shadow": pertarungan_shadow_pilih,
+}
 
 # ============================================================================
-# BAB 4 - GUA TERLARANG
+# MESIN GAME - GRAF ADEGAN
 # ============================================================================
 
-def gua_terlarang(game_state: GameState) -> Optional[str]:
-    """Lokasi: Gua Terlarang - jantung misteri"""
-    game_state.visited_locations["gua"] = True
-    clear_screen()
-    show_status(game_state)
-    
-    if not game_state.story_flags["gua_pertama_kali"]:
-        typewriter_effect("""
-Anda meninggalkan desa dan melangkah ke arah utara yang gelap. 
-Kabut semakin tebal. Suara bisikan semakin keras.
-
-Setelah berjalan menembus kegelapan, Anda menemukan lubang besar 
-di dalam tanah. Sebuah gua yang misterius. Cahaya aneh bersinar 
-dari dalam.
-
-Sesuatu di dalam gua itu terasa... hidup. Terasa mengamati Anda.
-
-Anda menemukan obor tua di depan gua (jika belum punya). 
-Cahayanya akan membantu Anda menerangi kegelapan di dalam.
-""")
-        game_state.story_flags["gua_pertama_kali"] = True
-        pause()
-    
-    clear_screen()
-    show_status(game_state)
-    
-    typewriter_effect("""
-Gua Terlarang terletak di depan Anda, gelap dan menakutkan.
-
-Dinding gua penuh dengan ukiran—ribuan nama. Nama-nama orang yang 
-telah dipilih sepanjang sejarah. Dan di antara ribuan nama itu, 
-Anda melihat nama Anda sendiri terukir di sana:
-
-RAVEN - 2023
-
-Semakin dalam Anda pergi, suara bisikan semakin keras. 
-Ribuan suara, semuanya memanggil Anda dengan nama.
-
-Akhirnya, Anda sampai ke ruangan besar. Di tengahnya, 
-sebuah cahaya yang sangat terang. Cahaya yang mengancam jiwa Anda.
-
-Ada dua pilihan:
-1. Lanjut ke dalam untuk bertemu Penghuni Gerbang (ENDING TERTINGGI)
-2. Ambil item dan periksa tulisan lebih dulu
-3. Kembali ke Desa
-""")
-    
-    options = [
-        "Mendekat ke cahaya dan bertemu Penghuni",
-        "Gunakan obor untuk melindungi diri dan ambil ARTEFAK INTI",
-        "Baca tulisan di dinding gua",
-        "Kembali ke Desa"
-    ]
-    
-    choice = get_choice(options)
-    
-    if choice == 1:
-        return inti_misteri(game_state)
-    elif choice == 2:
-        clear_screen()
-        if check_inventory_item(game_state, "obor"):
-            typewriter_effect("""
-Anda menggunakan obor. Cahaya oranye obor bertemu cahaya aneh dari 
-tengah gua. 
-
-Cahaya itu menghilang sejenak. Anda melihat—di tengah ruangan, 
-ada sebuah ARTEFAK INTI. Benda ini adalah sumber cahaya itu.
-
-Dengan hati-hati, Anda mengambilnya. Energi dari artefak ini 
-terasa sangat kuat di tangan Anda.
-""")
-            add_item(game_state, "artefak_inti")
+SCENE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "adegan")
+# Paket adegan terkompresi (python assetpack.py build); dipakai jika ada dan
+# tidak lebih lama dari adegan/*.json
+SCENE_PACK = os.path.join(os.path.dirname(os.path.abspath(__file__)), "adegan.pak")
+SCENE_CACHE = 64  # isi adegan terkompilasi yang disimpan
+MENU_SCENE = -1  # id "menu_utama": sesi selesai
+
+# Instruksi adegan yang sudah dikompilasi: (kode, argumen...)
+(OP_TEXT, OP_STATUS, OP_PAUSE, OP_ITEM, OP_SET, OP_DAMAGE,
+ OP_ENDING, OP_GOTO, OP_CALL, OP_IF) = range(10)
+
+# Kunci flag di file adegan -> (atribut GameState, tabel bit)
+FLAG_FIELDS = {
+    "item": ("inventory_bits", INVENTORY_BITS),
+    "flag": ("story_bits", STORY_BITS),
+    "puzzle": ("puzzle_bits", PUZZLE_BITS),
+    "visit": ("location_bits", LOCATION_BITS),
+}
+
+# Syarat: ((atribut, mask, nilai yang diharapkan), ...), HP di atas, HP paling banyak
+Condition = Tuple[Tuple[Tuple[str, int, int], ...], Optional[int], Optional[int]]
+Ops = Tuple[tuple, ...]
+
+def holds(condition: Condition, game_state: GameState) -> bool:
+    """True jika state memenuhi syarat"""
+    checks, hp_above, hp_at_most = condition
+    for field, mask, want in checks:
+        if getattr(game_state, field) & mask != want:
+            return False
+    if hp_above is not None and game_state.hp <= hp_above:
+        return False
+    if hp_at_most is not None and game_state.hp > hp_at_most:
+        return False
+    return True
+
+class SceneBody:
+    """Isi satu adegan yang sudah dikompilasi"""
+    __slots__ = ("enter", "options", "choose")
+
+    def __init__(self, enter: Ops, options: List[Tuple[str, str, Optional[Condition], Ops]],
+                 choose: Optional[Callable] = None):
+        self.enter = enter        # instruksi saat adegan tampil
+        self.options = options    # (id pilihan, label, syarat tampil, instruksi jika dipilih)
+        self.choose = choose      # CHOICE_HOOKS yang menggantikan instruksi pilihan
+
+class SceneGraph:
+    """Graf adegan dari file data dengan id adegan berupa bilangan bulat.
+
+    Hanya indeks (urutan nama adegan = id) yang dibaca saat impor: kepala
+    paket adegan.pak jika ada dan tidak basi, atau adegan/index.json. Isi
+    adegan dibaca dan dikompilasi menjadi instruksi saat adegan itu
+    dikunjungi; perpindahan adegan di dalamnya disimpan sebagai id dan id
+    pesan diganti teks dari katalog bahasa sesi. Isi terkompilasi per
+    (bahasa, adegan) disimpan di LRU sebesar SCENE_CACHE. GameState tetap
+    memakai nama adegan.
+    """
+    def __init__(self, directory: str = SCENE_DIR, pack: Optional[str] = SCENE_PACK,
+                 cache: int = SCENE_CACHE):
+        self.directory = directory
+        self.pack: Optional[AssetPack] = open_pack(pack, directory, "python assetpack.py build")
+        if self.pack is not None:
+            self.names: List[str] = self.pack.names
         else:
-            typewriter_effect("""
-Anda tidak memiliki obor untuk melindungi diri. Cahaya itu 
-sangat terang dan menyakitkan mata Anda!
-
-Anda menerima 15 damage karena intensitas cahaya!
-""")
-            take_damage(game_state, 15)
-        pause()
-        return gua_terlarang(game_state)
-    elif choice == 3:
-        clear_screen()
-        typewriter_effect("""
-Anda membaca tulisan di dinding:
-
-"INI ADALAH GERBANG. GERBANG KE DUNIA LAIN.
-
-Di sebaliknya, ada makhluk yang kami sebut: PENGHUNI GERBANG.
-
-Makhluk ini sangat kuno. Lebih tua dari peradaban kami. 
-Lebih tua dari dunia ini.
-
-Kami telah menyegelnya dengan ritual dan pengorbanan. 
-Setiap generasi, kami mengambil satu 'jangkar'—seseorang yang bisa 
-merasakan kedua dunia.
-
-Jangkar itu akan menjadi penghubung antara dunia nyata dan sisi lain. 
-Mereka akan menjadi kunci untuk menjaga segel itu tetap kuat.
-
-Ini adalah nasib yang dipilih untuk mereka. Nasib yang tidak bisa 
-dihindari.
-
-Tetapi... ada cara untuk memecahkan siklus ini. 
-Ada cara untuk membebaskan Penghuni.
-Ada cara untuk membebaskan diri sendiri.
-
-Jawaban ada di hati seseorang yang terpilih.
-Jawaban ada pada pilihan yang mereka buat."
-
-Anda memahami sekarang. Semuanya tergantung pada pilihan Anda.
-""")
-        game_state.story_flags["tahu_tentang_ritual"] = True
-        pause()
-        return gua_terlarang(game_state)
-    elif choice == 4:
+            with open(os.path.join(directory, "index.json"), encoding="utf-8") as file:
+                self.names = json.load(file)["scenes"]
+        self.ids: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+        self.ids["menu_utama"] = MENU_SCENE
+        self.cache_size = cache
+        self.bodies: "OrderedDict[Tuple[str, int], SceneBody]" = OrderedDict()
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return self.ids.get(name, MENU_SCENE) != MENU_SCENE
+
+    def name(self, scene_id: int) -> str:
+        """Nama adegan untuk GameState.scene"""
+        return "menu_utama" if scene_id == MENU_SCENE else self.names[scene_id]
+
+    def body(self, scene_id: int, lang: str = DEFAULT_LANGUAGE) -> SceneBody:
+        """Isi adegan terkompilasi dalam bahasa `lang`, dimuat saat dibutuhkan"""
+        key = (lang, scene_id)
+        body = self.bodies.get(key)
+        if body is not None:
+            self.bodies.move_to_end(key)
+            return body
+        body = self.bodies[key] = self.load(scene_id, lang)
+        if len(self.bodies) > self.cache_size:
+            self.bodies.popitem(last=False)
+        return body
+
+    # ------------------------------------------------------------------------
+    # Kompilasi
+    # ------------------------------------------------------------------------
+
+    def load(self, scene_id: int, lang: str = DEFAULT_LANGUAGE) -> SceneBody:
+        """Membaca dan mengompilasi isi adegan; ValueError jika tidak valid"""
+        name = self.names[scene_id]
+        if self.pack is not None:
+            data = json.loads(self.pack.read(name))
+        else:
+            with open(os.path.join(self.directory, f"{name}.json"), encoding="utf-8") as file:
+                data = json.load(file)
+        try:
+            messages = catalog(lang).messages(name)
+            blocks = data.get("blocks", {})
+            enter = self.compile_actions(data.get("enter", []), blocks, messages)
+            options = [
+                (sys.intern(f"{name}.{option['label']}"), messages[option["label"]],
+                 self.compile_condition(option["if"]) if "if" in option else None,
+                 self.compile_actions(option.get("do", []), blocks, messages))
+                for option in data.get("options", [])
+            ]
+            choose = CHOICE_HOOKS[data["choose"]] if "choose" in data else None
+        except (KeyError, TypeError, ValueError) as error:
+            raise ValueError(f"Adegan {name} ({lang}) tidak valid: {error!r}") from error
+        return SceneBody(enter, options, choose)
+
+    def compile_actions(self, actions: List, blocks: Dict[str, List],
+                        messages: Dict[str, str]) -> Ops:
+        """Daftar aksi JSON -> tuple instruksi; id pesan diganti teks dari `messages`"""
+        ops: List[tuple] = []
+        for action in actions:
+            if action == "status":
+                ops.append((OP_STATUS,))
+            elif action == "pause":
+                ops.append((OP_PAUSE,))
+            elif "if" in action:
+                ops.append((OP_IF, self.compile_condition(action["if"]),
+                            self.compile_actions(action.get("then", []), blocks, messages),
+                            self.compile_actions(action.get("else", []), blocks, messages)))
+            elif len(action) != 1:
+                raise ValueError(f"Aksi harus punya satu kunci: {action}")
+            elif "text" in action:
+                ops.append((OP_TEXT, messages[action["text"]]))
+            elif "item" in action:
+                INVENTORY_BITS[action["item"]]  # nama item harus dikenal
+                ops.append((OP_ITEM, action["item"]))
+            elif "damage" in action:
+                ops.append((OP_DAMAGE, int(action["damage"])))
+            elif "ending" in action:
+                ops.append((OP_ENDING, action["ending"]))
+            elif "goto" in action:
+                ops.append((OP_GOTO, self.ids[action["goto"]]))
+            elif "call" in action:
+                ops.append((OP_CALL, HOOKS[action["call"]]))
+            elif "block" in action:
+                ops.extend(self.compile_actions(blocks[action["block"]], blocks, messages))
+            else:
+                key = next(iter(action))
+                if key not in FLAG_FIELDS:
+                    raise ValueError(f"Aksi tidak dikenal: {key}")
+                field, bits = FLAG_FIELDS[key]
+                ops.append((OP_SET, field, bits[action[key]]))
+        return tuple(ops)
+
+    def compile_condition(self, condition: Dict) -> Condition:
+        """Syarat JSON -> Condition; semua kunci harus terpenuhi"""
+        checks: List[Tuple[str, int, int]] = []
+        hp_above: Optional[int] = None
+        hp_at_most: Optional[int] = None
+        for key, value in condition.items():
+            if key == "all":
+                for part in value:
+                    sub_checks, sub_above, sub_at_most = self.compile_condition(part)
+                    checks.extend(sub_checks)
+                    if sub_above is not None:
+                        hp_above = sub_above if hp_above is None else max(hp_above, sub_above)
+                    if sub_at_most is not None:
+                        hp_at_most = sub_at_most if hp_at_most is None else min(hp_at_most, sub_at_most)
+            elif key == "hp_above":
+                hp_above = value if hp_above is None else max(hp_above, value)
+            elif key == "hp_at_most":
+                hp_at_most = value if hp_at_most is None else min(hp_at_most, value)
+            else:
+                negate = key.startswith("not_")
+                field, bits = FLAG_FIELDS[key[4:] if negate else key]
+                mask = bits[value]
+                checks.append((field, mask, 0 if negate else mask))
+        return tuple(checks), hp_above, hp_at_most
+
+    # ------------------------------------------------------------------------
+    # Eksekusi
+    # ------------------------------------------------------------------------
+
+    def run(self, ops: Ops, game_state: GameState, ctx: StepContext) -> Optional[int]:
+        """Menjalankan instruksi; id adegan tujuan, atau None jika tidak berpindah"""
+        for op in ops:
+            code = op[0]
+            if code == OP_TEXT:
+                ctx.write(op[1])
+            elif code == OP_STATUS:
+                ctx.status(game_state)
+            elif code == OP_PAUSE:
+                ctx.pause()
+            elif code == OP_ITEM:
+                add_item(game_state, op[1], ctx)
+            elif code == OP_SET:
+                setattr(game_state, op[1], getattr(game_state, op[1]) | op[2])
+            elif code == OP_DAMAGE:
+                take_damage(game_state, op[1], ctx)
+            elif code == OP_ENDING:
+                game_state.ending = op[1]
+            elif code == OP_GOTO:
+                return op[1]
+            elif code == OP_CALL:
+                return self.ids[op[1](game_state, ctx)]
+            else:
+                target = self.run(op[2] if holds(op[1], game_state) else op[3], game_state, ctx)
+                if target is not None:
+                    return target
         return None
 
-def inti_misteri(game_state: GameState) -> Optional[str]:
-    """Area Akhir - Penemu Penghuni Gerbang"""
-    game_state.visited_locations["inti_misteri"] = True
-    clear_screen()
-    show_status(game_state)
-    
-    typewriter_effect("""
-Cahaya itu mulai berubah bentuk. Cahaya yang terang menjadi 
-siluet. Siluet itu menjadi makhluk.
-
-Makhluk itu tidak seperti apa pun yang pernah Anda lihat. 
-Tidak sepenuhnya nyata. Seperti bayangan yang memiliki jiwa.
-
-PENGHUNI: "Akhirnya... akhirnya Anda datang ke sini, Raven."
-
-Suara itu terdengar di mana-mana. Di dalam kepala Anda. 
-Di dalam hati Anda.
-
-PENGHUNI: "Aku telah menunggu selama berabad-abad. Tertahan di sisi 
-lain segel. Mendengar bisikan ribuan jangkar. Merasakan kesedihan 
-mereka yang dipilih untuk mengikatku."
-
-PENGHUNI: "Tetapi Anda berbeda, Raven. Anda memiliki kesempatan 
-untuk membuat pilihan yang belum pernah dibuat sebelumnya."
-
-Makhluk itu melangkah lebih dekat. Energinya terasa sangat kuat.
-
-PENGHUNI: "Aku bisa merasakan keputusan Anda. Aku menunggu."
-
-Anda memiliki empat pilihan. Setiap pilihan akan mengubah takdir 
-desa ini. Takdir Anda. Takdir dunia ini.
-""")
-    
-    pause()
-    
-    options = [
-        "Perkuat segel (Ending Baik - Desa selamat, Anda hilang)",
-        "Buka segel sepenuhnya (Ending Buruk - Dunia dalam bahaya)",
-        "Pergi tanpa memilih (Ending Misteri - Menunggu generasi berikutnya)",
-        "Ubah ritual (Ending Rahasia - Butuh semua artefak)"
-    ]
-    
-    choice = get_choice(options)
-    
-    if choice == 1:
-        return ending_baik(game_state)
-    elif choice == 2:
-        return ending_buruk(game_state)
-    elif choice == 3:
-        return ending_misteri(game_state)
-    elif choice == 4:
-        return ending_rahasia(game_state)
+    def show(self, scene_id: int, game_state: GameState,
+             ctx: StepContext) -> Union[int, List[str]]:
+        """Menampilkan adegan: pilihan yang terlihat, atau id adegan berikutnya"""
+        body = self.body(scene_id, ctx.lang)
+        ctx.scene = self.names[scene_id]
+        target = self.run(body.enter, game_state, ctx)
+        if target is not None:
+            return target
+        return [label for _, label, condition, _ in body.options
+                if condition is None or holds(condition, game_state)]
+
+    def option_ids(self, scene: str, game_state: GameState,
+                   lang: str = DEFAULT_LANGUAGE) -> List[str]:
+        """Id pilihan yang terlihat di adegan `scene` ("adegan.pilihan_N"), sama di semua bahasa"""
+        body = self.body(self.ids[scene], lang)
+        return [option_id for option_id, _, condition, _ in body.options
+                if condition is None or holds(condition, game_state)]
+
+    def choose(self, scene_id: int, game_state: GameState, ctx: StepContext,
+               choice: int) -> Optional[int]:
+        """Menerapkan pilihan ke-`choice` dari pilihan yang terlihat; None jika tidak valid"""
+        body = self.body(scene_id, ctx.lang)
+        ctx.scene = self.names[scene_id]
+        if body.choose is not None:
+            target = body.choose(game_state, ctx, choice)
+            return None if target is None else self.ids[target]
+        visible = [ops for _, _, condition, ops in body.options
+                   if condition is None or holds(condition, game_state)]
+        if not 1 <= choice <= len(visible):
+            return None
+        return self.run(visible[choice - 1], game_state, ctx)
+
+# Semua adegan game; list(SCENES) = nama adegan sesuai urutan id
+SCENES = SceneGraph()
 
 # ============================================================================
-# ENDING
+# MESIN GAME - LANGKAH
 # ============================================================================
 
-def ending_baik(game_state: GameState):
-    """Ending Baik - Segel diperkuat, Raven hilang"""
-    clear_screen()
-    typewriter_effect("""
-ENDING BAIK: PENGORBANAN UNTUK KESELAMATAN
-
-Anda membuat keputusan. Anda tidak ingin dunia jatuh ke tangan 
-makhluk itu. Anda tidak ingin lebih banyak desa yang terikat.
-
-Anda membentuk ritual yang lebih kuat. Anda menggunakan artefak 
-yang Anda kumpulkan. Anda memanggil kekuatan dari semua jangkar 
-sebelumnya.
-
-Cahaya bersinar dengan terang yang membutakan. 
-
-PENGHUNI: "Tidak... tidak begini... RAVEN!!!"
-
-Segel yang baru menjadi jauh lebih kuat dari sebelumnya. 
-Penghuni tersimpan lebih dalam. Lebih jauh. Mungkin selamanya.
-
-Tetapi harganya... harga yang harus dibayar adalah hidupmu.
-
-Tubuh Anda mulai bersinar. Anda menjadi bagian dari segel itu. 
-Anda adalah jangkar final. Jangkar yang paling kuat.
-
-Anda merasa tubuh Anda meleleh. Ingatan Anda hilang kembali. 
-Tetapi kali ini, Anda melakukannya dengan sukarela.
-
-Saat kesadaran Anda hilang, Anda mendengar suara tetua desa:
-
-TETUA DESA: "Raven telah mengorbankan diri. Desa selamat. 
-Ritual akan berlanjut. Tetapi lebih aman sekarang. 
-Berkat Raven, kami akan hidup lebih lama."
-
----
-
-Anda telah mencapai ENDING BAIK.
-
-Desa selamat, tetapi Anda hilang dari dunia. 
-Anda menjadi legenda. Anda menjadi perlindungan.
-
-Suatu hari, akan ada yang lain yang dipilih. 
-Dan mereka akan memiliki kesempatan yang sama dengan yang Anda miliki.
-""")
-    pause()
-
-def ending_buruk(game_state: GameState):
-    """Ending Buruk - Segel terbuka, Penghuni lepas"""
-    clear_screen()
-    typewriter_effect("""
-ENDING BURUK: GERBANG TERBUKA
-
-Anda membuat pilihan. Rasa kasihan kepada makhluk yang terikat 
-berabad-abad mengalahkan akal sehat Anda.
-
-Anda membuka segel.
-
-PENGHUNI: "AKHIRNYA!!! AKHIRNYA KAMI BEBAS!!!"
-
-Makhluk itu meledak keluar dengan energi yang menghancurkan. 
-Gua berguncang. Batu-batu jatuh.
-
-Anda berlari, tetapi tubuh Anda sudah terlalu lemah. 
-Anda jatuh.
-
-Saat Anda jatuh, Anda melihat—di balik Penghuni—ada lebih banyak 
-makhluk. Jauh lebih banyak. Ribuan. Jutaan.
-
-Mereka semua keluar.
-
----
-
-Anda terbangun di rumah Anda di desa. Tetapi semuanya berbeda.
-
-Kabut yang sebelumnya di sekitar desa sekarang menyebar ke mana-mana. 
-Dunia berada dalam kegelapan. Makhluk-makhluk aneh berkeliaran.
-
-Orang-orang di kota tetangga menghubungi. Mereka mengatakan 
-hal yang sama terjadi di sana. Dan di sana. Dan di sana.
-
-Anda menyadari—Anda telah membuka gerbang bukan hanya untuk 
-satu makhluk, tetapi untuk semua makhluk yang ada di baliknya.
-
-Dunia sedang berakhir.
-
----
-
-Anda telah mencapai ENDING BURUK.
-
-Desa mungkin selamat untuk saat ini, tetapi dunia... 
-dunia sedang jatuh ke dalam kegelapan yang tak terbatas.
-
-Adakah cara untuk menutup gerbang itu kembali?
-Atau apakah sudah terlambat?
-""")
-    pause()
-
-def ending_misteri(game_state: GameState):
-    """Ending Misteri - Tidak memilih"""
-    clear_screen()
-    typewriter_effect("""
-ENDING MISTERI: PENUNDAAN TAKDIR
-
-Anda tidak membuat pilihan apapun. Anda hanya meninggalkan Penghuni 
-sendiri di sana.
-
-PENGHUNI: "Anda tidak memilih? Bagaimana mungkin..."
-
-Anda berbalik dan pergi dari gua itu. Anda melangkah keluar dari 
-reruntuhan kuno. Anda meninggalkan hutan berkabut.
-
-Anda kembali ke desa. Semuanya sama seperti sebelumnya. 
-Penduduk masih duduk di balai, tersenyum aneh.
-
-TETUA DESA: "Anda telah kembali, Raven. Tetapi... Anda tidak 
-menyelesaikan ritual?"
-
-ANDA: "Saya tidak tahu apa yang seharusnya saya lakukan."
-
-Tetua tersenyum dengan aneh.
-
-TETUA DESA: "Baiklah. Jika begitu, desa akan menunggu. 
-Menunggu hingga Anda siap. Atau menunggu yang dipilih berikutnya."
-
----
-
-Hari-hari berlalu. Minggu berlalu. Tahun berlalu.
-
-Anda tetap tinggal di desa. Ingatan Anda tetap hilang. 
-Anda menjadi seperti penduduk desa lainnya.
-
-Tetapi ada sesuatu yang berbeda. Anda tahu kebenaran. 
-Anda tahu tentang segel. Anda tahu tentang Penghuni.
-
-Suatu hari, seseorang datang ke desa. Seseorang baru. 
-Seseorang yang tersesat di kabut.
-
-Tetua desa tersenyum.
-
-TETUA DESA: "Aku percaya telah tiba waktunya, Raven. 
-Untuk generasi baru. Untuk yang dipilih berikutnya."
-
-Siklus berulang.
-
----
-
-Anda telah mencapai ENDING MISTERI.
-
-Desa tetap ada. Ritual tetap berlanjut. 
-Tetapi Anda sekarang menjadi bagian dari desa. 
-Bagian dari siklus yang tak terbatas.
-
-Adakah jalan keluar? Atau adakah yang akan menemukan jalan keluar 
-di generasi mendatang?
-""")
-    pause()
-
-def ending_rahasia(game_state: GameState):
-    """Ending Rahasia - Ubah ritual dengan semua artefak"""
-    clear_screen()
-    
-    # Check if all artifacts are collected
-    has_all_artifacts = (
-        check_inventory_item(game_state, "artefak_hutan") and
-        check_inventory_item(game_state, "artefak_runtuhan") and
-        check_inventory_item(game_state, "artefak_inti")
-    )
-    
-    has_all_puzzles = (
-        game_state.completed_puzzles["simbol_batu"] and
-        game_state.completed_puzzles["ritual_simbol"]
-    )
-    
-    if has_all_artifacts and has_all_puzzles and game_state.hp > 0:
-        typewriter_effect("""
-ENDING RAHASIA: MEMECAHKAN SIKLUS
-
-Anda telah mengumpulkan semua artefak kuno. Anda telah menyelesaikan 
-semua teka-teki. Anda masih hidup. Anda siap.
-
-Anda menempatkan ketiga artefak di depan Penghuni. 
-Cahaya mereka bersatu dan bersinar.
-
-PENGHUNI: "Apa ini? Apa yang Anda lakukan?"
-
-Anda memulai ritual yang berbeda. Ritual yang tidak mengutamakan 
-pengorbanan, tetapi pemahaman.
-
-Anda menyentuh Penghuni dengan tangan Anda. 
-
-Bukan serangan. Bukan penjara. Tetapi koneksi.
-
-Ingatan mengalir. Ingatan Penghuni. Ingatan tentang dunia sebelum segel. 
-Ingatan tentang peradaban yang hilang. Ingatan tentang cinta, 
-harapan, dan kepercayaan yang hilang.
-
-Anda memahami Penghuni sekarang. Bukan sebagai musuh. Tetapi sebagai 
-makhluk yang kesepian. Makhluk yang lupa siapa dirinya.
-
-PENGHUNI: "Anda memahami saya. Bagaimana mungkin..."
-
-ANDA: "Karena saya juga lupa. Tetapi sekarang, saya mengingat."
-
-Ingatan Anda kembali. Semua itu. Wajah Anda, nama Anda, 
-kehidupan Anda sebelum desa.
-
-Anda bukan Raven yang dipilih tahun ini. Anda adalah Raven 
-dari lima tahun yang lalu. Orang yang melihat kebenaran dan 
-ditghapus ingatannya.
-
-Dan sekarang, pada saat ini, ritual berubah.
-
-Segel itu tidak dihancurkan. Tetapi juga tidak diperkuat. 
-Sebaliknya, segel itu menjadi pintu dua arah. Penghuni dan dunia 
-nyata dapat saling memahami.
-
-Desa Senja dibebaskan dari keharusan pengorbanan. 
-Mereka dapat hidup dengan damai.
-
-Anda dan Penghuni—kalian berdua menjadi duta antara dua dunia. 
-Simbol dari perdamaian yang mungkin dicapai.
-
----
-
-Anda telah mencapai ENDING RAHASIA: PEMBEBASAN.
-
-Desa selamat. Penghuni selamat. 
-Dunia selamat karena ada pemahaman, bukan pengorbanan.
-
-Ingatan Anda kembali. Identitas Anda dikembalikan.
-
-Ritual berakhir. Siklus putus.
-
-Ini adalah ending yang paling langka. Ending yang memerlukan 
-kearifan, keberanian, dan pemberian maaf.
-
-Selamat, Raven. Anda telah mengubah takdir.
-""")
-    else:
-        clear_screen()
-        typewriter_effect("""
-Anda mencoba membuat ritual baru, tetapi...
-
-Artefak Anda tidak cukup. Pengetahuan Anda belum lengkap. 
-Tubuh Anda terlalu lemah.
-
-Ritual yang Anda coba ciptakan malah menghasilkan sesuatu yang 
-tidak terduga. Cahaya meledak.
-
-Anda terpukul kuat ke belakang. Consciousness Anda memudar.
-
----
-
-Anda terbangun di rumah Anda di desa. Seperti sebelumnya.
-
-Tetua desa tersenyum.
-
-TETUA DESA: "Anda mencoba sesuatu yang tidak seharusnya, Raven. 
-Ritual tidak dapat diubah oleh siapa pun. Tidak bahkan oleh 
-yang terpilih."
-
-Anda kembali ke pilihan pertama. Anda harus membuat keputusan: 
-perkuat, buka, atau tinggalkan?
-
----
-
-Anda harus mencoba lagi dengan persiapan yang lebih baik.
-""")
-        pause()
-        return inti_misteri(game_state)
+def step(game_state: GameState, choice: Optional[int] = None, rng=random,
+         lang: str = DEFAULT_LANGUAGE) -> Tuple[Text, List[str], GameState]:
+    """Satu langkah permainan tanpa I/O: (teks, pilihan, state baru).
+
+    `choice` (1..len(options)) diterapkan pada adegan saat ini, lalu adegan
+    berikutnya ditampilkan. Tanpa `choice`, adegan saat ini ditampilkan
+    (awal sesi). State masukan tidak diubah. Pilihan kosong berarti sesi
+    selesai dan pemain kembali ke menu utama. `rng` dipakai untuk semua
+    angka acak; setiap sesi sebaiknya memakai SessionRng sendiri dari
+    RngProvider (default: modul random global). Teks dan pilihan memakai
+    katalog bahasa `lang`; setiap potongan teks membawa nama adegan yang
+    menghasilkannya.
+    """
+    game_state = game_state.copy()
+    ctx = StepContext(rng, lang)
+    scene_id = SCENES.ids[game_state.scene]
+    
+    if choice is not None:
+        if scene_id == MENU_SCENE:
+            raise ValueError("Sesi sudah selesai")
+        if PROFILER is None:
+            target = SCENES.choose(scene_id, game_state, ctx, choice)
+        else:
+            start = time.perf_counter()
+            target = SCENES.choose(scene_id, game_state, ctx, choice)
+            PROFILER.logic(game_state.scene, f"{game_state.scene}_pilih",
+                           time.perf_counter() - start)
+        if target is None:
+            raise ValueError(f"Pilihan tidak valid di {game_state.scene}: {choice}")
+        scene_id = target
+        game_state.scene = SCENES.name(scene_id)
+    
+    while scene_id != MENU_SCENE:
+        if PROFILER is None:
+            result = SCENES.show(scene_id, game_state, ctx)
+        else:
+            start = time.perf_counter()
+            result = SCENES.show(scene_id, game_state, ctx)
+            PROFILER.shown(game_state.scene, time.perf_counter() - start)
+        if isinstance(result, int):
+            scene_id = result
+            game_state.scene = SCENES.name(scene_id)
+        else:
+            return ctx.text, result, game_state
     
-    pause()
+    return ctx.text, [], game_state
 
 # ============================================================================
-# MENU UTAMA & LOOP GAME
+# MENU UTAMA & LOOP GAME (CLI)
 # ============================================================================
 
-def main_menu():
+def main_menu(has_save: bool = False):
     """Menu utama game"""
+    messages = catalog(LANGUAGE)
     clear_screen()
-    typewriter_effect("""
-╔═══════════════════════════════════════════════════════════════╗
-║                  BISIKAN DARI KABUT                          ║
-║              Sebuah Petualangan Penuh Misteri                ║
-╚═══════════════════════════════════════════════════════════════╝
-
-Pilihan:
-1. Mulai Game Baru
-2. Tentang Game
-3. Keluar
-""")
+    options = [messages.get("opsi_mulai"), messages.get("opsi_tentang"), messages.get("opsi_keluar")]
+    labels = [messages.get("menu_mulai"), messages.get("menu_tentang"), messages.get("menu_keluar")]
+    if has_save:
+        options.insert(0, messages.get("opsi_lanjutkan"))
+        labels.insert(0, messages.get("menu_lanjutkan"))
+    menu = "\n".join(f"{i}. {label}" for i, label in enumerate(labels, 1))
+    typewriter_effect(messages.get("menu_judul", menu=menu))
     
-    options = ["Mulai Game", "Tentang", "Keluar"]
     choice = get_choice(options)
+    if has_save:
+        if choice == 1:
+            return "lanjutkan"
+        choice -= 1
     
     if choice == 1:
         return "main_game"
     elif choice == 2:
         clear_screen()
-        typewriter_effect("""
-TENTANG GAME:
-
-"Bisikan dari Kabut" adalah game petualangan teks dengan tema 
-misteri dan horror yang ringan.
-
-Cerita:
-Anda terbangun di sebuah desa yang tertutup kabut tebal. 
-Penduduk desa berbicara dengan kata-kata aneh. Ada ritual kuno 
-yang mengikat desa ini ke makhluk misterius.
-
-Anda adalah bagian dari ritual itu, dan Anda harus membuat 
-pilihan yang akan mengubah takdir Anda dan dunia.
-
-Fitur:
-- Multiple endings (4 berbeda)
-- Sistem inventory dan HP
-- Pertarungan berbasis teks
-- Puzzle dan teka-teki
-- Alur cerita yang bercabang
-
-Developer: AI Programmer
-Bahasa: Python 3
-""")
+        typewriter_effect(messages.get("tentang"))
         pause()
         return "menu_utama"
     elif choice == 3:
         return "keluar"
 
-def main_game(game_state: GameState):
-    """Loop permainan utama"""
-    prolog(game_state)
-    
-    # Game loop - Pemain bisa memilih lokasi bebas
-    while game_state.hp > 0:
-        clear_screen()
-        show_status(game_state)
-        
-        typewriter_effect("""
-Anda berada di Desa Senja. Kabut tebal mengelilingi Anda, dan ada 
-beberapa arah yang bisa Anda jelajahi. Setiap arah akan membawa 
-Anda ke petualangan yang berbeda...
-
-PILIH LOKASI UNTUK DIJELAJAHI:
-""")
-        
-        options = [
-            "Jelajahi Desa Lebih Jauh (Balai, Rumah, Sumur, Lonceng)",
-            "Pergi ke Hutan Berkabut (Barat)",
-            "Pergi ke Reruntuhan Kuno (Selatan)",
-            "Pergi ke Gua Terlarang (Bawah Tanah)"
-        ]
-        choice = get_choice(options)
-        
-        if choice == 1:
-            desa_terlupakan(game_state)
-        elif choice == 2:
-            hutan_berkabut(game_state)
-        elif choice == 3:
-            reruntuhan_kuno(game_state)
-        elif choice == 4:
-            gua_terlarang(game_state)
-        
-        if game_state.hp <= 0:
-            break
+def main_game(game_state: GameState, resume: bool = False) -> GameState:
+    """Loop permainan utama - CLI di atas mesin game.
+
+    Setelah setiap pilihan state disimpan ke SAVE_FILE, jadi game bisa
+    dilanjutkan dari menu utama walaupun program sempat ditutup. Seed RNG
+    dan semua pilihan sesi direkam ke TRANSCRIPT_DIR untuk diputar ulang.
+    Kecepatan typewriter menyesuaikan kecepatan baca pemain (pacing.py).
+    """
+    # savegame dan replay mengimpor game, jadi diimpor di sini
+    import replay
+    import savegame
+    
+    if not resume:
+        game_state.scene = "prolog"
+    transcript, rng = replay.new_session(game_state)
+    pace = ReadingPace()
+    text, options, game_state = step(game_state, None, rng, LANGUAGE)
+    
+    try:
+        while True:
+            clear_screen()
+            show_text(text, pace)
+            if PROFILER is not None and PROFILER.current != game_state.scene:
+                # Waktu menunggu pilihan milik adegan yang menampilkan pilihan
+                PROFILER.switch(game_state.scene)
+            if not options:
+                # Permainan selesai; tidak ada yang bisa dilanjutkan
+                if TELEMETRY is not None:
+                    TELEMETRY.record_end(str(transcript.seed), len(transcript.choices), game_state)
+                if os.path.exists(SAVE_FILE):
+                    os.remove(SAVE_FILE)
+                return game_state
+            pace.shown()
+            choice = get_choice(options)
+            pace.answered(choice=True)
+            if TELEMETRY is not None:
+                TELEMETRY.record_choice(str(transcript.seed), len(transcript.choices),
+                                        game_state, options, choice, LANGUAGE)
+            transcript.choices.append(choice)
+            ending = game_state.ending
+            text, options, game_state = step(game_state, choice, rng, LANGUAGE)
+            if TELEMETRY is not None and game_state.ending != ending:
+                TELEMETRY.record_ending(str(transcript.seed), len(transcript.choices), game_state)
+            savegame.save(game_state, SAVE_FILE)
+    finally:
+        transcript.final = game_state
+        os.makedirs(TRANSCRIPT_DIR, exist_ok=True)
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{transcript.seed}.json"
+        transcript.save(os.path.join(TRANSCRIPT_DIR, name))
+
+def load_saved_game() -> Optional[GameState]:
+    """State dari SAVE_FILE, atau None jika tidak ada atau rusak"""
+    import savegame  # savegame mengimpor game, jadi diimpor di sini
+    
+    try:
+        return savegame.load(SAVE_FILE)
+    except (OSError, ValueError) as error:
+        print(catalog(LANGUAGE).get("simpanan_rusak", error=error))
+        pause()
+        return None
 
 def main():
     """Main function - entry point"""
+    global PROFILER, TELEMETRY, KEYBOARD, LANGUAGE
+    parser = argparse.ArgumentParser(description="BISIKAN DARI KABUT")
+    parser.add_argument("--profile", metavar="NAMA",
+                        help="catat waktu per adegan ke NAMA.json dan NAMA.folded")
+    parser.add_argument("--telemetry", metavar="FILE",
+                        help="catat setiap pilihan sebagai JSONL ke FILE")
+    parser.add_argument("--line-input", action="store_true",
+                        help="pilihan diketik lalu ENTER (tanpa input per tombol)")
+    parser.add_argument("--lang", choices=LANGUAGES, default=DEFAULT_LANGUAGE,
+                        help="bahasa teks permainan")
+    args = parser.parse_args()
+    LANGUAGE = args.lang
+    if args.profile:
+        from instrument import Profiler
+        PROFILER = Profiler()
+    if args.telemetry:
+        from telemetry import TelemetryWriter
+        TELEMETRY = TelemetryWriter(args.telemetry)
+    if not args.line_input:
+        from keyinput import RawKeyboard
+        if RawKeyboard.supported():
+            KEYBOARD = RawKeyboard()
+            KEYBOARD.start()
+    
     state = "menu_utama"
     game_state = GameState()
     
-    while state != "keluar":
-        if state == "menu_utama":
-            state = main_menu()
-        elif state == "main_game":
-            main_game(game_state)
-            state = "menu_utama"
+    try:
+        while state != "keluar":
+            if state == "menu_utama":
+                if PROFILER is not None:
+                    PROFILER.enter("menu_utama")
+                state = main_menu(os.path.exists(SAVE_FILE))
+            elif state == "main_game":
+                game_state = main_game(GameState())
+                state = "menu_utama"
+            elif state == "lanjutkan":
+                saved = load_saved_game()
+                if saved is not None:
+                    game_state = main_game(saved, resume=True)
+                state = "menu_utama"
+    finally:
+        if KEYBOARD is not None:
+            KEYBOARD.close()
+            KEYBOARD = None
+        if TELEMETRY is not None:
+            TELEMETRY.close()
+        if PROFILER is not None:
+            PROFILER.close()
+            PROFILER.save_json(f"{args.profile}.json")
+            PROFILER.save_collapsed(f"{args.profile}.folded")
     
     clear_screen()
-    typewriter_effect("""
-Terima kasih telah bermain BISIKAN DARI KABUT!
-
-Semoga Anda menikmati perjalanan di dunia yang penuh misteri ini.
-
-Kabut akan selalu di sini... menunggu Anda kembali...
-""")
+    typewriter_effect(catalog(LANGUAGE).get("terima_kasih"))
     print("\n")
 
 if __name__ == "__main__":
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+INSTRUMENTASI ADEGAN - BISIKAN DARI KABUT
+
+Mencatat ke mana waktu sebuah sesi CLI habis, per adegan: waktu total
+(wall), waktu menampilkan teks (render), waktu menunggu masukan pemain,
+waktu logika setiap fungsi adegan, serta jumlah byte dan panggilan write.
+
+Teks dan waktu dicatat di adegan yang menghasilkannya: satu langkah mesin
+game bisa melewati beberapa adegan (misalnya prolog lalu desa_senja), dan
+setiap potongan teks membawa nama adegan asalnya (game.StepContext).
+Kunjungan dihitung setiap kali mesin game menampilkan sebuah adegan.
+
+Instrumentasi hanya aktif jika game.PROFILER diisi (python game.py
+--profile NAMA); jika tidak, setiap hook hanya satu pengecekan None.
+Hasil bisa diekspor sebagai JSON atau sebagai collapsed stack untuk
+flamegraph.pl / speedscope.
+"""
+
+import json
+import time
+from typing import Dict, List
+
+class SceneStats:
+    """Angka satu adegan (waktu dalam detik)"""
+    __slots__ = ("visits", "wall", "render", "input_wait", "bytes", "writes", "logic")
+
+    def __init__(self):
+        self.visits = 0
+        self.wall = 0.0
+        self.render = 0.0
+        self.input_wait = 0.0
+        self.bytes = 0
+        self.writes = 0
+        self.logic: Dict[str, float] = {}  # nama fungsi adegan -> detik
+
+    def to_dict(self) -> Dict:
+        return {
+            "visits": self.visits,
+            "wall": self.wall,
+            "render": self.render,
+            "input_wait": self.input_wait,
+            "logic": dict(self.logic),
+            "bytes": self.bytes,
+            "writes": self.writes,
+        }
+
+class Profiler:
+    """Pengumpul angka per adegan untuk satu proses CLI"""
+    def __init__(self):
+        self.scenes: Dict[str, SceneStats] = {}
+        self.current = "menu_utama"  # adegan yang teksnya sedang tampil
+        self.entered = time.perf_counter()
+
+    def stats(self, scene: str) -> SceneStats:
+        """Angka sebuah adegan, dibuat saat pertama dipakai"""
+        stats = self.scenes.get(scene)
+        if stats is None:
+            stats = self.scenes[scene] = SceneStats()
+        return stats
+
+    def enter(self, scene: str):
+        """Adegan `scene` (di luar mesin game, misalnya menu) dikunjungi dan mulai tampil"""
+        self.switch(scene)
+        self.stats(scene).visits += 1
+
+    def switch(self, scene: str):
+        """Teks adegan `scene` mulai tampil; wall adegan sebelumnya ditutup"""
+        self.close()
+        self.current = scene
+
+    def close(self):
+        """Menutup wall adegan yang sedang tampil (sebelum ekspor)"""
+        now = time.perf_counter()
+        self.stats(self.current).wall += now - self.entered
+        self.entered = now
+
+    def logic(self, scene: str, function: str, seconds: float):
+        """Waktu satu panggilan fungsi adegan di mesin game"""
+        logic = self.stats(scene).logic
+        logic[function] = logic.get(function, 0.0) + seconds
+
+    def shown(self, scene: str, seconds: float):
+        """Mesin game menampilkan adegan `scene` (satu kunjungan) dalam `seconds` detik"""
+        self.stats(scene).visits += 1
+        self.logic(scene, scene, seconds)
+
+    def render(self, seconds: float, written: int, writes: int):
+        """Waktu dan keluaran satu tampilan teks di adegan saat ini"""
+        stats = self.stats(self.current)
+        stats.render += seconds
+        stats.bytes += written
+        stats.writes += writes
+
+    def input_wait(self, seconds: float):
+        """Waktu menunggu masukan pemain di adegan saat ini"""
+        self.stats(self.current).input_wait += seconds
+
+    # ------------------------------------------------------------------------
+    # Ekspor
+    # ------------------------------------------------------------------------
+
+    def to_dict(self) -> Dict:
+        """Semua angka sebagai dict yang bisa di-JSON-kan"""
+        return {scene: stats.to_dict() for scene, stats in sorted(self.scenes.items())}
+
+    def save_json(self, path: str):
+        """Menulis angka per adegan ke file JSON"""
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.to_dict(), file, indent=2)
+
+    def collapsed(self) -> List[str]:
+        """Baris collapsed stack ("sesi;adegan;bagian mikrodetik")"""
+        lines = []
+        for scene, stats in sorted(self.to_dict().items()):
+            parts = {"render": stats["render"], "input": stats["input_wait"]}
+            for function, seconds in stats["logic"].items():
+                parts[f"logika;{function}"] = seconds
+            # Sisa wall: clear_screen, pemanggilan step, dan lain-lain
+            parts["lain"] = stats["wall"] - sum(parts.values())
+            for part, seconds in parts.items():
+                micros = round(seconds * 1e6)
+                if micros > 0:
+                    lines.append(f"sesi;{scene};{part} {micros}")
+        return lines
+
+    def save_collapsed(self, path: str):
+        """Menulis collapsed stack untuk flamegraph"""
+        with open(path, "w", encoding="utf-8") as file:
+            file.write("\n".join(self.collapsed()) + "\n")
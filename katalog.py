@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""
+KATALOG BAHASA - BISIKAN DARI KABUT
+
+Semua teks untuk pemain ada di bahasa/<kode>/, satu file JSON per adegan
+(id pesan -> teks, misalnya "teks_1" dan "pilihan_1") ditambah umum.json
+untuk pesan mesin game, menu CLI, dan server. File di adegan/ hanya
+menyebut id pesan; teks bisa berupa string atau daftar baris.
+
+Katalog sebuah bahasa dibuka saat pertama dipakai. Jika paket
+bahasa/<kode>.pak ada dan tidak lebih lama dari bahasa/<kode>/*.json,
+katalog dibaca lewat mmap dari satu file itu
+(assetpack.py) dan hanya adegan yang diminta yang didekompresi; tanpa paket
+bahasa/<kode>/<adegan>.json dibaca langsung. Setiap teks di-intern, jadi
+teks yang sama di beberapa adegan hanya disimpan sekali, dan isi adegan
+terkompilasi (game.SCENES) dipakai bersama oleh semua sesi berbahasa sama.
+Server yang melayani beberapa bahasa hanya memuat adegan yang sedang
+dimainkan, dalam bahasa yang dipakai pemainnya.
+
+Contoh:
+    python katalog.py check          # id pesan semua bahasa sama dengan "id"
+    python katalog.py build --lzma   # bahasa/id.pak, bahasa/en.pak
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+from string import Formatter
+from typing import Dict, List, Optional, Set, Tuple
+
+import assetpack
+from assetpack import AssetPack, open_pack
+
+CATALOG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bahasa")
+LANGUAGES = ("id", "en")
+DEFAULT_LANGUAGE = "id"
+COMMON = "umum"  # entri pesan di luar adegan
+
+class Catalog:
+    """Katalog pesan satu bahasa; entri (adegan atau COMMON) dimuat saat diminta"""
+    def __init__(self, lang: str, directory: str = CATALOG_DIR):
+        if lang not in LANGUAGES:
+            raise ValueError(f"Bahasa tidak didukung: {lang}")
+        self.lang = lang
+        self.directory = os.path.join(directory, lang)
+        self.pack: Optional[AssetPack] = open_pack(os.path.join(directory, f"{lang}.pak"),
+                                                   self.directory, "python katalog.py build")
+        self.common: Optional[Dict[str, str]] = None
+
+    def messages(self, entry: str) -> Dict[str, str]:
+        """Semua pesan satu entri dengan teks yang di-intern; KeyError jika tidak ada"""
+        if self.pack is not None:
+            data = json.loads(self.pack.read(entry))
+        else:
+            try:
+                with open(os.path.join(self.directory, f"{entry}.json"), encoding="utf-8") as file:
+                    data = json.load(file)
+            except FileNotFoundError:
+                raise KeyError(f"{self.lang}/{entry}") from None
+        return {
+            sys.intern(key): sys.intern(value if isinstance(value, str) else "\n".join(value))
+            for key, value in data.items()
+        }
+
+    def get(self, key: str, **fields) -> str:
+        """Pesan umum `key`, diisi dengan `fields` (str.format) jika ada"""
+        if self.common is None:
+            self.common = self.messages(COMMON)
+        text = self.common[key]
+        return text.format(**fields) if fields else text
+
+_CATALOGS: Dict[str, Catalog] = {}
+
+def catalog(lang: str = DEFAULT_LANGUAGE) -> Catalog:
+    """Katalog bahasa `lang`, dibuka sekali per proses"""
+    found = _CATALOGS.get(lang)
+    if found is None:
+        found = _CATALOGS[lang] = Catalog(lang)
+    return found
+
+# ============================================================================
+# ALAT
+# ============================================================================
+
+def source_entries(lang: str, directory: str = CATALOG_DIR) -> List[Tuple[str, bytes]]:
+    """Isi bahasa/<lang>/ sebagai entri paket, JSON diringkas"""
+    entries = []
+    for path in sorted(glob.glob(os.path.join(directory, lang, "*.json"))):
+        with open(path, encoding="utf-8") as file:
+            data = json.load(file)
+        entries.append((os.path.splitext(os.path.basename(path))[0],
+                        json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")))
+    return entries
+
+def _fields(text) -> Set[str]:
+    """Nama isian str.format di sebuah teks"""
+    if not isinstance(text, str):
+        text = "\n".join(text)
+    return {name for _, name, _, _ in Formatter().parse(text) if name}
+
+def check(directory: str = CATALOG_DIR) -> List[str]:
+    """Perbedaan setiap bahasa terhadap DEFAULT_LANGUAGE (entri, id pesan, isian)"""
+    sources = {lang: dict(source_entries(lang, directory)) for lang in LANGUAGES}
+    problems: List[str] = []
+    reference = sources[DEFAULT_LANGUAGE]
+    for lang in LANGUAGES:
+        if lang == DEFAULT_LANGUAGE:
+            continue
+        for entry in sorted(set(reference) | set(sources[lang])):
+            if entry not in sources[lang]:
+                problems.append(f"{lang}/{entry}: tidak ada")
+                continue
+            if entry not in reference:
+                problems.append(f"{lang}/{entry}: tidak ada di {DEFAULT_LANGUAGE}")
+                continue
+            wanted = json.loads(reference[entry])
+            found = json.loads(sources[lang][entry])
+            for key in sorted(set(wanted) - set(found)):
+                problems.append(f"{lang}/{entry}: {key} belum diterjemahkan")
+            for key in sorted(set(found) - set(wanted)):
+                problems.append(f"{lang}/{entry}: {key} tidak dipakai")
+            for key in sorted(set(wanted) & set(found)):
+                if entry == COMMON and _fields(wanted[key]) != _fields(found[key]):
+                    problems.append(f"{lang}/{entry}: isian {key} berbeda")
+    return problems
+
+def main():
+    """Entry point pemeriksa & pembuat paket katalog"""
+    parser = argparse.ArgumentParser(description="Katalog bahasa BISIKAN DARI KABUT")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("check", help="cek id pesan semua bahasa")
+    build_parser = commands.add_parser("build", help="buat bahasa/<kode>.pak")
+    build_parser.add_argument("--lzma", action="store_true", help="kompresi lzma (default zlib)")
+    args = parser.parse_args()
+
+    if args.command == "check":
+        problems = check()
+        for problem in problems:
+            print(f"❌ {problem}")
+        print(f"{len(LANGUAGES)} bahasa, {len(problems)} masalah")
+        raise SystemExit(1 if problems else 0)
+
+    codec = assetpack.CODEC_LZMA if args.lzma else assetpack.CODEC_ZLIB
+    for lang in LANGUAGES:
+        entries = source_entries(lang)
+        path = os.path.join(CATALOG_DIR, f"{lang}.pak")
+        assetpack.save(entries, path, codec)
+        raw = sum(len(data) for _, data in entries)
+        print(f"✅ {path}: {len(entries)} entri, {raw:,} -> {os.path.getsize(path):,} byte")
+
+if __name__ == "__main__":
+    main()
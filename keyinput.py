@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+INPUT PER TOMBOL - BISIKAN DARI KABUT
+
+Terminal dipasang dalam mode cbreak sehingga setiap tombol langsung terbaca
+tanpa ENTER:
+
+    - satu tombol angka langsung memilih opsi di get_choice
+    - tombol yang ditekan saat teks masih berjalan disimpan di antrean;
+      angka di antrean dipakai untuk pilihan berikutnya (type-ahead)
+    - tombol apa pun membuat typewriter langsung menampilkan sisa teks
+
+Hanya tersedia di terminal POSIX (termios). Jika stdin bukan terminal,
+game tetap memakai input baris biasa (lihat game.main, --line-input).
+"""
+
+import codecs
+import os
+import select
+import sys
+from collections import deque
+from typing import Deque, TextIO
+
+try:
+    import termios
+    import tty
+except ImportError:  # Windows
+    termios = None
+
+EOF_KEY = "\x04"  # Ctrl-D
+
+class RawKeyboard:
+    """stdin dalam mode cbreak beserta antrean tombol yang belum dipakai"""
+    def __init__(self, stream: TextIO = sys.stdin):
+        self.fd = stream.fileno()
+        self.queue: Deque[str] = deque()
+        self._decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        self._saved = None
+
+    @staticmethod
+    def supported(stream: TextIO = sys.stdin) -> bool:
+        """True jika stream adalah terminal yang bisa dipasang mode cbreak"""
+        return termios is not None and stream.isatty()
+
+    def start(self):
+        """Memasang mode cbreak (tanpa echo, tanpa menunggu ENTER)"""
+        self._saved = termios.tcgetattr(self.fd)
+        tty.setcbreak(self.fd)
+
+    def close(self):
+        """Mengembalikan mode terminal semula"""
+        if self._saved is not None:
+            termios.tcsetattr(self.fd, termios.TCSADRAIN, self._saved)
+            self._saved = None
+
+    def _read(self):
+        """Membaca semua byte yang tersedia (minimal satu) ke antrean"""
+        data = os.read(self.fd, 64)
+        if not data:
+            raise EOFError
+        for key in self._decoder.decode(data):
+            if key == EOF_KEY:
+                raise EOFError
+            self.queue.append(key)
+
+    def poll(self, timeout: float) -> bool:
+        """Menunggu tombol paling lama `timeout` detik; True jika antrean berisi"""
+        if not self.queue and select.select([self.fd], [], [], timeout)[0]:
+            self._read()
+        return bool(self.queue)
+
+    def read_key(self) -> str:
+        """Tombol berikutnya dari antrean, menunggu jika kosong"""
+        while not self.queue:
+            self._read()
+        return self.queue.popleft()
+
+    def interrupted(self, timeout: float) -> bool:
+        """Dipanggil typewriter di antara frame: True jika teks harus dilompati.
+
+        Tombol selain angka hanya melompati teks; angka tetap di antrean
+        untuk pilihan berikutnya.
+        """
+        if not self.poll(timeout):
+            return False
+        digits = [key for key in self.queue if key.isdigit()]
+        self.queue.clear()
+        self.queue.extend(digits)
+        return True
+
+    def choice_queued(self) -> bool:
+        """True jika pemain sudah mengetik pilihan lebih dulu"""
+        return bool(self.queue) and self.queue[0].isdigit()
+
+    def discard(self):
+        """Membuang type-ahead (misalnya setelah pilihan tidak valid)"""
+        self.queue.clear()
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+PACING ADAPTIF - BISIKAN DARI KABUT
+
+Delay typewriter per karakter tidak lagi tetap 0.02 detik. Setiap sesi
+punya ReadingPace yang memperkirakan kecepatan baca pemain dari waktu
+antara teks selesai tampil dan masukan berikutnya (ENTER di jeda atau
+pilihan):
+
+    contoh delay = (waktu tampil + waktu menunggu masukan) / jumlah karakter
+
+Delay bergerak perlahan (rata-rata eksponensial) menuju sedikit di bawah
+contoh itu, jadi teks selesai tampil tepat sebelum pemain selesai membaca.
+Pemain yang selalu langsung menjawab (atau melompati teks) makin cepat;
+pemain yang masih membaca setelah teks selesai makin lambat. Waktu diam
+yang terlalu lama (pemain pergi) tidak dihitung.
+
+Beberapa adegan punya pengali sendiri (inti_misteri dan adegan ending
+lebih lambat). Pengali dipilih dari adegan yang menghasilkan setiap
+narasi, bukan adegan tempat langkah berhenti. Waktu tampil narasi dibagi
+lagi dengan pengalinya sebelum dijadikan contoh, jadi adegan lambat tidak
+ikut memperlambat delay dasar adegan lain. Narasi yang sudah pernah tampil
+di sesi yang sama (misalnya Desa Senja setiap kali kembali) langsung
+ditampilkan utuh.
+"""
+
+import time
+from typing import Dict, Set
+
+PACE_DEFAULT_DELAY = 0.02   # detik per karakter di awal sesi
+PACE_MIN_DELAY = 0.004
+PACE_MAX_DELAY = 0.05
+PACE_SMOOTHING = 0.3        # bobot contoh baru
+PACE_TARGET = 0.85          # teks selesai tampil sedikit sebelum pemain selesai membaca
+PACE_MIN_CHARS = 80         # teks lebih pendek tidak dijadikan contoh atau dianggap berulang
+PACE_IDLE_LIMIT = 20.0      # detik; menunggu lebih lama dianggap pemain pergi
+PACE_CHOICE_THINK = 2.0     # detik berpikir yang tidak dihitung sebagai membaca
+PACE_SEEN_LIMIT = 4096      # narasi berbeda maksimum yang diingat per sesi
+
+# Pengali delay per adegan asal narasi; adegan lain memakai 1.0
+SCENE_PACING: Dict[str, float] = {
+    "inti_misteri": 1.5,
+    "ending_baik": 1.25,
+    "ending_buruk": 1.25,
+    "ending_misteri": 1.25,
+    "ending_rahasia": 1.25,
+}
+
+class ReadingPace:
+    """Perkiraan kecepatan baca satu sesi"""
+    __slots__ = ("delay", "seen", "chars", "seconds", "shown_at")
+
+    def __init__(self, delay: float = PACE_DEFAULT_DELAY):
+        self.delay = delay            # delay dasar saat ini; 0 = tanpa typewriter
+        self.seen: Set[int] = set()   # hash narasi yang sudah tampil
+        self.chars = 0                # karakter yang tampil sejak masukan terakhir
+        self.seconds = 0.0            # lama tampilnya
+        self.shown_at = None          # waktu teks terakhir selesai tampil
+
+    def delay_for(self, scene: str, text: str) -> float:
+        """Delay per karakter untuk narasi `text` di adegan `scene`"""
+        # Teks pendek (garis, judul) selalu bertahap walaupun berulang
+        if len(text) >= PACE_MIN_CHARS:
+            key = hash(text)
+            if key in self.seen:
+                return 0.0
+            if len(self.seen) < PACE_SEEN_LIMIT:
+                self.seen.add(key)
+        return self.delay * SCENE_PACING.get(scene, 1.0)
+
+    def revealed(self, chars: int, seconds: float, scene: str = ""):
+        """Narasi bertahap adegan `scene` sepanjang `chars` karakter tampil dalam `seconds` detik"""
+        # Contoh kecepatan baca memakai waktu tampil dengan delay dasar
+        self.chars += chars
+        self.seconds += seconds / SCENE_PACING.get(scene, 1.0)
+
+    def shown(self):
+        """Semua teks sudah tampil; mulai menunggu masukan pemain"""
+        self.shown_at = time.monotonic()
+
+    def answered(self, choice: bool = False):
+        """Pemain memberi masukan; satu contoh kecepatan baca jika cukup teks"""
+        if self.shown_at is not None and self.delay > 0 and self.chars >= PACE_MIN_CHARS:
+            waited = time.monotonic() - self.shown_at
+            if choice:
+                waited = max(0.0, waited - PACE_CHOICE_THINK)
+            if waited <= PACE_IDLE_LIMIT:
+                sample = (self.seconds + waited) / self.chars * PACE_TARGET
+                delay = self.delay + PACE_SMOOTHING * (sample - self.delay)
+                self.delay = min(PACE_MAX_DELAY, max(PACE_MIN_DELAY, delay))
+        self.chars = 0
+        self.seconds = 0.0
+        self.shown_at = None
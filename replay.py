@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+REKAM & PUTAR ULANG - BISIKAN DARI KABUT
+
+Setiap sesi CLI direkam sebagai transkrip: state awal, seed RNG, dan semua
+jawaban get_choice. Putar ulang menjalankan transkrip lewat mesin headless
+(game.step), jadi tidak ada typewriter_effect, pause, maupun I/O lain, lalu
+membandingkan state akhir dan ending dengan yang terekam.
+
+Transkrip "golden" (semua ending dan semua hasil pertarungan) dibuat sekali
+dan disimpan di repositori (golden/), lalu dicek ulang setiap kali game
+diubah. Perubahan yang sengaja mengubah alur cerita membuat ulang set ini.
+
+Contoh:
+    python replay.py check               # putar ulang semua transkrip golden/
+    python replay.py check transkrip/    # transkrip sesi CLI
+    python replay.py golden              # buat ulang golden/
+"""
+
+import argparse
+import glob
+import json
+import os
+import random
+import time
+from typing import Dict, List, Optional, Tuple
+
+import savegame
+from explore import ENDINGS, explore
+from game import GameState, SessionRng, step
+
+TRANSCRIPT_VERSION = 2
+GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden")
+
+# ============================================================================
+# TRANSKRIP
+# ============================================================================
+
+class Transcript:
+    """Satu sesi yang bisa diputar ulang: state awal, seed, dan pilihan"""
+    def __init__(self, seed: int, start: GameState, choices: Optional[List[int]] = None,
+                 final: Optional[GameState] = None):
+        self.seed = seed
+        self.start = start
+        self.choices: List[int] = choices if choices is not None else []
+        self.final = final
+
+    def to_dict(self) -> Dict:
+        """Bentuk JSON; state disimpan dalam format savegame (hex)"""
+        return {
+            "version": TRANSCRIPT_VERSION,
+            "seed": self.seed,
+            "start": savegame.dumps(self.start).hex(),
+            "choices": self.choices,
+            "final": savegame.dumps(self.final).hex() if self.final is not None else None,
+            "scene": self.final.scene if self.final is not None else None,
+            "ending": self.final.ending if self.final is not None else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Transcript":
+        """Kebalikan to_dict; ValueError jika versinya asing"""
+        if data.get("version") != TRANSCRIPT_VERSION:
+            raise ValueError(f"Versi transkrip tidak didukung: {data.get('version')}")
+        final = data.get("final")
+        return cls(
+            data["seed"],
+            savegame.loads(bytes.fromhex(data["start"])),
+            list(data["choices"]),
+            savegame.loads(bytes.fromhex(final)) if final else None,
+        )
+
+    def save(self, path: str):
+        """Menulis transkrip ke file JSON"""
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.to_dict(), file)
+
+    @classmethod
+    def load(cls, path: str) -> "Transcript":
+        """Membaca transkrip dari file JSON"""
+        with open(path, encoding="utf-8") as file:
+            return cls.from_dict(json.load(file))
+
+def new_session(start: GameState, seed: Optional[int] = None) -> Tuple[Transcript, SessionRng]:
+    """Transkrip kosong dan RNG ber-seed untuk sesi baru"""
+    rng = SessionRng(seed)
+    return Transcript(rng.seed, start.copy()), rng
+
+# ============================================================================
+# PUTAR ULANG
+# ============================================================================
+
+def replay(transcript: Transcript) -> GameState:
+    """Memainkan ulang transkrip tanpa I/O; mengembalikan state akhir"""
+    rng = SessionRng(transcript.seed)
+    text, options, game_state = step(transcript.start, None, rng)
+    for choice in transcript.choices:
+        text, options, game_state = step(game_state, choice, rng)
+    return game_state
+
+def check(transcript: Transcript) -> Optional[str]:
+    """Pesan perbedaan jika hasil putar ulang tidak sama, None jika cocok"""
+    try:
+        game_state = replay(transcript)
+    except ValueError as error:
+        return str(error)
+    expected = transcript.final
+    if expected is None:
+        return "Transkrip tidak punya state akhir"
+    if game_state.ending != expected.ending:
+        return f"ending {game_state.ending}, seharusnya {expected.ending}"
+    if game_state.key() != expected.key():
+        return f"state akhir berbeda di {game_state.scene} (seharusnya {expected.scene})"
+    return None
+
+# ============================================================================
+# TRANSKRIP GOLDEN
+# ============================================================================
+
+def golden(max_games: int = 100000, seed: int = 0) -> Dict[str, Transcript]:
+    """Satu transkrip per ending dan per hasil pertarungan.
+
+    Game dimainkan dengan pilihan acak ber-seed sampai setiap kategori
+    ditemukan (atau `max_games` habis). Game berhenti di ending pertama.
+    Ending yang tidak ditemukan dicari lewat explore.explore().
+    """
+    wanted = {f"pertarungan_{result}" for result in ("menang", "kalah", "lari")}
+    wanted.update(ENDINGS + ("mati",))
+    found: Dict[str, Transcript] = {}
+    policy = random.Random(seed)
+
+    for game in range(max_games):
+        if len(found) == len(wanted):
+            break
+        transcript, rng = new_session(GameState(), seed + game)
+        text, options, game_state = step(transcript.start, None, rng)
+        fights = []
+        while options and game_state.ending is None and len(transcript.choices) < 500:
+            in_fight = game_state.scene == "pertarungan_shadow"
+            choice = policy.randint(1, len(options))
+            transcript.choices.append(choice)
+            text, options, game_state = step(game_state, choice, rng)
+            if in_fight and game_state.scene != "pertarungan_shadow":
+                fights.append(f"pertarungan_{game_state.fight_result}")
+        transcript.final = game_state
+
+        categories = fights
+        if game_state.ending is not None:
+            categories = categories + [game_state.ending]
+        elif not options and game_state.hp <= 0:
+            categories = categories + ["mati"]
+        for category in categories:
+            if category in wanted and category not in found:
+                found[category] = transcript
+
+    missing = [ending for ending in ENDINGS if ending not in found]
+    if missing:
+        # Ending langka (ending_rahasia) hampir tidak pernah dicapai dengan
+        # pilihan acak; ambil jalur terpendeknya dari penjelajah ruang state
+        # lalu cari seed yang lemparan dadunya membawa ke ending itu
+        exploration = explore()
+        for ending in missing:
+            if ending not in exploration.endings:
+                continue
+            choices = [choice for choice, picks in exploration.path(ending)]
+            for attempt in range(max_games):
+                transcript = Transcript(seed + attempt, GameState(), choices)
+                try:
+                    transcript.final = replay(transcript)
+                except ValueError:
+                    continue  # lemparan lain membawa ke adegan dengan pilihan berbeda
+                if transcript.final.ending == ending:
+                    found[ending] = transcript
+                    break
+    return found
+
+def main():
+    """Entry point rekam & putar ulang"""
+    parser = argparse.ArgumentParser(description="Putar ulang transkrip BISIKAN DARI KABUT")
+    commands = parser.add_subparsers(dest="command", required=True)
+    check_parser = commands.add_parser("check", help="putar ulang dan cek transkrip")
+    check_parser.add_argument("paths", nargs="*", default=[GOLDEN_DIR],
+                              help="file .json atau direktori (default: golden/)")
+    golden_parser = commands.add_parser("golden", help="buat transkrip golden")
+    golden_parser.add_argument("directory", nargs="?", default=GOLDEN_DIR)
+    golden_parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.command == "golden":
+        os.makedirs(args.directory, exist_ok=True)
+        for category, transcript in sorted(golden(seed=args.seed).items()):
+            transcript.save(os.path.join(args.directory, f"{category}.json"))
+            print(f"✅ {category}: {len(transcript.choices)} pilihan")
+        return
+
+    paths: List[str] = []
+    for path in args.paths:
+        if os.path.isdir(path):
+            paths.extend(sorted(glob.glob(os.path.join(path, "*.json"))))
+        else:
+            paths.append(path)
+    transcripts = [(path, Transcript.load(path)) for path in paths]
+
+    start = time.perf_counter()
+    failures = [(path, check(transcript)) for path, transcript in transcripts]
+    failures = [(path, error) for path, error in failures if error is not None]
+    elapsed = time.perf_counter() - start
+
+    for path, error in failures:
+        print(f"❌ {path}: {error}")
+    print(f"{len(transcripts) - len(failures)}/{len(transcripts)} transkrip cocok "
+          f"({len(transcripts) / max(elapsed, 1e-9):,.0f} transkrip/detik)")
+    raise SystemExit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+SAVE/LOAD - BISIKAN DARI KABUT
+
+Menyimpan GameState (termasuk id adegan saat ini) dalam format biner yang
+ringkas dan berversi, dengan checksum CRC32. Penulisan ke file bersifat
+atomik (tulis ke file sementara lalu rename), jadi file simpanan tidak
+pernah setengah jadi.
+
+Format (little-endian):
+    magic "BDKS" | versi (u8)
+    hp (i32) | enemy_hp (i32) | inventory | lokasi | puzzle | flag (u32 x4)
+    scene | fight_result | ending (panjang u8 + UTF-8, kosong = None)
+    crc32 semua byte sebelumnya (u32)
+
+Versi 1 menyimpan HP sebagai i16; HP bisa turun di bawah -32768 (misalnya
+ribuan kali terkena damage di rumah_tua), jadi versi 2 memakai i32. File
+versi 1 tetap bisa dimuat.
+"""
+
+import os
+import struct
+import tempfile
+import zlib
+from typing import List, Optional, Tuple
+
+from game import GameState
+
+MAGIC = b"BDKS"
+VERSION = 2
+
+_HEADER = struct.Struct("<4sB")
+_FIELDS = struct.Struct("<iiIIII")
+_FIELDS_BY_VERSION = {1: struct.Struct("<hhIIII"), VERSION: _FIELDS}
+_LENGTH = struct.Struct("<B")
+_CRC = struct.Struct("<I")
+
+def _pack_text(value: Optional[str]) -> bytes:
+    """String pendek dengan awalan panjang; None disimpan sebagai string kosong"""
+    data = (value or "").encode("utf-8")
+    return _LENGTH.pack(len(data)) + data
+
+def _unpack_text(data: bytes, offset: int) -> Tuple[Optional[str], int]:
+    """Kebalikan _pack_text; mengembalikan (nilai, offset berikutnya)"""
+    (length,) = _LENGTH.unpack_from(data, offset)
+    offset += _LENGTH.size
+    value = data[offset:offset + length].decode("utf-8")
+    return value or None, offset + length
+
+def dumps(game_state: GameState) -> bytes:
+    """GameState -> bytes simpanan; ValueError jika ada nilai di luar rentang format"""
+    try:
+        fields = _FIELDS.pack(
+            game_state.hp,
+            game_state.enemy_hp,
+            game_state.inventory_bits,
+            game_state.location_bits,
+            game_state.puzzle_bits,
+            game_state.story_bits,
+        )
+    except struct.error as error:
+        raise ValueError(f"State tidak bisa disimpan: {error}") from error
+    parts: List[bytes] = [
+        _HEADER.pack(MAGIC, VERSION),
+        fields,
+        _pack_text(game_state.scene),
+        _pack_text(game_state.fight_result),
+        _pack_text(game_state.ending),
+    ]
+    body = b"".join(parts)
+    return body + _CRC.pack(zlib.crc32(body))
+
+def loads(data: bytes) -> GameState:
+    """bytes simpanan -> GameState; ValueError jika rusak atau versinya asing"""
+    if len(data) < _HEADER.size + _CRC.size:
+        raise ValueError("File simpanan terlalu pendek")
+    body, (crc,) = data[:-_CRC.size], _CRC.unpack_from(data, len(data) - _CRC.size)
+    if zlib.crc32(body) != crc:
+        raise ValueError("Checksum file simpanan tidak cocok")
+
+    magic, version = _HEADER.unpack_from(body, 0)
+    if magic != MAGIC:
+        raise ValueError("Bukan file simpanan BISIKAN DARI KABUT")
+    fields = _FIELDS_BY_VERSION.get(version)
+    if fields is None:
+        raise ValueError(f"Versi file simpanan tidak didukung: {version}")
+    if len(body) < _HEADER.size + fields.size:
+        raise ValueError("File simpanan terlalu pendek")
+
+    game_state = GameState()
+    (
+        game_state.hp,
+        game_state.enemy_hp,
+        game_state.inventory_bits,
+        game_state.location_bits,
+        game_state.puzzle_bits,
+        game_state.story_bits,
+    ) = fields.unpack_from(body, _HEADER.size)
+
+    offset = _HEADER.size + fields.size
+    scene, offset = _unpack_text(body, offset)
+    game_state.scene = scene or "prolog"
+    game_state.fight_result, offset = _unpack_text(body, offset)
+    game_state.ending, offset = _unpack_text(body, offset)
+    return game_state
+
+def save(game_state: GameState, path: str, sync: bool = True):
+    """Menyimpan state ke file secara atomik (tulis-lalu-rename).
+
+    Dengan `sync` False file tidak di-fsync: rename tetap atomik, tetapi
+    simpanan terakhir bisa hilang jika mesin mati mendadak.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix=".simpan-", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(dumps(game_state))
+            if sync:
+                file.flush()
+                os.fsync(file.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+def load(path: str) -> GameState:
+    """Memuat state dari file simpanan"""
+    with open(path, "rb") as file:
+        return loads(file.read())
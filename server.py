@@ -0,0 +1,468 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SERVER MULTI-PEMAIN - BISIKAN DARI KABUT
+
+Server asyncio (TCP/telnet) yang menjalankan satu game per koneksi di atas
+mesin headless (game.step). Setiap koneksi hanya punya satu GameState,
+satu SessionRng, dan satu coroutine; tidak ada thread per pemain, jadi
+ribuan sesi yang diam atau lambat membaca tetap murah.
+
+Efek typewriter tidak memakai timer per sesi. Satu FrameScheduler berdetak
+dengan FRAME_INTERVAL tetap dan di setiap frame menulis jatah karakter semua
+sesi yang sedang tampil, satu write per socket, dengan kecepatan tampil yang
+sama dengan game.typewriter_effect. Kecepatan itu disesuaikan per sesi
+dengan kecepatan baca pemain (pacing.ReadingPace).
+
+Pemain masuk dengan nama (atau sebagai tamu). GameState disimpan di
+SessionStore per nama: sesi yang diam ditumpahkan ke disk dan dilanjutkan
+saat pemain yang sama tersambung lagi atau mengirim masukan berikutnya.
+Jika server menawarkan lebih dari satu bahasa (--lang), pemain memilih
+bahasa lebih dulu; teks dimuat per adegan dari katalog bahasa itu.
+
+Contoh:
+    python server.py --port 4000
+    python server.py --port 4000 --lang id en
+    telnet 127.0.0.1 4000
+"""
+
+import argparse
+import asyncio
+import secrets
+import signal
+import sys
+from collections import deque
+from typing import Deque, Dict, List, Optional, Sequence, Set, Tuple
+
+from game import (FRAME_INTERVAL, SEG_NARRATION, SEG_PAUSE, GameState, RngProvider,
+                  SessionRng, Text, step)
+from katalog import DEFAULT_LANGUAGE, LANGUAGES, Catalog, catalog
+from pacing import ReadingPace
+from sessions import SESSION_CAPACITY, SESSION_DIR, SESSION_ID, SessionStore
+from telemetry import TelemetryWriter
+from textcache import SCENE_TEXT, EncodedText, encode_text
+
+HOST = "127.0.0.1"
+PORT = 4000
+READ_LIMIT = 1024  # batas buffer baca per koneksi; jawaban pemain hanya satu baris
+WRITE_HIGH_WATER = 64 * 1024  # sesi dengan buffer kirim sebesar ini dilewati per frame
+
+# ============================================================================
+# PENJADWAL FRAME
+# ============================================================================
+
+class FrameScheduler:
+    """Satu timer untuk semua sesi.
+
+    Setiap FRAME_INTERVAL, setiap sesi yang masih punya keluaran tertunda
+    menulis jatah karakternya dalam satu write. Biaya CPU sebanding dengan
+    jumlah frame dan sesi aktif, bukan jumlah karakter.
+    """
+    def __init__(self, interval: float = FRAME_INTERVAL):
+        self.interval = interval
+        self.active: Dict["Session", None] = {}  # set yang urutannya tetap
+        self.ticks = 0
+
+    def wake(self, session: "Session"):
+        """Mendaftarkan sesi yang baru punya keluaran"""
+        self.active[session] = None
+
+    def tick(self):
+        """Satu frame: menulis jatah setiap sesi aktif"""
+        self.ticks += 1
+        done = [session for session in self.active if session.flush_frame()]
+        for session in done:
+            del self.active[session]
+
+    async def run(self):
+        """Loop frame dengan jadwal tetap; frame yang terlambat dilewati"""
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        while True:
+            self.tick()
+            next_tick += self.interval
+            wait = next_tick - loop.time()
+            if wait < 0:
+                next_tick = loop.time()
+            await asyncio.sleep(max(0.0, wait))
+
+# ============================================================================
+# SESI
+# ============================================================================
+
+class Session:
+    """Satu koneksi pemain: stream, state game, dan RNG-nya sendiri.
+
+    Keluaran tidak ditulis langsung, tetapi diantrekan sebagai potongan
+    [teks, posisi, karakter per frame]. FrameScheduler yang menuliskannya:
+    narasi (EncodedText bersama dari SCENE_TEXT) sebanyak jatah karakter per
+    frame sebagai irisan memoryview, teks lain (bytes) langsung.
+    """
+    __slots__ = ("reader", "writer", "session_id", "store", "rng", "scheduler",
+                 "pace", "budget", "pending", "drained", "telemetry", "seq",
+                 "lang", "messages")
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                 session_id: str, store: SessionStore, rng: SessionRng,
+                 scheduler: FrameScheduler, delay: float,
+                 telemetry: Optional[TelemetryWriter] = None,
+                 lang: str = DEFAULT_LANGUAGE):
+        self.reader = reader
+        self.writer = writer
+        # GameState tidak dipegang sesi; selama menunggu masukan state ada di
+        # SessionStore dan boleh ditumpahkan ke disk
+        self.session_id = session_id
+        self.store = store
+        self.rng = rng
+        self.scheduler = scheduler
+        # Kecepatan awal sama dengan game.typewriter_effect: 1 karakter per
+        # `delay` detik, lalu mengikuti kecepatan baca pemain
+        self.pace = ReadingPace(delay)
+        self.budget = 0.0
+        self.pending: Deque[list] = deque()
+        self.drained: Optional[asyncio.Future] = None
+        self.telemetry = telemetry
+        self.seq = 0  # jumlah pilihan sesi ini (untuk telemetri)
+        self.lang = lang
+        self.messages = catalog(lang)
+
+    def write(self, text: str, delay: float = 0.0):
+        """Mengantrekan teks; dengan `delay` > 0 ditampilkan bertahap per frame"""
+        if not self.pending:
+            self.budget = 1.0  # karakter pertama langsung tampil
+            self.scheduler.wake(self)
+        if delay > 0:
+            self.pending.append([SCENE_TEXT.get(text), 0, self.scheduler.interval / delay])
+        else:
+            self.pending.append([encode_text(text), 0, 0.0])
+
+    def flush_frame(self) -> bool:
+        """Menulis jatah satu frame dalam satu write; True jika antrean habis"""
+        if self.writer.is_closing():
+            self.pending.clear()
+        elif self.writer.transport.get_write_buffer_size() > WRITE_HIGH_WATER:
+            return False  # pemain lambat membaca; tahan jatah sampai buffer turun
+
+        parts = []
+        while self.pending:
+            item = self.pending[0]
+            text, offset, rate = item
+            if isinstance(text, EncodedText):
+                count = min(len(text) - offset, int(self.budget))
+                if count <= 0:
+                    break
+                parts.append(text.chunk(offset, offset + count))
+                self.budget -= count
+                if offset + count < len(text):
+                    item[1] = offset + count
+                    break
+            else:
+                parts.append(text)
+            self.pending.popleft()
+        if parts:
+            self.writer.writelines(parts)
+
+        if self.pending:
+            self.budget += self.pending[0][2]
+            return False
+        if self.drained is not None and not self.drained.done():
+            self.drained.set_result(None)
+        return True
+
+    async def flush(self):
+        """Menunggu semua keluaran yang diantrekan terkirim"""
+        if self.pending:
+            self.drained = asyncio.get_running_loop().create_future()
+            await self.drained
+
+    async def readline(self, choice: bool = False) -> Optional[str]:
+        """Satu baris dari pemain (setelah keluaran terkirim), None jika terputus.
+
+        Waktu menunggu baris menjadi contoh kecepatan baca; `choice` berarti
+        sebagian waktu itu dipakai untuk berpikir.
+        """
+        await self.flush()
+        self.pace.shown()
+        try:
+            line = await self.reader.readline()
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            return None
+        if not line:
+            return None
+        self.pace.answered(choice)
+        return line.decode("utf-8", "replace").strip()
+
+    def show_text(self, text: Text):
+        """Mengantrekan potongan teks keluaran mesin game tanpa jeda halaman"""
+        for kind, part, scene in text:
+            if kind == SEG_NARRATION:
+                delay = self.pace.delay_for(scene, part)
+                self.write(part, delay)
+                self.write("\n")
+                if delay > 0:
+                    self.pace.revealed(len(part), len(part) * delay, scene)
+            else:
+                self.write(part + "\n")
+
+    async def show(self, text: Text) -> bool:
+        """Menampilkan teks keluaran mesin game; False jika pemain terputus"""
+        start = 0
+        for index, (kind, _, _) in enumerate(text):
+            if kind != SEG_PAUSE:
+                continue
+            self.show_text(text[start:index])
+            self.write(self.messages.get("jeda_enter"))
+            if await self.readline() is None:
+                return False
+            self.write("\n" * 3)
+            start = index + 1
+        self.show_text(text[start:])
+        return True
+
+    async def get_choice(self, options: List[str]) -> Optional[int]:
+        """Pilihan pemain (1..len(options)), None jika pemain terputus"""
+        while True:
+            menu = "".join(f"{i}. {option}\n" for i, option in enumerate(options, 1))
+            self.write(menu + self.messages.get("pilihan_anda"))
+            line = await self.readline(choice=True)
+            if line is None:
+                return None
+            try:
+                choice = int(line)
+            except ValueError:
+                self.write(self.messages.get("angka_tidak_valid") + "\n")
+                continue
+            if 1 <= choice <= len(options):
+                return choice
+            self.write(self.messages.get("pilihan_tidak_valid") + "\n")
+
+    async def load(self) -> Optional[GameState]:
+        """State sesi dari store; GameState baru jika sesinya belum ada.
+
+        Mengembalikan None (setelah mencatat ke stderr dan memberi tahu
+        pemain) jika simpanan sesi ada tetapi tidak bisa dibaca.
+        """
+        try:
+            game_state = self.store.get(self.session_id)
+        except (OSError, ValueError) as error:
+            print(f"❌ Sesi {self.session_id} tidak bisa dimuat: {error}", file=sys.stderr)
+            self.write(self.messages.get("sesi_rusak"))
+            await self.flush()
+            return None
+        return GameState() if game_state is None else game_state
+
+    async def run(self):
+        """Memainkan game sampai selesai atau pemain terputus.
+
+        Sesi yang sudah ada di store dilanjutkan dari adegan terakhirnya.
+        Simpanan yang tidak bisa dibaca tidak diganti dengan game baru:
+        pemain diberi tahu dan sesi diakhiri tanpa menimpa filenya.
+        """
+        game_state = await self.load()
+        if game_state is None:
+            return
+        if game_state.scene == "menu_utama":
+            game_state = GameState()
+        text, options, game_state = step(game_state, None, self.rng, self.lang)
+        self.store.put(self.session_id, game_state)
+        while True:
+            self.write("\n" * 3)
+            if not await self.show(text):
+                return
+            if not options:
+                if self.telemetry is not None:
+                    self.telemetry.record_end(self.session_id, self.seq, game_state)
+                self.store.discard(self.session_id)
+                self.write(self.messages.get("sampai_jumpa"))
+                await self.flush()
+                return
+            choice = await self.get_choice(options)
+            if choice is None:
+                return
+            game_state = await self.load()
+            if game_state is None:
+                return
+            if self.telemetry is not None:
+                self.telemetry.record_choice(self.session_id, self.seq, game_state, options, choice,
+                                             self.lang)
+            self.seq += 1
+            ending = game_state.ending
+            text, options, game_state = step(game_state, choice, self.rng, self.lang)
+            if self.telemetry is not None and game_state.ending != ending:
+                self.telemetry.record_ending(self.session_id, self.seq, game_state)
+            self.store.put(self.session_id, game_state)
+
+# ============================================================================
+# SERVER
+# ============================================================================
+
+async def read_language(reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                        languages: Sequence[str]) -> Optional[str]:
+    """Menanyakan bahasa sesi (kosong = bahasa pertama), None jika terputus"""
+    if len(languages) == 1:
+        return languages[0]
+    while True:
+        writer.write(f"Bahasa / Language ({'/'.join(languages)}): ".encode("utf-8"))
+        await writer.drain()
+        line = await reader.readline()
+        if not line:
+            return None
+        lang = line.decode("utf-8", "replace").strip().lower()
+        if not lang:
+            return languages[0]
+        if lang in languages:
+            return lang
+
+async def read_name(reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                    playing: Set[str],
+                    messages: Optional[Catalog] = None) -> Optional[Tuple[str, bool]]:
+    """Menanyakan nama pemain: (id sesi, tamu?), None jika terputus"""
+    if messages is None:
+        messages = catalog()
+    while True:
+        writer.write(messages.get("nama_pemain").encode("utf-8"))
+        await writer.drain()
+        line = await reader.readline()
+        if not line:
+            return None
+        name = line.decode("utf-8", "replace").strip()
+        if not name:
+            return f"tamu-{secrets.token_hex(8)}", True
+        if not SESSION_ID.match(name):
+            writer.write(encode_text(messages.get("nama_tidak_valid") + "\n"))
+        elif name in playing:
+            writer.write(encode_text(messages.get("nama_dipakai") + "\n"))
+        else:
+            return name, False
+
+def handoff(lang: str, session_id: str, guest: bool) -> bytes:
+    """Baris serah-terima front cluster.py ke worker: bahasa dan nama (kosong = tamu)"""
+    return f"{lang} {'' if guest else session_id}\r\n".encode("utf-8")
+
+async def read_handoff(reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                       playing: Set[str],
+                       languages: Sequence[str]) -> Optional[Tuple[str, bool, str]]:
+    """Membaca baris handoff() tepat sekali: (id sesi, tamu?, bahasa).
+
+    Nama sudah diperiksa oleh front, jadi worker tidak pernah membaca baris
+    lain sebagai nama: baris berikutnya adalah masukan game. Nama yang tidak
+    valid atau masih dipakai di worker ini ditolak dengan pesan dan None.
+    """
+    line = await reader.readline()
+    if not line:
+        return None
+    fields = line.decode("utf-8", "replace").split()
+    lang = fields[0] if fields and fields[0] in languages else languages[0]
+    name = fields[1] if len(fields) > 1 else ""
+    if not name:
+        return f"tamu-{secrets.token_hex(8)}", True, lang
+    messages = catalog(lang)
+    if not SESSION_ID.match(name):
+        writer.write(encode_text(messages.get("nama_tidak_valid") + "\n"))
+    elif name in playing:
+        writer.write(encode_text(messages.get("nama_dipakai") + "\n"))
+    else:
+        return name, False, lang
+    await writer.drain()
+    return None
+
+class GameServer:
+    """Menerima koneksi dan menjalankan satu Session per koneksi"""
+    def __init__(self, delay: float = 0.02, seed: Optional[int] = None,
+                 store: Optional[SessionStore] = None, prompt: bool = True,
+                 telemetry: Optional[TelemetryWriter] = None,
+                 languages: Sequence[str] = (DEFAULT_LANGUAGE,)):
+        self.delay = delay
+        self.prompt = prompt  # False jika bahasa dan nama datang dari handoff() front cluster.py
+        self.telemetry = telemetry
+        self.languages = tuple(languages)  # bahasa pertama = default
+        self.provider = RngProvider(seed)
+        self.scheduler = FrameScheduler()
+        self.store = store if store is not None else SessionStore()
+        self.playing: Set[str] = set()  # id sesi yang sedang tersambung
+
+    async def login(self, reader: asyncio.StreamReader,
+                    writer: asyncio.StreamWriter) -> Optional[Tuple[str, bool, str]]:
+        """Menanyakan bahasa dan nama pemain: (id sesi, tamu?, bahasa), None jika terputus"""
+        if not self.prompt:
+            return await read_handoff(reader, writer, self.playing, self.languages)
+        lang = await read_language(reader, writer, self.languages)
+        if lang is None:
+            return None
+        login = await read_name(reader, writer, self.playing, catalog(lang))
+        if login is None:
+            return None
+        return login + (lang,)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Coroutine satu koneksi"""
+        session_id = None
+        guest = False
+        try:
+            login = await self.login(reader, writer)
+            if login is None:
+                return
+            session_id, guest, lang = login
+            self.playing.add(session_id)
+            session = Session(reader, writer, session_id, self.store, self.provider.session(),
+                              self.scheduler, self.delay, self.telemetry, lang)
+            await session.run()
+        except (ConnectionError, ValueError):
+            pass  # pemain menutup koneksi saat teks dikirim, atau baris terlalu panjang
+        except asyncio.CancelledError:
+            pass  # server dihentikan (Ctrl+C atau SIGTERM); koneksi ditutup di bawah
+        finally:
+            # Sesi tamu tidak bisa dilanjutkan, jadi tidak pernah disimpan,
+            # juga saat koneksi putus atau server dihentikan
+            if guest:
+                self.store.discard(session_id)
+            self.playing.discard(session_id)
+            writer.close()
+
+    async def serve(self, host: str = HOST, port: int = PORT):
+        """Menjalankan server sampai dihentikan"""
+        server = await asyncio.start_server(self.handle, host, port, limit=READ_LIMIT)
+        frames = asyncio.ensure_future(self.scheduler.run())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            frames.cancel()
+            self.store.flush()
+
+def main():
+    """Entry point server"""
+    parser = argparse.ArgumentParser(description="Server multi-pemain BISIKAN DARI KABUT")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--delay", type=float, default=0.02, help="detik per karakter typewriter")
+    parser.add_argument("--seed", type=int, help="seed RngProvider (default: acak)")
+    parser.add_argument("--sessions", default=SESSION_DIR, help="direktori sesi yang ditumpahkan")
+    parser.add_argument("--capacity", type=int, default=SESSION_CAPACITY,
+                        help="jumlah GameState maksimum di memori")
+    parser.add_argument("--telemetry", metavar="FILE", help="catat setiap pilihan sebagai JSONL")
+    parser.add_argument("--lang", nargs="+", choices=LANGUAGES, default=[DEFAULT_LANGUAGE],
+                        help="bahasa yang ditawarkan ke pemain (yang pertama = default)")
+    args = parser.parse_args()
+
+    print(f"BISIKAN DARI KABUT berjalan di {args.host}:{args.port}")
+    store = SessionStore(args.sessions, args.capacity)
+    telemetry = TelemetryWriter(args.telemetry) if args.telemetry else None
+    server = GameServer(args.delay, args.seed, store, telemetry=telemetry, languages=args.lang)
+
+    async def run():
+        # SIGTERM membatalkan server seperti Ctrl+C, jadi store sempat di-flush
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM,
+                                                      asyncio.current_task().cancel)
+        await server.serve(args.host, args.port)
+
+    try:
+        asyncio.run(run())
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+    finally:
+        if telemetry is not None:
+            telemetry.close()
+
+if __name__ == "__main__":
+    main()
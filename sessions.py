@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+PENYIMPANAN SESI - BISIKAN DARI KABUT
+
+Menyimpan GameState setiap sesi server berdasarkan id sesi. Sesi yang
+sering dipakai tetap di memori (LRU dengan kapasitas tetap); sesi yang
+paling lama diam dipindahkan ke disk dalam format savegame dan dimuat
+kembali otomatis saat dibutuhkan. Memori tetap datar walaupun jumlah pemain
+terdaftar terus bertambah.
+
+Sesi yang gagal ditulis ke disk tetap di memori (dan dicoba lagi pada
+tumpahan berikutnya), jadi satu sesi rusak tidak menghilangkan sesi itu
+maupun menggagalkan sesi pemain lain.
+"""
+
+import os
+import re
+import sys
+from collections import OrderedDict
+from typing import Optional
+
+import savegame
+from game import GameState
+
+SESSION_DIR = "sesi"
+SESSION_CAPACITY = 1000  # jumlah GameState maksimum di memori
+SESSION_ID = re.compile(r"^[A-Za-z0-9_-]{1,32}$")
+
+class SessionStore:
+    """LRU GameState per id sesi, dengan tumpahan ke disk"""
+    def __init__(self, directory: str = SESSION_DIR, capacity: int = SESSION_CAPACITY):
+        self.directory = directory
+        self.capacity = capacity
+        self.hot: "OrderedDict[str, GameState]" = OrderedDict()
+        self.hits = 0
+        self.loads = 0
+        self.spills = 0
+        self.failures = 0  # tumpahan yang gagal ditulis
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, session_id: str) -> str:
+        """File simpanan sebuah sesi"""
+        if not SESSION_ID.match(session_id):
+            raise ValueError(f"Id sesi tidak valid: {session_id!r}")
+        return os.path.join(self.directory, f"{session_id}.sav")
+
+    def get(self, session_id: str) -> Optional[GameState]:
+        """State sesi dari memori atau disk, None jika sesi belum ada"""
+        game_state = self.hot.get(session_id)
+        if game_state is not None:
+            self.hot.move_to_end(session_id)
+            self.hits += 1
+            return game_state
+        try:
+            game_state = savegame.load(self.path(session_id))
+        except FileNotFoundError:
+            return None
+        self.loads += 1
+        self.put(session_id, game_state)
+        return game_state
+
+    def put(self, session_id: str, game_state: GameState):
+        """Menyimpan state sesi; sesi paling lama diam ditumpahkan ke disk"""
+        self.hot[session_id] = game_state
+        self.hot.move_to_end(session_id)
+        # Setiap sesi dicoba paling banyak sekali; sesi yang gagal ditulis
+        # membuat store sementara melewati kapasitas
+        for _ in range(len(self.hot) - self.capacity):
+            self.spill()
+
+    def spill(self) -> bool:
+        """Memindahkan satu sesi yang paling lama diam ke disk; False jika gagal.
+
+        Sesi yang gagal ditulis dicatat dan dikembalikan ke memori sebagai
+        sesi terbaru, jadi tidak hilang dan tidak dicoba terus-menerus.
+        """
+        session_id, game_state = self.hot.popitem(last=False)
+        try:
+            # Tanpa fsync: tumpahan sering terjadi di jalur panas server, dan
+            # rename tetap menjamin file tidak pernah setengah jadi
+            savegame.save(game_state, self.path(session_id), sync=False)
+        except (OSError, ValueError) as error:
+            self.hot[session_id] = game_state
+            self.failures += 1
+            print(f"❌ Sesi {session_id} gagal disimpan: {error}", file=sys.stderr)
+            return False
+        self.spills += 1
+        return True
+
+    def take(self, session_id: str) -> Optional[GameState]:
+        """Mengeluarkan state sesi dari store ini (untuk dipindah).
+
+        File tumpahannya ikut dihapus; direktori sesi dipakai bersama, jadi
+        file lama itu bisa dimuat lagi dan menimpa progres di worker tujuan.
+        """
+        game_state = self.get(session_id)
+        if game_state is not None:
+            self.discard(session_id)
+        return game_state
+
+    def discard(self, session_id: str):
+        """Menghapus sesi dari memori dan disk"""
+        self.hot.pop(session_id, None)
+        try:
+            os.remove(self.path(session_id))
+        except FileNotFoundError:
+            pass
+
+    def flush(self):
+        """Menulis semua sesi di memori ke disk (misalnya saat server berhenti).
+
+        Sesi yang gagal ditulis dilewati dan tetap di memori.
+        """
+        for _ in range(len(self.hot)):
+            self.spill()
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self.hot or os.path.exists(self.path(session_id))
+
+    def __len__(self) -> int:
+        return len(self.hot)
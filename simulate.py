@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SIMULATOR MONTE-CARLO - BISIKAN DARI KABUT
+
+Memainkan banyak game lewat mesin headless (game.step) dari prolog sampai
+ending, tanpa jeda dan tanpa I/O, dibagi ke semua core dengan process pool.
+Dipakai untuk menyeimbangkan game sebelum konten baru dirilis.
+
+Contoh:
+    python simulate.py --games 1000000 --seed 7
+"""
+
+import argparse
+import os
+import random
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List
+
+from game import GameState, RngProvider, SessionRng, step
+
+# ============================================================================
+# KEBIJAKAN PEMAIN
+# ============================================================================
+
+Policy = Callable[[GameState, List[str], random.Random], int]
+
+def random_policy(game_state: GameState, options: List[str], rng: random.Random) -> int:
+    """Memilih salah satu pilihan secara acak"""
+    return rng.randint(1, len(options))
+
+POLICIES: Dict[str, Policy] = {
+    "random": random_policy,
+}
+
+# ============================================================================
+# STATISTIK
+# ============================================================================
+
+class SimulationStats:
+    """Rekap hasil banyak game; bisa digabung antar proses"""
+    def __init__(self):
+        self.games = 0
+        self.steps = 0
+        self.outcomes: Counter = Counter()   # ending_*, mati, batas_langkah
+        self.death_hp: Counter = Counter()   # HP saat pemain mati
+        self.fights: Counter = Counter()     # hasil pertarungan_shadow
+
+    def merge(self, other: "SimulationStats"):
+        """Menambahkan rekap dari proses lain"""
+        self.games += other.games
+        self.steps += other.steps
+        self.outcomes.update(other.outcomes)
+        self.death_hp.update(other.death_hp)
+        self.fights.update(other.fights)
+
+    def report(self) -> str:
+        """Laporan teks yang mudah dibaca"""
+        lines = [f"Game dimainkan : {self.games}"]
+        lines.append(f"Rata-rata langkah: {self.steps / max(self.games, 1):.2f}")
+
+        lines.append("\nHasil akhir:")
+        for outcome, count in self.outcomes.most_common():
+            lines.append(f"  {outcome:<16} {count:>10}  ({count / self.games:.2%})")
+
+        total_fights = sum(self.fights.values())
+        lines.append(f"\npertarungan_shadow: {total_fights} pertarungan")
+        for result, count in self.fights.most_common():
+            lines.append(f"  {result:<16} {count:>10}  ({count / max(total_fights, 1):.2%})")
+
+        lines.append("\nDistribusi HP saat mati (kelompok 10):")
+        buckets: Counter = Counter()
+        for hp, count in self.death_hp.items():
+            buckets[hp // 10 * 10] += count
+        for low in sorted(buckets):
+            lines.append(f"  HP {low:>4}..{low + 9:<4} {buckets[low]:>10}")
+        return "\n".join(lines)
+
+# ============================================================================
+# SIMULASI
+# ============================================================================
+
+def play_one(policy: Policy, rng: random.Random, stats: SimulationStats, max_steps: int,
+             game_rng: SessionRng):
+    """Memainkan satu game dari prolog sampai ending atau mati"""
+    text, options, game_state = step(GameState(), None, game_rng)
+    steps = 0
+
+    while options and game_state.ending is None and steps < max_steps:
+        in_fight = game_state.scene == "pertarungan_shadow"
+        text, options, game_state = step(game_state, policy(game_state, options, rng), game_rng)
+        steps += 1
+        if in_fight and game_state.scene != "pertarungan_shadow":
+            stats.fights[game_state.fight_result] += 1
+
+    if game_state.ending is not None:
+        outcome = game_state.ending
+    elif not options and game_state.hp <= 0:
+        outcome = "mati"
+        stats.death_hp[game_state.hp] += 1
+    else:
+        outcome = "batas_langkah"
+
+    stats.games += 1
+    stats.steps += steps
+    stats.outcomes[outcome] += 1
+
+def run_batch(games: int, policy_name: str, seed: int, max_steps: int) -> SimulationStats:
+    """Memainkan sejumlah game dalam satu proses worker"""
+    # Setiap game punya aliran angka acak sendiri dari provider batch ini,
+    # jadi hasil simulasi bisa diulang dengan seed yang sama
+    rng = random.Random(seed)
+    provider = RngProvider(seed)
+    policy = POLICIES[policy_name]
+    stats = SimulationStats()
+    for _ in range(games):
+        play_one(policy, rng, stats, max_steps, provider.session())
+    return stats
+
+def simulate(games: int, policy_name: str = "random", workers: int = 0,
+             seed: int = 0, max_steps: int = 500) -> SimulationStats:
+    """Membagi game ke beberapa proses lalu menggabungkan hasilnya"""
+    workers = workers or os.cpu_count() or 1
+    # Beberapa batch per worker supaya beban tetap rata
+    batches = workers * 4
+    sizes = [games // batches + (1 if i < games % batches else 0) for i in range(batches)]
+
+    stats = SimulationStats()
+    if workers == 1:
+        for i, size in enumerate(sizes):
+            stats.merge(run_batch(size, policy_name, seed + i, max_steps))
+        return stats
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_batch, size, policy_name, seed + i, max_steps)
+                   for i, size in enumerate(sizes) if size]
+        for future in futures:
+            stats.merge(future.result())
+    return stats
+
+def main():
+    """Entry point mode simulate"""
+    parser = argparse.ArgumentParser(description="Simulasi Monte-Carlo BISIKAN DARI KABUT")
+    parser.add_argument("--games", type=int, default=100000, help="jumlah game")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="random")
+    parser.add_argument("--workers", type=int, default=0, help="jumlah proses (0 = semua core)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-steps", type=int, default=500, help="batas langkah per game")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    stats = simulate(args.games, args.policy, args.workers, args.seed, args.max_steps)
+    elapsed = time.perf_counter() - start
+
+    print(stats.report())
+    print(f"\n{stats.games / elapsed:,.0f} game/detik ({elapsed:.2f} detik)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""
+TELEMETRI PILIHAN - BISIKAN DARI KABUT
+
+Setiap jawaban get_choice dicatat sebagai satu baris JSON: sesi, urutan,
+adegan, bahasa, pilihan yang tersedia, pilihan yang diambil beserta id
+pilihannya ("adegan.pilihan_N", sama di semua bahasa), HP, ending terakhir
+yang sudah dicapai (null jika belum ada), dan waktu. Ending tidak
+mengakhiri game (adegan ending kembali ke desa_senja), jadi setiap kali
+ending berubah dicatat satu event tanpa pilihan ("choice": null,
+"event": "ending"); pemain yang keluar tepat setelah ending tetap tercatat
+mencapainya. Game yang selesai (pemain mati) ditutup dengan satu event
+tanpa pilihan berisi adegan dan ending terakhir. Log ini dibaca oleh
+analyze.py.
+
+Game tidak pernah menunggu disk: record() hanya menaruh event di buffer
+memori berkapasitas tetap (event dibuang dan dihitung jika buffer penuh).
+Thread latar belakang mengambil isi buffer sekaligus dan menulisnya dengan
+satu write per batch. File dirotasi berdasarkan ukuran (pilihan.jsonl,
+pilihan.jsonl.1, ...).
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List
+
+from game import SCENES, GameState
+from katalog import DEFAULT_LANGUAGE
+
+TELEMETRY_FILE = os.path.join("telemetri", "pilihan.jsonl")
+TELEMETRY_BUFFER = 10000            # event maksimum yang menunggu ditulis
+TELEMETRY_INTERVAL = 1.0            # detik antar flush
+TELEMETRY_BATCH = 1000              # flush lebih awal jika event sebanyak ini menunggu
+TELEMETRY_MAX_BYTES = 16 * 1024 * 1024
+TELEMETRY_BACKUPS = 5
+
+class TelemetryWriter:
+    """Buffer event berkapasitas tetap dengan thread penulis JSONL"""
+    def __init__(self, path: str = TELEMETRY_FILE, max_bytes: int = TELEMETRY_MAX_BYTES,
+                 backups: int = TELEMETRY_BACKUPS, capacity: int = TELEMETRY_BUFFER,
+                 interval: float = TELEMETRY_INTERVAL, batch: int = TELEMETRY_BATCH):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.capacity = capacity
+        self.interval = interval
+        self.batch = batch
+        self.buffer: Deque[Dict] = deque()
+        self.dropped = 0
+        self.written = 0
+        self.writes = 0
+        self._wake = threading.Condition()
+        self._closed = False
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+        self._thread = threading.Thread(target=self._run, name="telemetri", daemon=True)
+        self._thread.start()
+
+    def record(self, event: Dict):
+        """Menaruh event di buffer; tidak pernah menunggu disk"""
+        # deque.append aman antar thread; kapasitas hanya dicek perkiraan
+        if len(self.buffer) >= self.capacity:
+            self.dropped += 1
+            return
+        self.buffer.append(event)
+        if len(self.buffer) == self.batch:
+            with self._wake:
+                self._wake.notify()
+
+    def record_choice(self, session_id: str, seq: int, game_state: GameState,
+                      options: List[str], choice: int, lang: str = DEFAULT_LANGUAGE):
+        """Mencatat satu keputusan pemain (state sebelum pilihan diterapkan)"""
+        option_ids = SCENES.option_ids(game_state.scene, game_state, lang)
+        self.record({
+            "t": time.time(),
+            "sesi": session_id,
+            "seq": seq,
+            "scene": game_state.scene,
+            "lang": lang,
+            "options": options,
+            "choice": choice,
+            "option": option_ids[choice - 1] if 0 < choice <= len(option_ids) else None,
+            "hp": game_state.hp,
+            "ending": game_state.ending,
+        })
+
+    def record_ending(self, session_id: str, seq: int, game_state: GameState):
+        """Mencatat ending yang baru dicapai (state setelah langkah, tanpa pilihan)"""
+        self.record({
+            "t": time.time(),
+            "sesi": session_id,
+            "seq": seq,
+            "event": "ending",
+            "scene": game_state.scene,
+            "options": [],
+            "choice": None,
+            "hp": game_state.hp,
+            "ending": game_state.ending,
+        })
+
+    def record_end(self, session_id: str, seq: int, game_state: GameState):
+        """Mencatat akhir game (state terakhir, tanpa pilihan)"""
+        self.record({
+            "t": time.time(),
+            "sesi": session_id,
+            "seq": seq,
+            "scene": game_state.scene,
+            "options": [],
+            "choice": None,
+            "hp": game_state.hp,
+            "ending": game_state.ending,
+        })
+
+    def _run(self):
+        """Isi thread penulis: tunggu interval atau batch penuh, lalu flush"""
+        while True:
+            with self._wake:
+                # Batch yang sudah penuh saat flush sebelumnya langsung ditulis
+                if not self._closed and len(self.buffer) < self.batch:
+                    self._wake.wait(self.interval)
+                closed = self._closed
+            self._flush()
+            if closed:
+                return
+
+    def _flush(self):
+        """Menulis semua event yang menunggu dalam satu write"""
+        events = []
+        while self.buffer:
+            events.append(self.buffer.popleft())
+        if not events:
+            return
+        # ensure_ascii: panjang string sama dengan jumlah byte untuk rotasi
+        lines = [json.dumps(event) + "\n" for event in events]
+        start = 0
+        while start < len(lines):
+            # Ambil baris sebanyak yang masih muat di file ini (minimal satu)
+            room = self.max_bytes - self._file.tell()
+            end = start
+            size = 0
+            while end < len(lines) and (end == start or size + len(lines[end]) <= room):
+                size += len(lines[end])
+                end += 1
+            if size > room and self._file.tell():
+                self._rotate()
+                continue
+            self._file.write("".join(lines[start:end]))
+            self.writes += 1
+            start = end
+        self._file.flush()
+        self.written += len(events)
+
+    def _rotate(self):
+        """pilihan.jsonl -> .1 -> .2 ...; file tertua dibuang"""
+        self._file.close()
+        for index in range(self.backups - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        if self.backups:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def close(self):
+        """Menulis sisa buffer lalu menghentikan thread"""
+        with self._wake:
+            self._closed = True
+            self._wake.notify()
+        self._thread.join()
+        self._file.close()
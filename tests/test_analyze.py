@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""Analisis telemetri: ending yang dicapai sebelum pemain keluar tetap terhitung"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import analyze
+import game
+from telemetry import TelemetryWriter
+
+# Dari prolog: Gua Terlarang -> Mendekat ke cahaya -> ending_buruk
+CHOICES_TO_ENDING = [4, 1, 2]
+
+def test_ending_then_quit_is_counted(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    path = str(tmp_path / "pilihan.jsonl")
+    writer = TelemetryWriter(path)
+    choices = iter(CHOICES_TO_ENDING)
+
+    def get_choice(options):
+        try:
+            return next(choices)
+        except StopIteration:
+            raise KeyboardInterrupt  # pemain menutup game setelah ending
+
+    monkeypatch.setattr(game, "TELEMETRY", writer)
+    monkeypatch.setattr(game, "get_choice", get_choice)
+    monkeypatch.setattr(game, "show_text", lambda text, pace=None: None)
+    monkeypatch.setattr(game, "clear_screen", lambda: None)
+    with pytest.raises(KeyboardInterrupt):
+        game.main_game(game.GameState())
+    writer.close()
+
+    stats = analyze.analyze([path], workers=1)
+    assert stats.sessions == 1
+    assert stats.funnel["ending_buruk"] == 1
+    assert stats.endings[1] == 1
+    assert stats.outcomes["terputus"] == 1
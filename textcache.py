@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""
+CACHE TEKS ADEGAN - BISIKAN DARI KABUT
+
+Narasi adegan adalah string konstan yang sama untuk setiap pemain. Cache ini
+menyimpan setiap teks satu kali sebagai bytes UTF-8 siap kirim (baris baru
+telnet "\\r\\n") beserta posisi byte setiap karakter, sehingga typewriter di
+server cukup menulis irisan memoryview tanpa menyalin atau meng-encode ulang.
+"""
+
+from array import array
+from itertools import accumulate
+from typing import Dict
+
+TEXT_CACHE_LIMIT = 4096  # jumlah teks maksimum; teks dinamis di atas batas tidak disimpan
+
+def encode_text(text: str) -> bytes:
+    """Teks -> bytes siap kirim ke telnet"""
+    return text.replace("\n", "\r\n").encode("utf-8")
+
+class EncodedText:
+    """Teks yang sudah di-encode, bisa diiris per jumlah karakter"""
+    __slots__ = ("data", "view", "offsets")
+
+    def __init__(self, text: str):
+        self.data = encode_text(text)
+        self.view = memoryview(self.data)
+        # offsets[i] = posisi byte awal karakter ke-i; "\n" menjadi 2 byte
+        if text.isascii():
+            sizes = (2 if char == "\n" else 1 for char in text)
+        else:
+            sizes = (2 if char == "\n" else len(char.encode("utf-8")) for char in text)
+        self.offsets = array("I", accumulate(sizes, initial=0))
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def chunk(self, start: int, stop: int) -> memoryview:
+        """Irisan tanpa salinan untuk karakter start..stop"""
+        return self.view[self.offsets[start]:self.offsets[stop]]
+
+class TextCache:
+    """Peta teks -> EncodedText yang dipakai bersama semua sesi"""
+    def __init__(self, limit: int = TEXT_CACHE_LIMIT):
+        self.limit = limit
+        self.entries: Dict[str, EncodedText] = {}
+
+    def get(self, text: str) -> EncodedText:
+        """EncodedText untuk teks ini, dibuat sekali lalu dipakai ulang"""
+        encoded = self.entries.get(text)
+        if encoded is None:
+            encoded = EncodedText(text)
+            if len(self.entries) < self.limit:
+                self.entries[text] = encoded
+        return encoded
+
+# Cache bersama semua sesi dalam satu proses
+SCENE_TEXT = TextCache()